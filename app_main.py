@@ -1,28 +1,59 @@
+import importlib
 import streamlit as st
-# Import fungsi show_page dari setiap file study case
-from pages import sc1_usia, sc2_gender_usia, sc3_sleep_hours, sc4_covid_risk, sc5_alcohol_risk, sc6_smoking, sc7_regional_map, sc8_physical_activity, sc9_diabetes_risk, sc10_stroke_risk, dataset_info
+
+import data_loader
+import diagnostics
+import warmup
 
 st.set_page_config(
     page_title="Visualisasi Data Midterm",
     layout="wide"
 )
 
+# 1. Registri Halaman (PAGES)
+# Setiap entri hanya berisi nama modul. Modul study case (beserta import berat
+# seperti plotly.express, pemuatan dataset, dan agregasinya) baru di-import
+# ketika entri sidebar-nya dipilih, sehingga "Halaman Utama" tidak ikut
+# menanggung biaya kesepuluh study case. Pemuatan dataset dan hasil setiap
+# halaman disiapkan di latar belakang oleh warmup.py sejak run pertama.
+PAGES = {
+    "Deskripsi Dataset": "pages.dataset_info",
+    "1. Usia": "pages.sc1_usia",
+    "2. Rasio Gender vs Usia": "pages.sc2_gender_usia",
+    "3. Durasi Tidur": "pages.sc3_sleep_hours",
+    "4. Covid-19": "pages.sc4_covid_risk",
+    "5. Alkohol vs Rokok": "pages.sc5_alcohol_risk",
+    "6. Rokok vs Penggunaan Vape": "pages.sc6_smoking",
+    "7. Beban Kasus Regional": "pages.sc7_regional_map",
+    "8. Aktivitas Fisik": "pages.sc8_physical_activity",
+    "9. Diabetes": "pages.sc9_diabetes_risk",
+    "10. Riwayat Stroke": "pages.sc10_stroke_risk",
+    "11. Pemindaian Faktor Risiko": "pages.sc11_risk_scan",
+    "12. Model Risiko Multivariabel": "pages.logistic_model",
+}
+
+
+def load_page(label):
+    """Meng-import modul halaman secara lazy (modul di-cache oleh sys.modules)."""
+    return importlib.import_module(PAGES[label])
+
+
+# Selang pemeriksaan sidik jari dataset untuk sesi yang sedang terbuka
+DATASET_POLL_S = 5.0
+
+
+@st.fragment(run_every=DATASET_POLL_S)
+def watch_dataset():
+    """
+    Jika file dataset diganti, sesi ini dirender ulang penuh dengan versi baru
+    (tanpa restart server). Sesi hanya membandingkan versinya dengan hasil
+    pemeriksaan bersama data_loader.current_versions; file tidak di-hash per sesi.
+    """
+    if data_loader.dataset_changed():
+        st.rerun()
+
+
 def main():
-    
-    # 1. Definisikan Struktur Navigasi (PAGES)
-    PAGES = {
-        "Deskripsi Dataset": dataset_info,
-        "1. Usia": sc1_usia,
-        "2. Rasio Gender vs Usia": sc2_gender_usia,
-        "3. Durasi Tidur": sc3_sleep_hours,
-        "4. Covid-19": sc4_covid_risk,
-        "5. Alkohol vs Rokok": sc5_alcohol_risk,
-        "6. Rokok vs Penggunaan Vape": sc6_smoking,
-        "7. Beban Kasus Regional": sc7_regional_map,
-        "8. Aktivitas Fisik": sc8_physical_activity,
-        "9. Diabetes": sc9_diabetes_risk,
-        "10. Riwayat Stroke": sc10_stroke_risk,
-    }
 
     # 2. Setup Sidebar
     st.sidebar.title("Navigasi Study Case")
@@ -30,7 +61,24 @@ def main():
     # Tambahkan item "Halaman Utama" ke pilihan sidebar
     page_options = ["Halaman Utama"] + list(PAGES.keys())
     case_selection = st.sidebar.radio("Pilih Study Case:", page_options)
+    diagnostics.start_run(case_selection)
+    # Jejak diagnostik selalu ditutup, juga jika halaman gagal atau memanggil
+    # st.rerun/st.stop, agar tidak terbawa ke rerun berikutnya di thread yang sama
+    try:
+        # Satu versi dataset untuk seluruh rerun ini (lihat data_loader.pin_dataset_versions)
+        data_loader.pin_dataset_versions()
+        watch_dataset()
+        warmup.render_progress(warmup.start(PAGES.values(), data_loader.dataset_version()))
+        render_selection(case_selection)
+    finally:
+        summary = diagnostics.finish_run()
+
+    # Panel diagnostik performa (opsional) di bagian bawah sidebar
+    diagnostics.render_toggle()
+    diagnostics.render_panel(summary)
+
 
+def render_selection(case_selection):
     # 3. Logika Tampilan
     
     if case_selection == "Halaman Utama":
@@ -70,7 +118,12 @@ def main():
         
     else:
         # Jika Study Case dipilih, jalankan fungsi show_page()
-        page = PAGES[case_selection]
+        with diagnostics.phase('import', PAGES[case_selection]):
+            page = diagnostics.instrument_page(load_page(case_selection))
+        # Filter global di sidebar hanya untuk halaman yang ikut difilter (lihat cross_filter.py)
+        from cross_filter import is_cross_filtered, render_sidebar_filters
+        if is_cross_filtered(PAGES[case_selection]):
+            render_sidebar_filters()
         page.show_page()
 
 if __name__ == '__main__':
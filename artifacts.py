@@ -0,0 +1,227 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from bitmap_index import BitmapIndex
+from cube import CountCube
+
+# Artefak hasil build offline (lihat build_artifacts.py).
+# Setiap partisi tahun disimpan di folder versi sendiri:
+#   artifacts/<tahun>-<sidik jari>-s<versi skema>/
+#     cube.npz + cube.json       kubus hitungan (kode sel, populasi, kasus, level)
+#     bitmap.npz + bitmap.json   indeks bitmap kolom kategori
+#     tables.pkl                 tabel tiap halaman study case tanpa filter,
+#                                beserta versi kode agregasinya (code_version)
+#     model.pkl                  model risiko multivariabel (risk_model.py)
+#                                beserta versi kodenya
+#     summary.json               ringkasan dataset (jumlah baris, kolom, tipe)
+# dan artifacts/manifest.json menunjuk ke folder terbaru per tahun. Dengan
+# artefak ini aplikasi dapat berjalan tanpa file CSV mentah.
+
+ARTIFACT_FORMAT = 2
+# Modul bersama yang ikut menentukan isi tabel halaman (lihat code_version)
+AGGREGATION_MODULES = ('cube', 'incidence', 'uncertainty')
+MANIFEST_FILE = 'manifest.json'
+
+
+# --- Manifest ---
+def read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        return {}
+    return {int(year): entry for year, entry in manifest.get('partitions', {}).items()}
+
+
+def write_manifest(root, partitions):
+    os.makedirs(root, exist_ok=True)
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'partitions': {str(year): entry for year, entry in sorted(partitions.items())},
+    }
+    path = os.path.join(root, MANIFEST_FILE)
+    tmp_path = _unique_path(path, 'tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _unique_path(path, suffix):
+    # Nama unik di folder yang sama (rename tetap atomik) agar build yang berjalan
+    # bersamaan tidak saling menimpa file/folder sementaranya
+    return f"{path}.{uuid.uuid4().hex}.{suffix}"
+
+
+def _write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# --- Level (kategori / numerik) ---
+def _encode_levels(levels, dtype):
+    if dtype is not None:
+        return {'kind': 'category', 'levels': list(dtype.categories), 'ordered': bool(dtype.ordered)}
+    return {'kind': 'numeric', 'levels': levels.tolist(), 'dtype': str(levels.dtype)}
+
+
+def _decode_levels(spec):
+    if spec['kind'] == 'category':
+        dtype = pd.CategoricalDtype(spec['levels'], ordered=spec['ordered'])
+        return dtype.categories, dtype
+    return pd.Index(spec['levels'], dtype=spec['dtype']), None
+
+
+# --- Kubus hitungan ---
+def save_cube(cube, directory):
+    np.savez(os.path.join(directory, 'cube.npz'), codes=cube.codes, population=cube.population, cases=cube.cases)
+    _write_json(os.path.join(directory, 'cube.json'), {
+        'dimensions': [
+            dict(name=name, **_encode_levels(levels, dtype)) for name, (levels, dtype) in cube.dimensions.items()
+        ]
+    })
+
+
+def load_cube(directory):
+    meta = _read_json(os.path.join(directory, 'cube.json'))
+    with np.load(os.path.join(directory, 'cube.npz')) as arrays:
+        codes, population, cases = arrays['codes'], arrays['population'], arrays['cases']
+    dimensions = {spec['name']: _decode_levels(spec) for spec in meta['dimensions']}
+    return CountCube(dimensions, codes, population, cases)
+
+
+# --- Indeks bitmap ---
+def save_bitmap_index(index, directory):
+    columns = list(index.levels)
+    arrays = {f"c{position}": np.stack(index.bitmaps[column]) for position, column in enumerate(columns)}
+    np.savez(os.path.join(directory, 'bitmap.npz'), **arrays)
+    _write_json(os.path.join(directory, 'bitmap.json'), {
+        'n_rows': index.n_rows,
+        'columns': [{'name': column, 'levels': list(index.levels[column])} for column in columns],
+    })
+
+
+def load_bitmap_index(directory):
+    meta = _read_json(os.path.join(directory, 'bitmap.json'))
+    levels, bitmaps = {}, {}
+    with np.load(os.path.join(directory, 'bitmap.npz')) as arrays:
+        for position, column in enumerate(meta['columns']):
+            levels[column['name']] = column['levels']
+            bitmaps[column['name']] = list(arrays[f"c{position}"])
+    return BitmapIndex(meta['n_rows'], levels, bitmaps)
+
+
+# --- Tabel halaman dan ringkasan ---
+@functools.lru_cache(maxsize=None)
+def code_version(compute):
+    """
+    Sidik jari kode agregasi `compute` (compute_tables halaman): hash file modul
+    halaman dan AGGREGATION_MODULES. Tabel artefak hanya dipakai jika sidik
+    jarinya sama, sehingga perubahan kode tidak menampilkan tabel lama.
+    """
+    digest = hashlib.sha1()
+    for name in (compute.__module__,) + AGGREGATION_MODULES:
+        module = sys.modules.get(name)
+        path = getattr(module, '__file__', None)
+        if path:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def save_tables(tables, directory):
+    """`tables`: {nama modul halaman: {'code': code_version, 'table': hasil compute_tables}}."""
+    pd.to_pickle(tables, os.path.join(directory, 'tables.pkl'))
+
+
+def load_tables(directory):
+    return pd.read_pickle(os.path.join(directory, 'tables.pkl'))
+
+
+def save_model(model, directory):
+    """`model`: {'code': code_version(fit_logistic_model), 'model': hasil fit_logistic_model}."""
+    pd.to_pickle(model, os.path.join(directory, 'model.pkl'))
+
+
+def load_model(directory):
+    return pd.read_pickle(os.path.join(directory, 'model.pkl'))
+
+
+def dataset_summary(df, source):
+    """Ringkasan dataset untuk halaman Deskripsi Dataset."""
+    return {
+        'source': os.path.basename(source),
+        'n_rows': int(len(df)),
+        'n_columns': int(df.shape[1]),
+        'columns': {column: str(dtype) for column, dtype in df.dtypes.items()},
+        'memory_mb': round(float(df.memory_usage(deep=True).sum()) / 1024 ** 2, 2),
+    }
+
+
+def save_summary(summary, directory):
+    _write_json(os.path.join(directory, 'summary.json'), summary)
+
+
+def load_summary(directory):
+    return _read_json(os.path.join(directory, 'summary.json'))
+
+
+def write_partition(root, name, cube, index, tables, summary, model=None):
+    """
+    Menulis semua artefak satu partisi ke `root/name` secara atomik. Folder
+    lama dipindahkan ke nama unik sebelum diganti; jika build lain sempat
+    memasang folder yang sama lebih dulu, folder itu dipakai (nama folder
+    memuat sidik jari dataset, jadi isinya setara).
+    """
+    directory = os.path.join(root, name)
+    tmp_directory = _unique_path(directory, 'tmp')
+    os.makedirs(tmp_directory)
+    try:
+        save_cube(cube, tmp_directory)
+        save_bitmap_index(index, tmp_directory)
+        save_tables(tables, tmp_directory)
+        save_summary(summary, tmp_directory)
+        if model is not None:
+            save_model(model, tmp_directory)
+
+        _retire(directory)
+        try:
+            os.replace(tmp_directory, directory)
+        except OSError:
+            if not os.path.exists(os.path.join(directory, 'summary.json')):
+                raise
+    finally:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+    return directory
+
+
+def _retire(directory):
+    """Memindahkan folder lama ke nama unik lalu menghapusnya."""
+    retired = _unique_path(directory, 'old')
+    try:
+        os.replace(directory, retired)
+    except FileNotFoundError:
+        # Tidak ada folder lama, atau sudah dipindahkan build lain
+        return
+    shutil.rmtree(retired, ignore_errors=True)
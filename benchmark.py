@@ -0,0 +1,256 @@
+import argparse
+import gc
+import inspect
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from bitmap_index import BitmapIndex
+from build_artifacts import study_case_pages
+from charts import chart_spec
+from cube import CountCube
+from data_loader import _prepare_frame
+from diagnostics import payload_bytes
+from pages.sc11_risk_scan import compute_scan
+from parallel import PARALLEL_WORKERS, parallel_count_cube
+from synthetic import generate_frame
+
+# Benchmark performa dashboard: waktu dan puncak memori setiap tahap.
+#
+#   python benchmark.py                        # skala 1x, 10x, 100x; bandingkan dengan baseline
+#   python benchmark.py --scales 1 10          # skala tertentu saja
+#   python benchmark.py --save-baseline        # simpan hasil sebagai baseline baru
+#   python benchmark.py --synthetic 246022     # tanpa Data/: dataset sintetis (synthetic.py)
+#
+# Tahap yang diukur per skala:
+#   load_full_dataset       memuat dataset bertipe skema (1x dari Data/: data_loader
+#                           tanpa cache Streamlit; selain itu membaca snapshot
+#                           Parquet berukuran N x, jalur yang sama saat snapshot
+#                           sudah ada)
+#   build_count_cube        CountCube.from_frame atas seluruh baris
+#   build_count_cube_parallel   kubus yang sama lewat process pool (parallel.py,
+#                           --workers proses, partisi baris di shared memory)
+#   build_bitmap_index      BitmapIndex.from_frame atas seluruh baris
+#   sc11_risk_scan.compute_scan   skor semua kolom kategori dari indeks bitmap
+#   <halaman>.compute_tables    agregasi setiap halaman study case dari kubus
+#   <halaman>.create_*          setiap pembuat grafik, termasuk konversi ke
+#                               spesifikasi minimal yang disimpan cache grafik
+#                               (charts.chart_spec); payload_kb = ukuran kirimnya
+#
+# Dataset N x dibuat dengan mengulang baris dataset asli N kali. Waktu adalah
+# yang tercepat dari --repeat kali ulangan setelah satu panggilan pemanasan; puncak
+# memori diukur terpisah dengan tracemalloc (alokasi internal Arrow saat
+# membaca Parquet tidak tercatat).
+# Jalankan dari root repo (folder Data/ harus ada).
+
+DEFAULT_SCALES = [1, 10, 100]
+BASELINE_PATH = 'benchmark_baseline.json'
+# Tahap dianggap melambat jika lebih lambat dari baseline melebihi toleransi
+# relatif DAN selisihnya melebihi MIN_DELTA_S detik: tahap puluhan milidetik
+# (pembuat grafik) bisa berfluktuasi hingga +-50% antar proses pada mesin
+# bersama, jadi bandingkan tahap kecil secara manual di mesin yang tenang.
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_S = 0.05
+DEFAULT_REPEAT = 5
+
+# Argumen pembuat grafik yang tidak menerima hasil compute_tables apa adanya
+# (halaman yang compute_tables-nya mengembalikan beberapa tabel).
+CHART_ARGS = {
+    'pages.sc2_gender_usia': {
+        'create_gender_age_stacked_bar_chart': lambda tables: (tables[0],),
+        'create_global_percentage_chart': lambda tables: tables[1:],
+        'create_absolute_increase_chart': lambda tables: tables[1:],
+    },
+}
+
+logger = logging.getLogger(__name__)
+
+
+def scaled_frame(df, scale):
+    """Dataset `scale` x dengan mengulang baris `df` (tipe kolom skema dipertahankan)."""
+    if scale == 1:
+        return df
+    return pd.concat([df] * scale, ignore_index=True)
+
+
+def chart_builders(module):
+    """Fungsi create_* milik modul halaman, diurutkan menurut posisi di file."""
+    functions = [
+        function for name, function in inspect.getmembers(module, inspect.isfunction)
+        if name.startswith('create_') and function.__module__ == module.__name__
+    ]
+    return sorted(functions, key=lambda function: function.__code__.co_firstlineno)
+
+
+def chart_payload_bytes(spec):
+    """Ukuran payload spesifikasi grafik yang dikirim ke browser."""
+    return payload_bytes('vega_lite_chart' if isinstance(spec, dict) else 'plotly_chart', spec)
+
+
+def measure(function, repeat):
+    """Waktu tercepat dari `repeat` kali panggilan dan puncak memori satu panggilan terlacak."""
+    # Satu panggilan pemanasan (import lazy, validasi skema Altair pertama kali, dll.)
+    result = function()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+
+    del result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {
+        'seconds': round(min(timings), 6),
+        'peak_mb': round(peak / 1024 ** 2, 2),
+    }
+
+
+def load_base_frame(synthetic_rows=None):
+    """Dataset asli (partisi tahun terbaru) atau `synthetic_rows` baris sintetis, bertipe skema."""
+    if synthetic_rows:
+        return _prepare_frame(generate_frame(synthetic_rows))
+    partitions = data_loader.list_partitions()
+    if not partitions:
+        raise SystemExit(f"Dataset tidak ditemukan di {data_loader.DATA_DIR}/ (jalankan dari root repo).")
+    path = partitions[max(partitions)]
+    if data_loader.use_streaming(path):
+        raise SystemExit(f"{path} melebihi STREAMING_THRESHOLD_MB; benchmark membutuhkan dataset yang muat di memori.")
+    return data_loader._read_dataset(path)
+
+
+def run_scale(base, scale, repeat, workdir, synthetic=False, workers=PARALLEL_WORKERS):
+    results = {}
+    df = scaled_frame(base, scale)
+    logger.info("Skala %dx: %d baris", scale, len(df))
+
+    if scale == 1 and not synthetic:
+        load = data_loader._load_full_dataset
+    else:
+        snapshot_path = os.path.join(workdir, f"scaled-{scale}x.parquet")
+        df.to_parquet(snapshot_path, engine='pyarrow', index=False)
+        load = lambda: pd.read_parquet(snapshot_path, engine='pyarrow')
+    _, results['load_full_dataset'] = measure(load, repeat)
+
+    cube, results['build_count_cube'] = measure(lambda: CountCube.from_frame(df).materialize(), repeat)
+    _, results['build_count_cube_parallel'] = measure(lambda: parallel_count_cube(df, workers=workers), repeat)
+    results['build_count_cube_parallel']['workers'] = workers
+    index, results['build_bitmap_index'] = measure(lambda: BitmapIndex.from_frame(df), repeat)
+    del df
+    gc.collect()
+    _, results['sc11_risk_scan.compute_scan'] = measure(lambda: compute_scan([index], {}), repeat)
+    del index
+    gc.collect()
+
+    for module in study_case_pages():
+        page = module.__name__.rsplit('.', 1)[-1]
+        tables, results[f"{page}.compute_tables"] = measure(lambda: module.compute_tables(cube), repeat)
+
+        for builder in chart_builders(module):
+            args = CHART_ARGS.get(module.__name__, {}).get(builder.__name__, lambda tables: (tables,))(tables)
+            spec, stats = measure(lambda: chart_spec(builder(*args)), repeat)
+            stats['payload_kb'] = round(chart_payload_bytes(spec) / 1024, 1)
+            results[f"{page}.{builder.__name__}"] = stats
+    return results
+
+
+def run(scales, repeat, synthetic_rows=None, workers=PARALLEL_WORKERS):
+    base = load_base_frame(synthetic_rows)
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'rows_1x': int(len(base)),
+            'synthetic': bool(synthetic_rows),
+            'cpu_count': os.cpu_count(),
+        },
+        'scales': {},
+    }
+    with tempfile.TemporaryDirectory(prefix='heart-bench-') as workdir:
+        for scale in scales:
+            report['scales'][str(scale)] = run_scale(base, scale, repeat, workdir, bool(synthetic_rows), workers)
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Mencetak perbandingan dengan baseline; mengembalikan daftar tahap yang melambat."""
+    regressions = []
+    for scale, stages in report['scales'].items():
+        reference = baseline.get('scales', {}).get(scale, {})
+        print(f"\n== Skala {scale}x ==")
+        print(f"{'tahap':<58}{'detik':>10}{'baseline':>10}{'rasio':>8}{'puncak MB':>11}")
+        for stage, stats in stages.items():
+            before = reference.get(stage)
+            if before is None:
+                print(f"{stage:<58}{stats['seconds']:>10.4f}{'-':>10}{'-':>8}{stats['peak_mb']:>11.1f}")
+                continue
+            ratio = stats['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+            slower = (
+                ratio > 1 + tolerance
+                and stats['seconds'] - before['seconds'] > MIN_DELTA_S
+            )
+            if slower:
+                regressions.append((scale, stage, ratio))
+            flag = '  <-- lebih lambat' if slower else ''
+            print(
+                f"{stage:<58}{stats['seconds']:>10.4f}{before['seconds']:>10.4f}"
+                f"{ratio:>8.2f}{stats['peak_mb']:>11.1f}{flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waktu dan memori pemuatan, agregasi, dan grafik dashboard.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Skala dataset (default: 1 10 100).")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f"Jumlah ulangan per tahap (default: {DEFAULT_REPEAT}).")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help=f"File baseline (default: {BASELINE_PATH}).")
+    parser.add_argument('--save-baseline', action='store_true', help="Simpan hasil sebagai baseline baru.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Toleransi perlambatan relatif (default: 0.25).")
+    parser.add_argument('--output', help="Simpan hasil lengkap ke file JSON ini.")
+    parser.add_argument('--workers', type=int, default=PARALLEL_WORKERS, help=f"Jumlah proses untuk build_count_cube_parallel (default: {PARALLEL_WORKERS}).")
+    parser.add_argument('--synthetic', type=int, metavar='ROWS', help="Pakai ROWS baris sintetis sebagai dataset 1x.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+    # st.* di luar server Streamlit hanya memberi peringatan "No runtime found"
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    report = run(args.scales, args.repeat, args.synthetic, args.workers)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline disimpan ke {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} tahap lebih lambat dari baseline (toleransi {args.tolerance:.0%}).")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+# Indeks bitmap untuk kolom kategori.
+# Setiap level dari setiap kolom kategori disimpan sebagai bitset terpaket
+# (np.packbits, 1 bit per baris), mis. satu bitset untuk Sex == 'Female',
+# satu untuk setiap State, dan satu untuk HadHeartAttack == 'Yes'. Filter
+# konjungtif apa pun cukup dihitung dengan operasi AND antar-bitset lalu
+# popcount, tanpa boolean mask per baris maupun groupby.
+#
+# Semua bitset disimpan sebagai baris satu matriks (level x byte), yaitu
+# matriks one-hot seluruh kolom kategori dalam bentuk terpaket. Hitungan
+# setiap level di dalam suatu segmen (level_counts) adalah satu perkalian
+# matriks one-hot dengan vektor segmen: AND per baris lalu popcount.
+
+# Lebar blok byte saat menghitung level_counts, agar array sementara
+# (level x blok) tetap kecil pada dataset besar
+COUNT_BLOCK_BYTES = 1 << 16
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(bits):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+
+    def _popcount_rows(matrix):
+        return np.bitwise_count(matrix).sum(axis=1, dtype=np.int64)
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(bits):
+        return int(_POPCOUNT_TABLE[bits].sum(dtype=np.int64))
+
+    def _popcount_rows(matrix):
+        return _POPCOUNT_TABLE[matrix].sum(axis=1, dtype=np.int64)
+
+
+def _category_codes(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    return series.cat.codes.to_numpy(), list(series.cat.categories)
+
+
+def _level_bitsets(series):
+    """Bitset terpaket setiap level `series`, dibuat satu per satu saat diiterasi."""
+    codes, levels = _category_codes(series)
+    for code in range(len(levels)):
+        yield np.packbits(codes == code)
+
+
+class BitmapIndex:
+    """
+    Kumpulan bitset terpaket per (kolom, level).
+
+    Filter ditulis sebagai keyword: nilai tunggal atau daftar nilai
+    (OR di dalam satu kolom, AND antar-kolom), mis.
+    index.count(Sex='Female', State=['Ohio', 'Texas'], HadHeartAttack='Yes').
+    """
+
+    def __init__(self, n_rows, levels, bitmaps):
+        self.n_rows = n_rows
+        self.levels = levels
+        # Bitset setiap level menjadi baris matriks; self.bitmaps berisi view
+        # ke baris-baris tersebut (tanpa salinan kedua). `bitmaps` boleh berupa
+        # iterator per kolom sehingga bitset ditulis langsung ke matriks.
+        self.labels = [(column, level) for column in levels for level in levels[column]]
+        n_bytes = (n_rows + 7) // 8
+        self.matrix = np.empty((len(self.labels), n_bytes), dtype=np.uint8)
+        self.bitmaps = {}
+        position = 0
+        for column in levels:
+            self.bitmaps[column] = []
+            for bits in bitmaps[column]:
+                self.matrix[position] = bits
+                self.bitmaps[column].append(self.matrix[position])
+                position += 1
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """Membangun indeks untuk semua kolom kategori (atau `columns` tertentu)."""
+        if columns is None:
+            columns = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+
+        levels, bitmaps = {}, {}
+        for column in columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                levels[column] = list(series.cat.categories)
+            else:
+                levels[column] = list(series.astype('category').cat.categories)
+            bitmaps[column] = _level_bitsets(series)
+        return cls(len(df), levels, bitmaps)
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=None):
+        """
+        Membangun indeks dari potongan DataFrame secara bertahap (ingest
+        chunked) tanpa pernah memegang seluruh baris. Setiap chunk kecuali
+        yang terakhir harus berisi kelipatan 8 baris agar bitset terpaketnya
+        dapat disambung langsung.
+        """
+        n_rows = 0
+        levels, parts = {}, {}
+        for chunk in chunks:
+            if n_rows % 8:
+                raise ValueError("Setiap chunk selain yang terakhir harus berisi kelipatan 8 baris.")
+            part = cls.from_frame(chunk, columns)
+            n_bytes = (part.n_rows + 7) // 8
+            for column, column_levels in part.levels.items():
+                if column not in levels:
+                    levels[column], parts[column] = [], []
+                for level in column_levels:
+                    if level not in levels[column]:
+                        # Level baru: chunk sebelumnya tidak memiliki baris dengan level ini
+                        levels[column].append(level)
+                        parts[column].append([np.zeros((n_rows + 7) // 8, dtype=np.uint8)])
+                for position, level in enumerate(levels[column]):
+                    if level in column_levels:
+                        parts[column][position].append(part.bitmaps[column][column_levels.index(level)])
+                    else:
+                        parts[column][position].append(np.zeros(n_bytes, dtype=np.uint8))
+            n_rows += part.n_rows
+
+        bitmaps = {column: [np.concatenate(pieces) for pieces in parts[column]] for column in parts}
+        return cls(n_rows, levels, bitmaps)
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes
+
+    def level_counts(self, bits=None):
+        """
+        Jumlah baris per (kolom, level) di dalam bitset `bits` (None = semua
+        baris) untuk semua kolom sekaligus, searah dengan self.labels.
+        """
+        counts = np.zeros(len(self.labels), dtype=np.int64)
+        for start in range(0, self.matrix.shape[1], COUNT_BLOCK_BYTES):
+            block = self.matrix[:, start:start + COUNT_BLOCK_BYTES]
+            if bits is not None:
+                block = block & bits[start:start + COUNT_BLOCK_BYTES]
+            counts += _popcount_rows(block)
+        return counts
+
+    def bitmap(self, column, values):
+        """Bitset untuk `column` bernilai salah satu dari `values` (OR)."""
+        if isinstance(values, str) or np.isscalar(values):
+            values = [values]
+        result = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in self.levels[column]:
+                result |= self.bitmaps[column][self.levels[column].index(value)]
+        return result
+
+    def mask(self, **filters):
+        """Bitset hasil AND semua filter; None berarti tanpa filter (semua baris)."""
+        result = None
+        for column, values in filters.items():
+            if values is None:
+                continue
+            bits = self.bitmap(column, values)
+            result = bits if result is None else np.bitwise_and(result, bits, out=result)
+        return result
+
+    def count(self, **filters):
+        """Jumlah baris yang memenuhi semua filter."""
+        bits = self.mask(**filters)
+        return self.n_rows if bits is None else _popcount(bits)
@@ -0,0 +1,121 @@
+import argparse
+import importlib
+import logging
+import os
+import pkgutil
+import shutil
+import time
+
+import pandas as pd
+
+import artifacts
+import risk_model
+from bitmap_index import BitmapIndex
+from data_loader import (
+    ARTIFACT_DIR, _prepare_frame, _read_dataset, build_bitmap_index_chunked,
+    build_count_cube_chunked, dataset_fingerprint, list_partitions, use_streaming
+)
+from parallel import build_count_cube
+from schema import SCHEMA_VERSION
+
+# Build offline (headless) seluruh artefak yang dibutuhkan aplikasi:
+#
+#   python build_artifacts.py                 # semua tahun yang tersedia
+#   python build_artifacts.py --years 2022    # tahun tertentu saja
+#
+# CSV mentah dibaca sekali per partisi, lalu kubus hitungan, indeks bitmap,
+# tabel setiap halaman study case, model risiko multivariabel, dan ringkasan
+# dataset ditulis ke ARTIFACT_DIR (lihat artifacts.py). Setelah itu folder
+# Data/ tidak perlu ikut dikirim ke container aplikasi. Jalankan ulang setelah dataset, skema, atau
+# logika agregasi halaman berubah.
+
+logger = logging.getLogger(__name__)
+
+
+def study_case_pages():
+    """Modul halaman yang memiliki compute_tables (sc1-sc10), diurutkan menurut nama."""
+    import pages
+    modules = []
+    for info in sorted(pkgutil.iter_modules(pages.__path__), key=lambda info: info.name):
+        module = importlib.import_module(f"pages.{info.name}")
+        if hasattr(module, 'compute_tables'):
+            modules.append(module)
+    return modules
+
+
+def build_partition(year, path, output=ARTIFACT_DIR):
+    """Membangun artefak satu partisi tahun dan mengembalikan entri manifest-nya."""
+    fingerprint = dataset_fingerprint(path)
+    started = time.perf_counter()
+
+    if use_streaming(path):
+        cube = build_count_cube_chunked(path)
+        index = build_bitmap_index_chunked(path)
+        # Ringkasan tipe kolom dari sampel kecil; jumlah baris dari indeks bitmap
+        summary = artifacts.dataset_summary(_prepare_frame(pd.read_csv(path, nrows=1000)), path)
+        summary.update(n_rows=index.n_rows, memory_mb=None)
+    else:
+        df = _read_dataset(path)
+        cube = build_count_cube(df)
+        index = BitmapIndex.from_frame(df)
+        summary = artifacts.dataset_summary(df, path)
+        del df
+
+    cube.materialize()
+    tables = {
+        module.__name__: {'code': artifacts.code_version(module.compute_tables), 'table': module.compute_tables(cube)}
+        for module in study_case_pages()
+    }
+    model = {
+        'code': artifacts.code_version(risk_model.fit_logistic_model),
+        'model': risk_model.fit_logistic_model([index]),
+    }
+
+    name = f"{year}-{fingerprint}-s{SCHEMA_VERSION}"
+    artifacts.write_partition(output, name, cube, index, tables, summary, model)
+    logger.info("Artefak %s selesai dalam %.1f s", name, time.perf_counter() - started)
+    return {
+        'dir': name,
+        'fingerprint': fingerprint,
+        'schema': SCHEMA_VERSION,
+        'source': os.path.basename(path),
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def build(years=None, output=ARTIFACT_DIR):
+    """Membangun artefak untuk `years` (default: semua partisi CSV) dan memperbarui manifest."""
+    partitions = list_partitions()
+    if years is not None:
+        missing = sorted(set(years) - set(partitions))
+        if missing:
+            raise SystemExit(f"Partisi CSV tidak ditemukan untuk tahun: {missing}")
+        partitions = {year: partitions[year] for year in years}
+    if not partitions:
+        raise SystemExit("Tidak ada file CSV yang dapat dibangun.")
+
+    manifest = artifacts.read_manifest(output)
+    for year, path in sorted(partitions.items()):
+        entry = build_partition(year, path, output)
+        previous = manifest.get(year)
+        manifest[year] = entry
+        artifacts.write_manifest(output, manifest)
+        if previous and previous['dir'] != entry['dir']:
+            # Versi lama tidak lagi dirujuk manifest
+            shutil.rmtree(os.path.join(output, previous['dir']), ignore_errors=True)
+        print(f"{year}: {entry['dir']}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build offline artefak dashboard (kubus, indeks, tabel halaman).")
+    parser.add_argument('--years', type=int, nargs='+', help="Tahun partisi yang dibangun (default: semua).")
+    parser.add_argument('--output', default=ARTIFACT_DIR, help=f"Folder artefak (default: {ARTIFACT_DIR}).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+    build(args.years, args.output)
+
+
+if __name__ == '__main__':
+    main()
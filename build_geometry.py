@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+from us_states import ASSET_PATH, MAP_TERRITORIES, OFF_MAP_TERRITORIES
+
+# Build offline geometri negara bagian AS untuk peta choropleth sc7:
+#
+#   python build_geometry.py cb_2016_us_state_500k.shp
+#   python build_geometry.py cb_2016_us_state_500k.shp --tolerance 0.01   # lebih detail
+#
+# Sumber: shapefile Cartographic Boundary Census Bureau (domain publik), mis.
+# cb_2016_us_state_500k.{shp,dbf} dari https://www.census.gov/geographies/
+# atau dari paket `plotly-geo` (_plotly_geo/package_data/). Poligon
+# disederhanakan dengan Douglas-Peucker (--tolerance, derajat), pulau yang
+# lebih kecil dari --min-area dibuang, dan koordinat dibulatkan, lalu hasilnya
+# ditulis sebagai GeoJSON ke ASSET_PATH yang ikut dikirim bersama aplikasi.
+
+DEFAULT_TOLERANCE = 0.03   # derajat (~3 km)
+DEFAULT_MIN_AREA = 0.02    # derajat persegi (~200 km^2)
+COORDINATE_DECIMALS = 3
+
+
+# --- Pembaca shapefile (poligon) dan dBASE minimal ---
+def read_dbf(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    n_records, header_length, record_length = struct.unpack('<IHH', data[4:12])
+    fields = []
+    position = 32
+    while data[position] != 0x0D:
+        name = data[position:position + 11].split(b'\x00')[0].decode('ascii')
+        fields.append((name, data[position + 16]))
+        position += 32
+
+    records = []
+    for index in range(n_records):
+        offset = header_length + index * record_length + 1  # lewati flag hapus
+        record = {}
+        for name, length in fields:
+            record[name] = data[offset:offset + length].decode('latin-1').strip()
+            offset += length
+        records.append(record)
+    return records
+
+
+def read_polygons(path):
+    """Daftar poligon per record shapefile; setiap poligon berupa list ring (array N x 2)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    shapes = []
+    position = 100
+    while position < len(data):
+        _, content_words = struct.unpack('>ii', data[position:position + 8])
+        content = data[position + 8:position + 8 + content_words * 2]
+        position += 8 + content_words * 2
+
+        shape_type = struct.unpack('<i', content[:4])[0]
+        if shape_type != 5:
+            raise ValueError(f"Tipe shape {shape_type} tidak didukung (hanya Polygon).")
+        n_parts, n_points = struct.unpack('<ii', content[36:44])
+        parts = np.frombuffer(content, dtype='<i4', count=n_parts, offset=44)
+        points = np.frombuffer(content, dtype='<f8', count=n_points * 2, offset=44 + 4 * n_parts).reshape(-1, 2)
+        bounds = list(parts) + [n_points]
+        shapes.append([points[start:end] for start, end in zip(bounds[:-1], bounds[1:])])
+    return shapes
+
+
+# --- Penyederhanaan ---
+def douglas_peucker(points, tolerance):
+    """Titik ring yang dipertahankan Douglas-Peucker (ujung ring selalu dipertahankan)."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[start + 1:end]
+        a, b = points[start], points[end]
+        direction = b - a
+        length = np.hypot(*direction)
+        if length == 0:
+            distances = np.hypot(*(segment - a).T)
+        else:
+            distances = np.abs(direction[0] * (segment[:, 1] - a[1]) - direction[1] * (segment[:, 0] - a[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            middle = start + 1 + farthest
+            keep[middle] = True
+            stack.append((start, middle))
+            stack.append((middle, end))
+    return points[keep]
+
+
+def ring_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def simplify_shape(rings, tolerance, min_area):
+    """
+    Menyederhanakan ring satu negara bagian. Ring yang terlalu kecil dibuang,
+    kecuali ring terbesar (agar wilayah kepulauan kecil tetap punya geometri).
+    """
+    largest = max(range(len(rings)), key=lambda index: ring_area(rings[index]))
+    simplified = []
+    for index, ring in enumerate(rings):
+        if index != largest and ring_area(ring) < min_area:
+            continue
+        ring = douglas_peucker(ring, tolerance)
+        if len(ring) < 4:
+            if index != largest:
+                continue
+            ring = rings[index]
+        simplified.append(np.round(ring, COORDINATE_DECIMALS))
+    return simplified
+
+
+def _is_clockwise(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)) < 0
+
+
+def to_geometry(rings):
+    """
+    Ring shapefile ke geometri GeoJSON MultiPolygon; setiap lubang (ring
+    berlawanan arah jarum jam) ditempelkan ke ring luar sebelumnya. Arah ring
+    shapefile dipertahankan (luar searah jarum jam) karena itulah konvensi
+    d3-geo yang dipakai Plotly; arah RFC 7946 membuat isian menutupi seluruh peta.
+    """
+    polygons = []
+    for ring in rings:
+        coordinates = ring.tolist()
+        if _is_clockwise(ring) or not polygons:
+            polygons.append([coordinates])
+        else:
+            polygons[-1].append(coordinates)
+    return {'type': 'MultiPolygon', 'coordinates': polygons}
+
+
+def build(shp_path, output=ASSET_PATH, tolerance=DEFAULT_TOLERANCE, min_area=DEFAULT_MIN_AREA):
+    records = read_dbf(os.path.splitext(shp_path)[0] + '.dbf')
+    shapes = read_polygons(shp_path)
+    wanted = set(MAP_TERRITORIES) | set(OFF_MAP_TERRITORIES)
+
+    features = []
+    for record, rings in zip(records, shapes):
+        code = record['STUSPS']
+        if code not in wanted:
+            continue
+        features.append({
+            'type': 'Feature',
+            'id': code,
+            'properties': {'name': record['NAME'], 'on_map': code in MAP_TERRITORIES},
+            'geometry': to_geometry(simplify_shape(rings, tolerance, min_area)),
+        })
+    features.sort(key=lambda feature: feature['id'])
+
+    collection = {
+        'type': 'FeatureCollection',
+        'properties': {'source': os.path.basename(shp_path), 'tolerance': tolerance, 'min_area': min_area},
+        'features': features,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(collection, f, separators=(',', ':'))
+    os.replace(tmp_path, output)
+    return collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Membangun GeoJSON negara bagian AS yang disederhanakan untuk peta sc7.")
+    parser.add_argument('shapefile', help="Path cb_<tahun>_us_state_<resolusi>.shp (file .dbf di folder yang sama).")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help=f"Toleransi Douglas-Peucker dalam derajat (default: {DEFAULT_TOLERANCE}).")
+    parser.add_argument('--min-area', type=float, default=DEFAULT_MIN_AREA, help=f"Luas minimum pulau dalam derajat persegi (default: {DEFAULT_MIN_AREA}).")
+    parser.add_argument('--output', default=ASSET_PATH, help=f"File GeoJSON keluaran (default: {ASSET_PATH}).")
+    args = parser.parse_args()
+
+    collection = build(args.shapefile, args.output, args.tolerance, args.min_area)
+    n_points = sum(
+        len(ring) for feature in collection['features']
+        for polygon in feature['geometry']['coordinates'] for ring in polygon
+    )
+    print(f"{len(collection['features'])} wilayah, {n_points} titik, {os.path.getsize(args.output) / 1024:.0f} KB -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+import argparse
+import math
+
+import numpy as np
+
+from schema import COLUMN_SCHEMA
+from synthetic import (
+    NUMERIC_GRIDS, PROFILE_FORMAT, PROFILE_PATH, SAMPLING_ORDER, _levels, parents_of, write_profile
+)
+
+# Build profil distribusi bawaan synthetic.py tanpa data asli:
+#
+#   python build_synthetic_profile.py                 # tulis ke synthetic_profile.json
+#   python build_synthetic_profile.py --check         # cetak selisih terhadap target saja
+#
+# Profil bawaan TIDAK di-fit dari baris CSV asli. Setiap kolom dikalibrasi ke
+# target ringkas di bawah: proporsi setiap level dan rasio insiden serangan
+# jantung per level, dibulatkan dari ringkasan yang dipublikasikan untuk
+# "Key Indicators of Heart Disease (2022)" (CDC BRFSS 2022, 246.022 baris
+# tanpa nilai kosong). Di dalam setiap strata induk, level juga digeser menurut
+# usia (AGE), jenis kelamin (MALE), dan status merokok (SMOKER) agar hubungan
+# perancu seperti usia x penyakit kronis tetap ada. Angkanya perkiraan:
+# jangan dipakai untuk kesimpulan medis. Jika CSV asli tersedia, ganti profil
+# ini dengan `python synthetic.py fit Data/heart_2022_no_nans.csv`.
+
+N_ROWS = 246022
+HEART_ATTACK_RATE = 0.0546
+MALE_ODDS_RATIO = 2.0
+CALIBRATION_ITERATIONS = 500
+
+AGE_ROWS = [13122, 11158, 13346, 15614, 16973, 16753, 19913, 22224, 26720, 28557, 25739, 18136, 17767]
+FEMALE_SHARE = [0.49, 0.50, 0.51, 0.51, 0.51, 0.51, 0.51, 0.51, 0.52, 0.53, 0.53, 0.55, 0.58]
+# Insiden relatif per kelompok usia (diskalakan ke HEART_ATTACK_RATE)
+AGE_INCIDENCE = [0.4, 0.5, 0.8, 1.1, 1.6, 2.4, 3.5, 5.0, 6.3, 7.6, 9.2, 11.0, 13.3]
+
+
+def _yes(share, incidence, age=0.0, male=1.0):
+    """Target kolom Ya/Tidak: proporsi dan insiden (%) level 'Yes', pergeseran usia dan jenis kelamin."""
+    return {
+        'share': [1 - share, share],
+        'incidence': [None, incidence],
+        'age': [0.0, age],
+        'male': [1.0, male],
+    }
+
+
+# share: proporsi level; incidence: rasio insiden (%) per level (None: dihitung
+# dari sisa); age: log-rasio level ujung usia tertua vs tengah; male: pengali
+# odds level untuk laki-laki; smoker: pengali per status merokok (kolom dengan
+# induk SmokerStatus).
+CATEGORY_TARGETS = {
+    'GeneralHealth': {
+        'share': [0.170, 0.355, 0.315, 0.123, 0.037],
+        'incidence': [1.7, 3.0, 6.2, 11.5, 19.0],
+        'age': [-0.4, 0.0, 0.2, 0.5, 0.5],
+    },
+    'LastCheckupTime': {
+        'share': [0.810, 0.100, 0.055, 0.035],
+        'incidence': [6.3, 2.9, 2.3, 2.0],
+        'age': [0.4, -0.3, -0.5, -0.5],
+        'male': [1.0, 1.2, 1.4, 1.7],
+    },
+    'PhysicalActivities': {
+        'share': [0.225, 0.775],
+        'incidence': [9.0, 4.4],
+        'age': [0.3, 0.0],
+    },
+    'RemovedTeeth': {
+        'share': [0.530, 0.290, 0.120, 0.060],
+        'incidence': [3.3, 6.0, 10.5, 13.0],
+        'age': [-1.0, 0.5, 1.0, 1.5],
+    },
+    'HadAngina': _yes(0.060, 43.0, age=1.5, male=1.3),
+    'HadStroke': _yes(0.042, 25.0, age=1.5),
+    'HadAsthma': _yes(0.150, 7.9, age=-0.2, male=0.7),
+    'HadSkinCancer': _yes(0.085, 10.4, age=1.8),
+    'HadCOPD': _yes(0.080, 16.0, age=1.3),
+    'HadDepressiveDisorder': _yes(0.200, 6.9, age=-0.4, male=0.6),
+    'HadKidneyDisease': _yes(0.045, 17.0, age=1.4),
+    'HadArthritis': _yes(0.350, 9.0, age=1.6, male=0.8),
+    'HadDiabetes': {
+        'share': [0.138, 0.023, 0.008, 0.831],
+        'incidence': [12.7, 7.4, 2.8, 4.1],
+        'age': [1.2, 0.7, -0.5, 0.0],
+        'male': [1.2, 1.0, 0.02, 1.0],
+    },
+    'DeafOrHardOfHearing': _yes(0.086, 12.5, age=1.8, male=1.8),
+    'BlindOrVisionDifficulty': _yes(0.048, 11.5, age=0.7),
+    'DifficultyConcentrating': _yes(0.107, 9.4, age=-0.1),
+    'DifficultyWalking': _yes(0.146, 14.0, age=1.3),
+    'DifficultyDressingBathing': _yes(0.034, 15.5, age=0.8),
+    'DifficultyErrands': _yes(0.068, 11.8, age=0.4, male=0.7),
+    'SmokerStatus': {
+        'share': [0.600, 0.280, 0.031, 0.089],
+        'incidence': [4.1, 8.2, 6.0, 6.8],
+        'age': [0.0, 1.0, -0.4, -0.1],
+        'male': [1.0, 1.3, 1.1, 1.15],
+    },
+    'ECigaretteUsage': {
+        'share': [0.775, 0.176, 0.026, 0.023],
+        'incidence': [5.9, 5.0, 3.7, 3.2],
+        'age': [0.0, -0.8, -1.2, -1.2],
+        'smoker': [[1.0, 1.0, 1.0, 1.0], [0.3, 2.0, 3.0, 3.5], [0.3, 1.0, 4.0, 4.0], [0.2, 2.0, 2.5, 3.0]],
+    },
+    'ChestScan': _yes(0.430, 10.3, age=1.0),
+    'RaceEthnicityCategory': {
+        'share': [0.770, 0.078, 0.050, 0.021, 0.081],
+        'incidence': [5.9, 4.7, 4.2, 6.2, 3.3],
+        'age': [0.0, -0.3, -0.5, -0.6, -0.8],
+    },
+    'AlcoholDrinkers': {
+        'share': [0.470, 0.530],
+        'incidence': [6.8, 4.2],
+        'age': [0.0, -0.4],
+        'smoker': [[1.0, 1.0, 1.0, 1.0], [0.85, 1.15, 1.4, 1.25]],
+    },
+    'HIVTesting': _yes(0.340, 4.6, age=-1.0),
+    'FluVaxLast12': _yes(0.530, 6.4, age=1.0),
+    'PneumoVaxEver': _yes(0.420, 9.0, age=2.0),
+    'TetanusLast10Tdap': {
+        'share': [0.310, 0.040, 0.310, 0.340],
+        'incidence': [4.0, 6.7, 5.8, 6.3],
+        'age': [-0.5, 0.3, 0.2, 0.0],
+    },
+    'HighRiskLastYear': _yes(0.043, 4.4, age=-1.0),
+    'CovidPos': {
+        'share': [0.680, 0.030, 0.290],
+        'incidence': [6.0, 3.0, 4.4],
+        'age': [0.0, -0.6, -0.5],
+    },
+}
+
+# Negara bagian: (jumlah responden, insiden %, pergeseran usia)
+STATE_TARGETS = {
+    'Alabama': (3800, 7.4, 0.0), 'Alaska': (2300, 4.6, -0.3), 'Arizona': (6400, 5.4, 0.1),
+    'Arkansas': (3300, 7.5, 0.0), 'California': (5900, 4.4, -0.2), 'Colorado': (5900, 4.0, -0.2),
+    'Connecticut': (5600, 4.9, 0.1), 'Delaware': (2900, 5.6, 0.1), 'District of Columbia': (1700, 3.3, -0.5),
+    'Florida': (6600, 6.0, 0.3), 'Georgia': (5400, 5.7, -0.1), 'Guam': (1200, 4.9, -0.5),
+    'Hawaii': (5400, 4.6, 0.0), 'Idaho': (3300, 5.3, 0.0), 'Illinois': (3100, 5.3, -0.1),
+    'Indiana': (5700, 6.4, 0.0), 'Iowa': (4900, 5.5, 0.1), 'Kansas': (6100, 5.8, 0.0),
+    'Kentucky': (2300, 7.6, 0.1), 'Louisiana': (3000, 7.2, -0.1), 'Maine': (6300, 5.9, 0.3),
+    'Maryland': (9900, 4.9, 0.0), 'Massachusetts': (5100, 4.7, 0.0), 'Michigan': (6600, 6.3, 0.1),
+    'Minnesota': (9200, 4.6, 0.0), 'Mississippi': (3100, 7.2, 0.0), 'Missouri': (4400, 6.8, 0.1),
+    'Montana': (3800, 5.7, 0.2), 'Nebraska': (5300, 5.3, 0.0), 'Nevada': (1700, 5.8, 0.0),
+    'New Hampshire': (3100, 5.2, 0.2), 'New Jersey': (4300, 5.0, 0.0), 'New Mexico': (2800, 5.6, 0.1),
+    'New York': (12000, 5.1, -0.1), 'North Carolina': (3200, 6.1, 0.0), 'North Dakota': (2800, 5.4, 0.0),
+    'Ohio': (8700, 6.6, 0.0), 'Oklahoma': (3300, 7.4, 0.0), 'Oregon': (3800, 5.1, 0.1),
+    'Pennsylvania': (3400, 6.1, 0.1), 'Puerto Rico': (1900, 4.5, 0.2), 'Rhode Island': (3100, 5.4, 0.1),
+    'South Carolina': (5200, 6.4, 0.1), 'South Dakota': (3200, 5.7, 0.1), 'Tennessee': (3600, 7.2, 0.0),
+    'Texas': (7100, 5.3, -0.3), 'Utah': (6200, 3.9, -0.4), 'Vermont': (4000, 5.3, 0.2),
+    'Virgin Islands': (600, 3.9, 0.0), 'Virginia': (5300, 5.6, 0.0), 'Washington': (15000, 5.0, 0.0),
+    'West Virginia': (3700, 8.3, 0.2), 'Wisconsin': (4700, 5.4, 0.1), 'Wyoming': (2400, 5.6, 0.1),
+}
+
+# Kolom numerik: proporsi dan insiden (%) di titik-titik grid (diinterpolasi linear)
+SLEEP_SHARE = {1: 0.12, 2: 0.25, 3: 0.6, 4: 2.5, 5: 6.8, 6: 21.0, 7: 30.5, 8: 28.0, 9: 5.0, 10: 3.1,
+               11: 0.3, 12: 0.8, 13: 0.05, 14: 0.1, 15: 0.08, 16: 0.08, 17: 0.03, 18: 0.06, 19: 0.02,
+               20: 0.04, 21: 0.01, 22: 0.01, 23: 0.01, 24: 0.02}
+SLEEP_INCIDENCE = {1: 11.0, 4: 9.0, 5: 7.5, 6: 5.6, 7: 4.3, 8: 5.4, 9: 7.2, 10: 9.0, 12: 10.5, 24: 11.0}
+HEALTH_DAYS_SHARE = {
+    'PhysicalHealthDays': {0: 60.0, 1: 3.5, 2: 5.5, 3: 3.3, 4: 1.7, 5: 3.5, 6: 0.5, 7: 2.2, 8: 0.3, 10: 3.0,
+                           12: 0.2, 14: 0.9, 15: 2.5, 20: 1.4, 21: 0.2, 25: 0.5, 28: 0.1, 30: 8.5},
+    'MentalHealthDays': {0: 60.0, 1: 3.5, 2: 5.5, 3: 3.5, 4: 2.0, 5: 4.5, 6: 0.4, 7: 2.5, 8: 0.4, 10: 3.5,
+                         12: 0.3, 14: 0.7, 15: 3.0, 20: 1.8, 21: 0.2, 25: 0.6, 28: 0.2, 30: 6.0},
+}
+HEALTH_DAYS_INCIDENCE = {
+    'PhysicalHealthDays': {0: 4.0, 5: 5.0, 14: 7.0, 29: 10.0, 30: 14.0},
+    'MentalHealthDays': {0: 5.4, 14: 5.0, 29: 6.5, 30: 7.5},
+}
+HEALTH_DAYS_AGE = {'PhysicalHealthDays': 0.5, 'MentalHealthDays': -0.6}
+HEALTH_DAYS_MALE = {'PhysicalHealthDays': 0.9, 'MentalHealthDays': 0.75}
+BMI_MEDIAN = 28.0
+BMI_LOG_SD = 0.205
+BMI_INCIDENCE = {15.0: 6.5, 18.5: 5.8, 22.0: 4.3, 25.0: 4.9, 28.0: 5.5, 32.0: 6.2, 36.0: 6.8, 42.0: 7.2, 75.0: 7.5}
+HEIGHT = {'Female': (1.625, 0.071), 'Male': (1.778, 0.079)}
+
+
+def _interpolate(points, grid):
+    x, y = zip(*sorted(points.items()))
+    return np.interp(grid, x, y)
+
+
+def _normal_cdf(values, mean, sd):
+    return np.array([0.5 * (1 + math.erf((value - mean) / (sd * math.sqrt(2)))) for value in values])
+
+
+def _normal_pmf(grid, mean, sd, width):
+    """Peluang setiap sel grid [g, g + width) untuk distribusi normal."""
+    pmf = np.diff(_normal_cdf(np.append(grid, grid[-1] + width), mean, sd))
+    return pmf / pmf.sum()
+
+
+def numeric_targets(column):
+    """Target kolom numerik dalam format CATEGORY_TARGETS atas grid synthetic.NUMERIC_GRIDS."""
+    grid = NUMERIC_GRIDS[column]
+    if column == 'SleepHours':
+        share = np.array([SLEEP_SHARE[int(value)] for value in grid])
+        return {'share': share, 'incidence': _interpolate(SLEEP_INCIDENCE, grid)}
+    if column == 'BMI':
+        # Sel BMI selebar 0.5: peluang dari distribusi normal atas log(BMI) di batas sel
+        edges = np.log(np.append(grid, grid[-1] + 0.5))
+        share = np.maximum(np.diff(_normal_cdf(edges, math.log(BMI_MEDIAN), BMI_LOG_SD)), 1e-9)
+        return {'share': share, 'incidence': _interpolate(BMI_INCIDENCE, grid)}
+    share = _interpolate(HEALTH_DAYS_SHARE[column], grid)
+    # Titik di luar tabel (hari ganjil jarang) diberi bobot kecil, bukan hasil interpolasi
+    share = np.where(np.isin(grid, list(HEALTH_DAYS_SHARE[column])), share, 0.05)
+    active = (grid > 0).astype(float)
+    return {
+        'share': share,
+        'incidence': _interpolate(HEALTH_DAYS_INCIDENCE[column], grid),
+        'age': HEALTH_DAYS_AGE[column] * active,
+        'male': np.where(active > 0, HEALTH_DAYS_MALE[column], 1.0),
+    }
+
+
+def column_targets(column):
+    if column == 'State':
+        levels = _levels(column)
+        rows, incidence, age = zip(*(STATE_TARGETS[state] for state in levels))
+        return {'share': rows, 'incidence': incidence, 'age': age}
+    if column in CATEGORY_TARGETS:
+        return CATEGORY_TARGETS[column]
+    return numeric_targets(column)
+
+
+# --- Kalibrasi ---
+def _largest_remainder(total, weights):
+    """Membagi bilangan bulat `total` sebanding `weights` (jumlah hasil tepat `total`)."""
+    weights = np.asarray(weights, dtype=np.float64)
+    if total == 0 or weights.sum() == 0:
+        return np.zeros(len(weights), dtype=np.int64)
+    exact = total * weights / weights.sum()
+    counts = np.floor(exact).astype(np.int64)
+    remainder = int(total - counts.sum())
+    if remainder:
+        counts[np.argsort(exact - counts)[::-1][:remainder]] += 1
+    return counts
+
+
+def _stratum_features(parents):
+    """Skor usia (-1..1), flag laki-laki, kode status merokok, dan flag kasus setiap strata induk."""
+    shape = [len(_levels(parent)) for parent in parents]
+    grids = np.meshgrid(*[np.arange(size) for size in shape], indexing='ij')
+    codes = {parent: grid.ravel() for parent, grid in zip(parents, grids)}
+    n_ages = len(_levels('AgeCategory'))
+    return {
+        'age': (codes['AgeCategory'] - (n_ages - 1) / 2) / ((n_ages - 1) / 2) if 'AgeCategory' in codes else 0.0,
+        'male': codes.get('Sex', 0),
+        'smoker': codes.get('SmokerStatus'),
+        'case': codes.get('HadHeartAttack', 0),
+    }
+
+
+def calibrate(column, parent_probability, parents):
+    """
+    Peluang level per strata induk (strata x level) sehingga proporsi level
+    dan rasio insiden per level mendekati target kolom `column`.
+    """
+    targets = column_targets(column)
+    share = np.asarray(targets['share'], dtype=np.float64)
+    share = share / share.sum()
+    n_levels = len(share)
+    incidence = np.array([np.nan if value is None else value / 100 for value in targets['incidence']])
+    if np.isnan(incidence).any():
+        # Insiden level sisa (mis. 'No') mengikuti rasio keseluruhan
+        known = ~np.isnan(incidence)
+        rest = (HEART_ATTACK_RATE - (share[known] * incidence[known]).sum()) / share[~known].sum()
+        incidence[~known] = rest
+    # Target insiden diskalakan agar konsisten dengan rasio keseluruhan
+    incidence *= HEART_ATTACK_RATE / (share * incidence).sum()
+
+    features = _stratum_features(parents)
+    log_weight = np.zeros((len(parent_probability), n_levels))
+    log_weight += np.outer(features['age'] * np.ones(len(parent_probability)), targets.get('age', np.zeros(n_levels)))
+    log_weight += np.outer(features['male'], np.log(targets.get('male', np.ones(n_levels))))
+    if features['smoker'] is not None and 'smoker' in targets:
+        smoker = np.log(np.asarray(targets['smoker'], dtype=np.float64))  # level x status merokok
+        log_weight += smoker[:, features['smoker']].T
+    case = np.asarray(features['case'] * np.ones(len(parent_probability)), dtype=bool)
+
+    base = np.log(share)
+    case_shift = np.zeros(n_levels)
+    has_case_parent = 'HadHeartAttack' in parents
+    for _ in range(CALIBRATION_ITERATIONS):
+        logits = log_weight + base + np.outer(case, case_shift)
+        probability = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probability /= probability.sum(axis=1, keepdims=True)
+        joint = parent_probability[:, None] * probability
+        level_share = joint.sum(axis=0)
+        base += np.log(share / level_share)
+        if has_case_parent:
+            level_incidence = joint[case].sum(axis=0) / level_share
+            case_shift += np.log(incidence / level_incidence)
+            case_shift -= case_shift[0]
+    return probability
+
+
+def build_profile(n_rows=N_ROWS):
+    """Profil hitungan (format synthetic.fit_profile) dari target di modul ini."""
+    ages = _largest_remainder(n_rows, AGE_ROWS)
+    tables = {'AgeCategory': ages[None, :]}
+
+    tables['Sex'] = np.array([_largest_remainder(n, [female, 1 - female]) for n, female in zip(ages, FEMALE_SHARE)])
+
+    # Insiden per (usia, jenis kelamin): skala usia x odds laki-laki, lalu diskalakan ke HEART_ATTACK_RATE
+    age_sex = tables['Sex'].ravel()
+    relative = np.array([[rate, rate * MALE_ODDS_RATIO] for rate in AGE_INCIDENCE]).ravel()
+    scale = HEART_ATTACK_RATE * age_sex.sum() / (age_sex * relative).sum()
+    cases = np.minimum(relative * scale, 0.5)
+    tables['HadHeartAttack'] = np.array([_largest_remainder(n, [1 - p, p]) for n, p in zip(age_sex, cases)])
+
+    # Hitungan strata (usia, jenis kelamin, kasus) untuk kolom dengan induk bawaan
+    base_strata = tables['HadHeartAttack'].ravel()
+    for column in SAMPLING_ORDER:
+        if column in tables:
+            continue
+        parents = parents_of(column)
+        if parents == ['AgeCategory', 'Sex', 'HadHeartAttack']:
+            strata = base_strata
+        elif parents == ['AgeCategory', 'HadHeartAttack']:
+            strata = base_strata.reshape(-1, 2, 2).sum(axis=1).ravel()
+        elif parents == ['Sex']:
+            strata = tables['Sex'].sum(axis=0)
+        elif parents == ['AgeCategory', 'SmokerStatus', 'HadHeartAttack']:
+            smoker = tables['SmokerStatus'].reshape(len(ages), 2, 2, -1)  # usia, jenis kelamin, kasus, status
+            strata = smoker.sum(axis=1).transpose(0, 2, 1).ravel()
+        else:
+            raise ValueError(f"Induk {parents} untuk kolom {column} belum didukung.")
+
+        if column == 'HeightInMeters':
+            grid = NUMERIC_GRIDS[column]
+            probability = np.array([_normal_pmf(grid, *HEIGHT[sex], 0.01) for sex in _levels('Sex')])
+        else:
+            probability = calibrate(column, strata / strata.sum(), parents)
+        tables[column] = np.array([_largest_remainder(n, p) for n, p in zip(strata, probability)])
+
+    return {
+        'format': PROFILE_FORMAT,
+        'n_rows': int(n_rows),
+        'source': 'build_synthetic_profile.py (target ringkasan terkalibrasi, bukan hasil fit baris asli)',
+        'columns': {
+            column: {'parents': parents_of(column), 'levels': _levels(column), 'counts': tables[column].tolist()}
+            for column in SAMPLING_ORDER
+        },
+    }
+
+
+def check(profile):
+    """Mencetak proporsi dan insiden setiap level kategori hasil profil vs target."""
+    print(f"{'kolom':<26}{'level':<44}{'proporsi':>10}{'target':>8}{'insiden %':>11}{'target':>8}")
+    for column, spec in profile['columns'].items():
+        if COLUMN_SCHEMA[column]['kind'] != 'category' or column in ('AgeCategory', 'Sex', 'HadHeartAttack'):
+            continue
+        counts = np.asarray(spec['counts']).reshape(-1, 2, len(spec['levels']))  # strata lain, kasus, level
+        total = counts.sum(axis=(0, 1))
+        rate = counts[:, 1].sum(axis=0) / total * 100
+        targets = column_targets(column)
+        share = np.asarray(targets['share'], dtype=float) / np.sum(targets['share'])
+        for position, level in enumerate(spec['levels']):
+            target = targets['incidence'][position]
+            print(
+                f"{column[:25]:<26}{str(level)[:43]:<44}{total[position] / total.sum():>10.3f}{share[position]:>8.3f}"
+                f"{rate[position]:>11.2f}{'-' if target is None else f'{target:.1f}':>8}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Membangun profil distribusi synthetic.py dari target terkalibrasi.")
+    parser.add_argument('--output', default=PROFILE_PATH, help=f"File profil keluaran (default: {PROFILE_PATH}).")
+    parser.add_argument('--rows', type=int, default=N_ROWS, help=f"Jumlah baris acuan profil (default: {N_ROWS}).")
+    parser.add_argument('--check', action='store_true', help="Hanya cetak perbandingan dengan target, tanpa menulis file.")
+    args = parser.parse_args()
+
+    profile = build_profile(args.rows)
+    check(profile)
+    if not args.check:
+        write_profile(profile, args.output)
+        print(f"\nProfil ditulis ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+from contextlib import nullcontext
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from diagnostics import timed_render
+
+# Spesifikasi grafik siap kirim untuk cache grafik (cross_filter.page_chart).
+#
+# Grafik Altair dikonversi sekali menjadi spesifikasi Vega-Lite (dict) yang
+# minimal: dataset yang di-inline hanya menyimpan kolom yang benar-benar
+# dirujuk spesifikasi (encoding, tooltip, kondisi), dan sudah diserialisasi
+# ke Arrow IPC seperti yang dilakukan st.altair_chart. Saat dirender ulang,
+# st.vega_lite_chart langsung memakai byte Arrow tersebut sehingga objek
+# Altair tidak dibangun, divalidasi, maupun diserialisasi ulang.
+#
+# Dataset bersarang (mis. fitur GeoJSON untuk lookup geoshape) tidak dapat
+# dikirim sebagai tabel Arrow; dataset seperti itu di-inline kembali sebagai
+# `values` di tempat ia dirujuk. Dataset tersebut hanya boleh dirujuk dari
+# dalam spesifikasi (mis. transform lookup), bukan sebagai data utama grafik.
+#
+# Figure Plotly disimpan apa adanya: plotly express sudah hanya menyertakan
+# kolom yang dipakai, dan template tema Streamlit di layout dibutuhkan oleh
+# frontend untuk menerapkan warna tema.
+
+
+def arrow_bytes(df):
+    """Serialisasi DataFrame ke Arrow IPC stream (format dataset Vega-Lite di Streamlit)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _strings(node):
+    """Semua string di dalam spesifikasi (nama field, ekspresi kondisi/transform)."""
+    if isinstance(node, str):
+        yield node.replace('\\', '')
+    elif isinstance(node, dict):
+        for value in node.values():
+            yield from _strings(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _strings(value)
+
+
+def _is_nested(records):
+    return any(isinstance(value, (dict, list)) for record in records[:1] for value in record.values())
+
+
+def _inline_datasets(node, nested):
+    """Mengganti rujukan {'name': ...} ke dataset `nested` dengan {'values': ...}."""
+    if isinstance(node, dict):
+        if node.get('name') in nested and set(node) <= {'name', 'format'}:
+            return dict({key: value for key, value in node.items() if key != 'name'}, values=nested[node['name']])
+        return {key: _inline_datasets(value, nested) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_datasets(value, nested) for value in node]
+    return node
+
+
+def vega_lite_spec(chart):
+    """Spesifikasi Vega-Lite minimal dari grafik Altair (dataset sebagai byte Arrow)."""
+    # Sama seperti st.altair_chart: tema default Altair (lebar/tinggi tetap)
+    # dinonaktifkan agar grafik mengikuti ukuran container
+    themes = alt.themes
+    with themes.enable('none') if themes.active == 'default' else nullcontext():
+        spec = chart.to_dict()
+
+    datasets = spec.pop('datasets', {})
+    nested = {name: records for name, records in datasets.items() if _is_nested(records)}
+    if nested:
+        spec = _inline_datasets(spec, nested)
+    referenced = list(_strings(spec))
+    minimal = {}
+    for name, records in datasets.items():
+        if name in nested:
+            continue
+        df = pd.DataFrame.from_records(records)
+        keep = [column for column in df.columns if any(column in text for text in referenced)]
+        minimal[name] = arrow_bytes(df[keep])
+    spec['datasets'] = minimal
+    return spec
+
+
+def chart_spec(chart):
+    """Bentuk grafik yang disimpan di cache: dict Vega-Lite untuk Altair, Figure untuk Plotly."""
+    if isinstance(chart, alt.TopLevelMixin):
+        return vega_lite_spec(chart)
+    return chart
+
+
+def render_chart(spec, **kwargs):
+    """Menampilkan spesifikasi dari chart_spec dengan elemen Streamlit yang sesuai."""
+    if isinstance(spec, dict):
+        return timed_render('vega_lite_chart', st.vega_lite_chart, spec, **kwargs)
+    return timed_render('plotly_chart', st.plotly_chart, spec, **kwargs)
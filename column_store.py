@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# Penyimpanan kolom ter-memory-map (read-only).
+# Dataset yang sudah bertipe skema disimpan sebagai satu file .npy per kolom:
+# kolom kategori sebagai array kode (int8/int16) + daftar level di metadata,
+# kolom numerik sebagai array int8/float32 apa adanya. Saat dibuka, setiap
+# file di-memory-map (np.load mmap_mode='r') dan DataFrame dibangun tanpa
+# menyalin data, sehingga semua proses server Streamlit di satu host berbagi
+# page cache OS yang sama alih-alih memegang salinan DF_FULL masing-masing.
+
+FORMAT_VERSION = 1
+META_FILE = 'columns.json'
+
+
+def write_column_store(df, directory, replace=False):
+    """
+    Menulis `df` sebagai column store di `directory` secara atomik: kolom
+    ditulis ke folder sementara unik di folder induk yang sama lalu di-rename.
+    Beberapa proses server boleh menulis bersamaan; jika proses lain sudah
+    menerbitkan store yang valid lebih dulu, store tersebut dipakai apa adanya
+    (kecuali `replace`, untuk mengganti store rusak). Kolom teks (object)
+    disimpan sebagai kategori.
+    """
+    if is_column_store(directory) and not replace:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(directory)), exist_ok=True)
+    tmp_directory = _unique_path(directory, 'tmp')
+    os.makedirs(tmp_directory)
+    try:
+        meta = {'format': FORMAT_VERSION, 'n_rows': len(df), 'columns': []}
+        for position, name in enumerate(df.columns):
+            series = df[name]
+            if series.dtype == object:
+                series = series.astype('category')
+
+            filename = f"{position:03d}.npy"
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                np.save(os.path.join(tmp_directory, filename), series.cat.codes.to_numpy())
+                meta['columns'].append({
+                    'name': name, 'file': filename, 'kind': 'category',
+                    'categories': series.cat.categories.tolist(), 'ordered': bool(series.cat.ordered),
+                })
+            else:
+                np.save(os.path.join(tmp_directory, filename), series.to_numpy())
+                meta['columns'].append({'name': name, 'file': filename, 'kind': 'numeric'})
+
+        with open(os.path.join(tmp_directory, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        if replace:
+            _retire(directory)
+        try:
+            os.replace(tmp_directory, directory)
+        except OSError:
+            # Proses lain menerbitkan store lebih dulu (folder tujuan tidak kosong)
+            if not is_column_store(directory):
+                raise
+    finally:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+
+
+def _unique_path(directory, suffix):
+    # Nama unik di folder induk yang sama (rename tetap atomik); izin mengikuti umask
+    return f"{directory}.{uuid.uuid4().hex}.{suffix}"
+
+
+def _retire(directory):
+    """Memindahkan store lama ke nama unik lalu menghapusnya (proses yang masih me-map file tidak terganggu)."""
+    retired = _unique_path(directory, 'old')
+    try:
+        os.replace(directory, retired)
+    except FileNotFoundError:
+        # Sudah dipindahkan proses lain
+        return
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def is_column_store(directory):
+    return os.path.exists(os.path.join(directory, META_FILE))
+
+
+def open_column_store(directory):
+    """
+    Membuka column store sebagai DataFrame yang kolom-kolomnya adalah view
+    read-only atas file ter-memory-map (tanpa salinan dan tanpa unpickle).
+    """
+    with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Format column store tidak dikenal di {directory}: {meta.get('format')}")
+
+    columns = {}
+    for column in meta['columns']:
+        values = np.load(os.path.join(directory, column['file']), mmap_mode='r')
+        if column['kind'] == 'category':
+            dtype = pd.CategoricalDtype(column['categories'], ordered=column['ordered'])
+            columns[column['name']] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            columns[column['name']] = values
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,337 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import streamlit as st
+
+from artifacts import code_version
+from charts import chart_spec
+from data_loader import (
+    available_years, dataset_version, load_bitmap_index, load_count_cube, load_page_tables, on_dataset_change,
+    select_years,
+)
+from diagnostics import phase
+from warmup import wait_for
+
+# Filter global (cross-filter) di sidebar yang berlaku untuk semua study case.
+# Hasil agregasi setiap halaman disimpan dalam LRU berbatas dengan kunci
+# (halaman, filter, versi dataset), sehingga berpindah antar kombinasi filter
+# yang baru saja dipakai cukup berupa cache hit. Sub-kubus hasil filter juga
+# disimpan; filter baru yang lebih sempit di-slice dari sub-kubus induk yang
+# sudah ada di cache, bukan dari kubus penuh. Spesifikasi grafik setiap
+# halaman disimpan dengan kunci yang sama (lihat page_chart dan charts.py).
+# Hasil tanpa filter untuk tahun terbaru diisi lebih dulu oleh pemanasan di
+# latar belakang (warmup.py); halaman menunggu tugasnya sebelum menghitung sendiri.
+# Saat file dataset diganti, entri berkunci versi lama dibuang (_discard_stale).
+
+SESSION_KEY = 'cross_filter'
+# Modul halaman yang ikut difilter (study case pages.sc*); halaman lain
+# (deskripsi dataset, model risiko) selalu memakai data tanpa filter.
+CROSS_FILTERED_PREFIX = 'pages.sc'
+YEARS_KEY = 'cross_filter_years'
+
+EMPTY_SEGMENT_MESSAGE = "Tidak ada kasus serangan jantung untuk kombinasi filter global yang dipilih."
+
+
+class CrossFilter(NamedTuple):
+    """Pilihan filter global; tuple kosong berarti tanpa filter pada dimensi tersebut."""
+    State: tuple = ()
+    Sex: tuple = ()
+    AgeCategory: tuple = ()
+    BMICategory: tuple = ()
+
+    def as_slice(self):
+        """Argumen untuk CountCube.slice (hanya dimensi yang difilter)."""
+        return {dimension: list(values) for dimension, values in self._asdict().items() if values}
+
+    def is_parent_of(self, other):
+        """True jika filter ini lebih longgar dari (mencakup seluruh) `other`."""
+        for mine, theirs in zip(self, other):
+            if not mine:
+                continue
+            if not theirs or not set(theirs) <= set(mine):
+                return False
+        return True
+
+
+NO_FILTER = CrossFilter()
+
+
+class LRUCache:
+    """Cache LRU berbatas yang aman dipakai bersama oleh banyak sesi (thread)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def discard(self, predicate):
+        """Membuang semua entri yang kuncinya memenuhi `predicate`."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+
+FILTERED_CUBES = LRUCache(maxsize=64)
+PAGE_RESULTS = LRUCache(maxsize=256)
+CHART_SPECS = LRUCache(maxsize=512)
+
+
+@on_dataset_change
+def _discard_stale(stale):
+    """Membuang hasil, sub-kubus, dan grafik yang berkunci versi dataset usang."""
+    def is_stale(version):
+        # Versi: "tahun:sidik jari+tahun:sidik jari-s<versi skema>" (data_loader.dataset_version)
+        return not stale.isdisjoint(version.rsplit('-s', 1)[0].split('+'))
+
+    FILTERED_CUBES.discard(lambda key: is_stale(key[1]))
+    PAGE_RESULTS.discard(lambda key: is_stale(key[2]))
+    CHART_SPECS.discard(lambda key: is_stale(key[-1]))
+
+
+def filtered_cube(cube, flt, version):
+    """Sub-kubus untuk filter `flt`, memakai ulang sub-kubus induk dari cache bila ada."""
+    if flt == NO_FILTER:
+        return cube
+
+    key = (flt, version)
+    result = FILTERED_CUBES.get(key)
+    if result is not None:
+        return result
+
+    parent = cube
+    for (parent_filter, parent_version), candidate in FILTERED_CUBES.items():
+        if parent_version == version and parent_filter.is_parent_of(flt) and candidate.n_cells < parent.n_cells:
+            parent = candidate
+
+    result = parent.slice(**flt.as_slice())
+    FILTERED_CUBES.put(key, result)
+    return result
+
+
+def _level_range(levels, low, high):
+    """Level dari `low` s.d. `high`; tuple kosong jika rentangnya mencakup semua level."""
+    selected = levels[levels.index(low):levels.index(high) + 1]
+    return () if len(selected) == len(levels) else tuple(selected)
+
+
+def render_year_selector():
+    """
+    Pemilih tahun data (hanya tampil jika ada lebih dari satu partisi). Hanya
+    partisi tahun terpilih yang dibaca oleh load_count_cube.
+    """
+    years = available_years()
+    selected = years[-1:]
+    if len(years) > 1:
+        selected = st.sidebar.multiselect("Tahun Data:", years, default=selected, key='filter_years') or selected
+    st.session_state[YEARS_KEY] = tuple(sorted(selected))
+    return st.session_state[YEARS_KEY]
+
+
+def render_sidebar_filters():
+    """Menampilkan filter global di sidebar dan menyimpannya di session_state."""
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("Filter Global")
+
+    years = render_year_selector()
+    cube = load_count_cube(list(years) or None)
+    if cube is None:
+        return NO_FILTER
+
+    states = st.sidebar.multiselect("Negara Bagian:", list(cube.levels('State')), key='filter_state', placeholder="Semua")
+    sexes = st.sidebar.multiselect("Jenis Kelamin:", list(cube.levels('Sex')), key='filter_sex', placeholder="Semua")
+
+    age_levels = list(cube.levels('AgeCategory'))
+    age_low, age_high = st.sidebar.select_slider(
+        "Rentang Usia:", options=age_levels, value=(age_levels[0], age_levels[-1]), key='filter_age'
+    )
+    bmi_levels = list(cube.levels('BMICategory'))
+    bmi_low, bmi_high = st.sidebar.select_slider(
+        "Rentang BMI:", options=bmi_levels, value=(bmi_levels[0], bmi_levels[-1]), key='filter_bmi'
+    )
+
+    flt = CrossFilter(
+        State=tuple(sorted(states)),
+        Sex=tuple(sorted(sexes)),
+        AgeCategory=_level_range(age_levels, age_low, age_high),
+        BMICategory=_level_range(bmi_levels, bmi_low, bmi_high),
+    )
+    st.session_state[SESSION_KEY] = flt
+
+    segment = filtered_cube(cube, flt, dataset_version(list(years) or None))
+    st.sidebar.caption(f"Responden dalam filter: {segment.total_population:,} dari {cube.total_population:,}")
+    return flt
+
+
+def current_filter():
+    return st.session_state.get(SESSION_KEY, NO_FILTER)
+
+
+def is_cross_filtered(page):
+    return page.startswith(CROSS_FILTERED_PREFIX)
+
+
+def page_filter(page):
+    """Filter yang berlaku untuk halaman `page`: filter sesi untuk study case, selain itu NO_FILTER."""
+    return current_filter() if is_cross_filtered(page) else NO_FILTER
+
+
+def current_years():
+    """Tahun data terpilih; None berarti tahun terbaru."""
+    years = st.session_state.get(YEARS_KEY)
+    return list(years) if years else None
+
+
+def _artifact_table(page, compute, years):
+    """Tabel tanpa filter dari build_artifacts.py jika versi kodenya sama dengan `compute`."""
+    tables = load_page_tables(years)
+    entry = tables.get(page) if tables else None
+    if entry is not None and entry['code'] == code_version(compute):
+        return entry['table']
+    return None
+
+
+def warm_page_result(page, compute, years=None):
+    """
+    Mengisi PAGE_RESULTS dengan hasil tanpa filter halaman `page` di luar sesi
+    (dipanggil thread pemanasan, lihat warmup.py).
+    """
+    cube = load_count_cube(years)
+    if cube is None:
+        return None
+    version = dataset_version(years)
+    key = (page, NO_FILTER, version)
+    result = PAGE_RESULTS.get(key)
+    if result is None:
+        result = _artifact_table(page, compute, years)
+        if result is None:
+            result = compute(filtered_cube(cube, NO_FILTER, version))
+        PAGE_RESULTS.put(key, result)
+    return result
+
+
+def warm_page_index_result(page, compute, years=None):
+    """Seperti warm_page_result untuk halaman yang memakai page_index_result."""
+    indexes = [load_bitmap_index(year) for year in select_years(years)]
+    if not indexes or any(index is None for index in indexes):
+        return None
+    key = (page, NO_FILTER, dataset_version(years))
+    result = PAGE_RESULTS.get(key)
+    if result is None:
+        result = compute(indexes, NO_FILTER.as_slice())
+        PAGE_RESULTS.put(key, result)
+    return result
+
+
+def wait_for_warmup(key):
+    """
+    Menunggu tugas pemanasan halaman key[0] jika `key` (halaman, filter, versi)
+    adalah kunci yang diisi thread pemanasan: tanpa filter, tahun terbaru
+    (lihat warmup.py). True jika sudah menunggu.
+    """
+    page = key[0]
+    if key != (page, NO_FILTER, dataset_version()):
+        return False
+    wait_for(page)
+    return True
+
+
+def page_result(page, compute):
+    """
+    Hasil agregasi halaman `page` untuk filter aktif. `compute(cube)` hanya
+    dipanggil jika (page, filter, versi dataset) belum ada di LRU.
+    """
+    years = current_years()
+    with phase('data_load', 'load_count_cube'):
+        cube = load_count_cube(years)
+    if cube is None:
+        return None
+
+    version = dataset_version(years)
+    flt = page_filter(page)
+    key = (page, flt, version)
+    with phase('aggregation', page) as event:
+        result = PAGE_RESULTS.get(key)
+        event['cache'] = 'hit'
+        if result is None and wait_for_warmup(key):
+            # Tugas pemanasan halaman ini mungkin masih berjalan
+            result = PAGE_RESULTS.get(key)
+            event['cache'] = 'warmup'
+        if result is None and flt == NO_FILTER:
+            # Tanpa filter: pakai tabel yang sudah dihitung oleh build_artifacts.py bila ada
+            result = _artifact_table(page, compute, years)
+            event['cache'] = 'artifact'
+        if result is None:
+            result = compute(filtered_cube(cube, flt, version))
+            PAGE_RESULTS.put(key, result)
+            event['cache'] = 'miss'
+    return result
+
+
+def page_index_result(page, compute):
+    """
+    Seperti page_result untuk halaman yang bekerja atas indeks bitmap (semua
+    kolom kategori, bukan hanya dimensi kubus): `compute(indexes, filters)`
+    menerima daftar BitmapIndex tahun terpilih dan filter global sebagai
+    keyword BitmapIndex.mask. Hasilnya disimpan di LRU yang sama.
+    """
+    years = current_years()
+    with phase('data_load', 'load_bitmap_index'):
+        indexes = [load_bitmap_index(year) for year in select_years(years)] or [load_bitmap_index()]
+    if any(index is None for index in indexes):
+        return None
+
+    flt = page_filter(page)
+    key = (page, flt, dataset_version(years))
+    with phase('aggregation', page) as event:
+        result = PAGE_RESULTS.get(key)
+        event['cache'] = 'hit'
+        if result is None and wait_for_warmup(key):
+            result = PAGE_RESULTS.get(key)
+            event['cache'] = 'warmup'
+        if result is None:
+            result = compute(indexes, flt.as_slice())
+            PAGE_RESULTS.put(key, result)
+            event['cache'] = 'miss'
+    return result
+
+
+def page_chart(page, builder, *tables, **options):
+    """
+    Spesifikasi grafik `builder(*tables, **options)` yang siap dirender
+    (charts.chart_spec). `tables` harus hasil page_result halaman yang sama;
+    grafik dibangun sekali per (halaman, grafik, opsi, page_filter, versi dataset)
+    lalu dipakai ulang semua sesi. `options` berisi pilihan tampilan bernilai
+    hashable (mis. ukuran yang diwarnai peta).
+    """
+    key = (page, builder.__name__, tuple(sorted(options.items())), page_filter(page), dataset_version(current_years()))
+    with phase('chart_spec', builder.__name__) as event:
+        spec = CHART_SPECS.get(key)
+        event['cache'] = 'hit'
+        if spec is None:
+            spec = chart_spec(builder(*tables, **options))
+            CHART_SPECS.put(key, spec)
+            event['cache'] = 'miss'
+    return spec
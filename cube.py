@@ -0,0 +1,236 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from incidence import OUTCOME, POSITIVE, encode_key, outcome_flags, decode_levels, incidence_frame
+
+# Kubus hitungan (count cube) teragregasi.
+# Setiap study case hanyalah hitungan baris dan hitungan baris
+# HadHeartAttack == 'Yes' atas kombinasi beberapa dimensi. Kubus ini
+# menyimpan kedua hitungan tersebut untuk setiap kombinasi dimensi yang
+# muncul di data (kubus jarang / sparse), sehingga halaman cukup melakukan
+# roll-up dan slice atas puluhan ribu sel, bukan memindai DF_FULL.
+
+CUBE_DIMENSIONS = [
+    'AgeCategory', 'Sex', 'SleepHours', 'CovidPos', 'AlcoholDrinkers', 'SmokerStatus',
+    'ECigaretteUsage', 'State', 'PhysicalActivities', 'HadDiabetes', 'HadStroke',
+    # Dimensi filter global (lihat cross_filter.py)
+    'BMICategory',
+    # Dimensi turunan (schema.DERIVED_DIMENSIONS); tidak menambah jumlah sel
+    # karena nilainya ditentukan oleh dimensi sumbernya
+    'AgeGroup', 'SmokerStatusSimple',
+]
+
+# Roll-up yang dirender oleh sc1-sc10; dimaterialisasi saat kubus dibangun
+# sehingga halaman hanya membaca hasil yang sudah jadi.
+STUDY_CASE_ROLLUPS = [
+    ('AgeCategory',), ('AgeGroup', 'Sex'), ('SleepHours',), ('CovidPos',),
+    ('AlcoholDrinkers', 'SmokerStatusSimple'), ('SmokerStatus', 'ECigaretteUsage'), ('State', 'AgeCategory'),
+    ('PhysicalActivities',), ('HadDiabetes',), ('HadStroke',),
+]
+
+
+class CountCube:
+    """
+    Kubus hitungan jarang: satu baris per kombinasi dimensi yang teramati,
+    berisi jumlah populasi dan jumlah kasus.
+
+    - dimensions: dict nama dimensi -> (levels, dtype kategori atau None)
+    - codes: array (n_sel x n_dimensi) berisi kode level tiap sel
+    - population, cases: array hitungan per sel
+    """
+
+    def __init__(self, dimensions, codes, population, cases):
+        self.dimensions = dict(dimensions)
+        self.codes = codes
+        self.population = population
+        self.cases = cases
+        self._rollups = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS, outcome=OUTCOME, positive=POSITIVE):
+        """Membangun kubus dari DataFrame baris dalam satu lintasan."""
+        encoded = [encode_key(df[name]) for name in dimensions]
+        shape = tuple(max(len(levels), 1) for _, levels, _ in encoded)
+
+        # Indeks sel gabungan (mixed radix) + flag kasus; baris dengan nilai
+        # kosong pada salah satu dimensi diabaikan seperti groupby
+        key = np.zeros(len(df), dtype=np.int64)
+        valid = np.ones(len(df), dtype=bool)
+        for (codes, _, _), size in zip(encoded, shape):
+            key *= size
+            key += codes
+            valid &= codes >= 0
+        key *= 2
+        key += outcome_flags(df, outcome, positive)
+
+        unique_keys, counts = np.unique(key[valid], return_counts=True)
+        meta = {name: (levels, dtype) for name, (_, levels, dtype) in zip(dimensions, encoded)}
+        return cls.from_key_counts(meta, shape, unique_keys, counts)
+
+    @classmethod
+    def from_key_counts(cls, dimensions, shape, keys, counts):
+        """
+        Membangun kubus dari hitungan per kunci unik (indeks sel mixed radix
+        atas `shape` dikali 2 ditambah flag kasus), mis. hasil penggabungan
+        hitungan parsial beberapa partisi baris (lihat parallel.py).
+        """
+        is_case = (keys & 1).astype(bool)
+        cells, inverse = np.unique(keys >> 1, return_inverse=True)
+
+        population = np.bincount(inverse, weights=counts, minlength=len(cells)).astype(np.int32)
+        cases = np.bincount(inverse[is_case], weights=counts[is_case], minlength=len(cells)).astype(np.int32)
+
+        # Kode level disimpan dengan tipe integer terkecil yang cukup (umumnya int8)
+        code_dtype = np.int8 if max(shape) <= np.iinfo(np.int8).max else np.int16
+        codes = np.zeros((len(cells), len(shape)), dtype=code_dtype)
+        if len(cells):
+            codes[:] = np.column_stack(np.unravel_index(cells, shape))
+        return cls(dimensions, codes, population, cases)
+
+    @classmethod
+    def merge(cls, cubes):
+        """
+        Menggabungkan beberapa kubus dengan dimensi yang sama (mis. hasil per
+        chunk pada ingest bertahap) menjadi satu kubus. Level setiap dimensi
+        disatukan terlebih dahulu sehingga chunk dengan level berbeda (mis.
+        SleepHours yang hanya sebagian muncul) tetap dapat digabung.
+        """
+        cubes = list(cubes)
+        names = list(cubes[0].dimensions)
+
+        dimensions = {}
+        for name in names:
+            dimensions[name] = _union_levels([cube.dimensions[name] for cube in cubes])
+        shape = tuple(max(len(dimensions[name][0]), 1) for name in names)
+
+        keys = []
+        for cube in cubes:
+            key = np.zeros(cube.n_cells, dtype=np.int64)
+            for position, (name, size) in enumerate(zip(names, shape)):
+                # Kode lama -> kode pada level gabungan
+                lookup = dimensions[name][0].get_indexer(cube.dimensions[name][0])
+                key *= size
+                key += lookup[cube.codes[:, position]] if len(lookup) else 0
+            keys.append(key)
+
+        cells, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        weights_population = np.concatenate([cube.population for cube in cubes])
+        weights_cases = np.concatenate([cube.cases for cube in cubes])
+        population = np.bincount(inverse, weights=weights_population, minlength=len(cells)).astype(np.int32)
+        cases = np.bincount(inverse, weights=weights_cases, minlength=len(cells)).astype(np.int32)
+
+        code_dtype = np.int8 if max(shape) <= np.iinfo(np.int8).max else np.int16
+        codes = np.zeros((len(cells), len(shape)), dtype=code_dtype)
+        if len(cells):
+            codes[:] = np.column_stack(np.unravel_index(cells, shape))
+        return cls(dimensions, codes, population, cases)
+
+    # --- Informasi umum ---
+    @property
+    def n_cells(self):
+        return len(self.population)
+
+    @property
+    def total_population(self):
+        return int(self.population.sum())
+
+    @property
+    def total_cases(self):
+        return int(self.cases.sum())
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.population.nbytes + self.cases.nbytes
+
+    def levels(self, dimension):
+        return self.dimensions[dimension][0]
+
+    # --- Operasi kubus ---
+    def rollup(self, by):
+        """
+        Roll-up ke dimensi `by`. Mengembalikan (kode level per dimensi,
+        populasi, kasus) untuk semua kombinasi level (termasuk yang kosong).
+        Hasil disimpan (memoized) per kombinasi dimensi.
+        """
+        by = tuple(by)
+        cached = self._rollups.get(by)
+        if cached is not None:
+            return cached
+
+        positions = [list(self.dimensions).index(name) for name in by]
+        shape = tuple(max(len(self.dimensions[name][0]), 1) for name in by)
+        n_cells = int(np.prod(shape, dtype=np.int64))
+
+        cell = np.zeros(self.n_cells, dtype=np.int64)
+        for position, size in zip(positions, shape):
+            cell *= size
+            cell += self.codes[:, position]
+
+        population = np.bincount(cell, weights=self.population, minlength=n_cells).astype(np.int64)
+        cases = np.bincount(cell, weights=self.cases, minlength=n_cells).astype(np.int64)
+        level_codes = np.unravel_index(np.arange(n_cells), shape)
+
+        result = (level_codes, population, cases)
+        with self._lock:
+            self._rollups[by] = result
+        return result
+
+    def materialize(self, rollups=STUDY_CASE_ROLLUPS):
+        """Menghitung di muka roll-up yang sering dipakai (lihat STUDY_CASE_ROLLUPS)."""
+        for by in rollups:
+            self.rollup(by)
+        return self
+
+    def incidence(self, by, observed=True):
+        """
+        Tabel insiden hasil roll-up dalam format incidence.incidence_frame
+        (kolom `by`, Total_Population, Case_Count, Incidence_Ratio (%),
+        Case_Share (%)).
+        """
+        if isinstance(by, str):
+            by = [by]
+        level_codes, population, cases = self.rollup(by)
+        cells = np.flatnonzero(population) if observed else np.arange(len(population))
+
+        columns = {}
+        for name, codes in zip(by, level_codes):
+            levels, dtype = self.dimensions[name]
+            columns[name] = decode_levels(codes[cells], levels, dtype)
+        return incidence_frame(columns, population[cells], cases[cells])
+
+    def slice(self, **filters):
+        """
+        Membuat sub-kubus yang hanya berisi sel dengan level terpilih, mis.
+        cube.slice(Sex=['Female'], State=['Ohio', 'Texas']).
+        """
+        mask = np.ones(self.n_cells, dtype=bool)
+        names = list(self.dimensions)
+        for name, values in filters.items():
+            if values is None:
+                continue
+            if np.isscalar(values):
+                values = [values]
+            levels = self.dimensions[name][0]
+            wanted = [levels.get_loc(value) for value in values if value in levels]
+            mask &= np.isin(self.codes[:, names.index(name)], wanted)
+        return CountCube(self.dimensions, self.codes[mask], self.population[mask], self.cases[mask])
+
+
+def _union_levels(metas):
+    """Menyatukan (levels, dtype) satu dimensi dari beberapa kubus."""
+    levels, dtype = metas[0]
+    if dtype is not None:
+        # Kategori: urutan kubus pertama dipertahankan, level baru ditambahkan di akhir
+        merged = list(levels)
+        for other, _ in metas[1:]:
+            merged += [level for level in other if level not in merged]
+        dtype = pd.CategoricalDtype(merged, ordered=dtype.ordered)
+        return dtype.categories, dtype
+
+    # Kolom non-kategori (hasil factorize terurut): gabungan terurut
+    for other, _ in metas[1:]:
+        levels = levels.union(other)
+    return levels, None
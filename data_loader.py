@@ -1,30 +1,740 @@
 import streamlit as st
 import pandas as pd
+import hashlib
+import json
+import glob
+import logging
 import os
+import re
+import threading
+import time
+import uuid
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import artifacts
+import risk_model
+from bitmap_index import BitmapIndex
+from column_store import is_column_store, open_column_store, write_column_store
+from cube import CUBE_DIMENSIONS, CountCube
+from incidence import OUTCOME
+from parallel import build_count_cube
+from schema import COLUMN_SCHEMA, SCHEMA_VERSION, add_derived_dimensions, apply_schema, bmi_category, memory_report, memory_usage_mb, source_columns
 
 # Tentukan path file CSV secara relatif dari root folder
 CSV_PATH = 'Data/heart_2022_no_nans.csv'
 
-@st.cache_data
+# Dataset multi-tahun terpartisi: Data/year=2020/*.csv, Data/year=2022/*.csv, dst.
+# (satu file CSV per partisi, kolom mengikuti skema 2022). Jika tidak ada folder
+# partisi, CSV_PATH dipakai sebagai satu-satunya partisi (tahun DEFAULT_YEAR).
+DATA_DIR = 'Data'
+PARTITION_PATTERN = re.compile(r'^year=(\d{4})$')
+DEFAULT_YEAR = 2022
+
+# Folder artefak hasil build offline (build_artifacts.py). Jika artefak untuk
+# versi dataset yang sama tersedia, kubus/indeks/tabel dimuat dari sini; jika
+# CSV mentah tidak ada sama sekali, aplikasi berjalan sepenuhnya dari artefak.
+ARTIFACT_DIR = 'artifacts'
+
+# Folder untuk snapshot kolumnar (Parquet) hasil konversi CSV.
+# Snapshot dibuat sekali saat CSV pertama kali dimuat, lalu dibaca ulang
+# pada start berikutnya sehingga parsing teks CSV tidak diulang.
+CACHE_DIR = 'Data/.cache'
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'manifest.json')
+
+# Mode ingest bertahap (chunked) untuk dataset yang lebih besar dari RAM
+# (mis. ekstrak BRFSS multi-tahun). CSV di atas batas ini tidak pernah dimuat
+# utuh: file dibaca per CHUNK_ROWS baris dan setiap chunk langsung dilipat ke
+# kubus hitungan / indeks bitmap, sehingga puncak memori tetap konstan.
+STREAMING_THRESHOLD_MB = 512
+CHUNK_ROWS = 65536  # kelipatan 8 agar bitset per chunk dapat disambung
+
+# Opsi column store ter-memory-map (column_store.py) untuk host yang menjalankan
+# beberapa proses server Streamlit: dataset bertipe skema dibuka sebagai view
+# read-only atas file .npy di CACHE_DIR sehingga semua proses berbagi page
+# cache OS, tanpa salinan per proses dan tanpa pickle dari st.cache_data.
+# Aktifkan dengan environment variable HEART_COLUMN_STORE=1.
+USE_COLUMN_STORE = os.environ.get('HEART_COLUMN_STORE', '0') == '1'
+
+# Versi dataset yang disematkan per sesi (lihat pin_dataset_versions) dan
+# versi terakhir yang dilihat proses ini untuk mendeteksi penggantian file.
+VERSION_KEY = 'dataset_versions'
+_latest_versions = None
+_versions_lock = threading.Lock()
+_CHANGE_CALLBACKS = []
+
+# Pemeriksaan sidik jari dilakukan sekali per proses: current_versions()
+# menyimpan hasilnya selama VERSION_CHECK_S detik dan semua sesi membaca hasil
+# bersama itu. Hash isi file dan penulisan manifest diserialkan dengan kunci.
+VERSION_CHECK_S = 5.0
+_checked_versions = None  # (waktu monotonic, {tahun: sidik jari})
+_check_lock = threading.Lock()
+_fingerprint_lock = threading.Lock()
+
+
+class StaleDatasetError(Exception):
+    """File dataset berganti saat kubus/indeks untuk versi yang disematkan sedang dibangun."""
+
+logger = logging.getLogger(__name__)
+
+
+def _file_sha256(path, block_size=1 << 20):
+    """Menghitung hash SHA-256 isi file secara bertahap (per blok 1 MB)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, write):
+    """
+    Menulis file `path` secara atomik: `write(tmp_path)` menulis ke file
+    sementara unik di folder yang sama, lalu file di-rename. Beberapa proses
+    server boleh menulis file yang sama bersamaan tanpa saling menimpa file
+    sementaranya; yang terakhir di-rename yang menang.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Nama unik (bukan mkstemp) agar izin file mengikuti umask seperti file cache lain
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_manifest(manifest):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    _write_atomic(MANIFEST_PATH, write)
+
+
+def dataset_fingerprint(path=CSV_PATH):
+    """
+    Sidik jari dataset berdasarkan ukuran, mtime, dan hash isi file.
+
+    Hash isi hanya dihitung ulang jika ukuran, mtime, ctime, atau inode berubah
+    (mis. file diganti, termasuk lewat rename atau salinan yang mempertahankan
+    mtime); selain itu hash diambil dari manifest di CACHE_DIR. Kunci yang
+    dikembalikan hanya bergantung pada ukuran dan isi file, sehingga `touch`
+    tidak membatalkan cache.
+    """
+    with _fingerprint_lock:
+        stat = os.stat(path)
+        manifest = _read_manifest()
+        key = os.path.abspath(path)
+        entry = manifest.get(key)
+
+        identity = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'ctime_ns': stat.st_ctime_ns, 'inode': stat.st_ino}
+        if entry and all(entry.get(field) == value for field, value in identity.items()):
+            sha256 = entry['sha256']
+        else:
+            sha256 = _file_sha256(path)
+            manifest[key] = dict(identity, sha256=sha256)
+            try:
+                _write_manifest(manifest)
+            except OSError:
+                # Folder cache tidak dapat ditulis (mis. filesystem read-only): lanjut tanpa manifest
+                pass
+
+    return f"{stat.st_size}-{sha256[:16]}"
+
+
+def list_partitions(data_dir=DATA_DIR):
+    """Partisi dataset yang tersedia sebagai dict {tahun: path CSV}, terurut menurut tahun."""
+    partitions = {}
+    if os.path.isdir(data_dir):
+        for entry in sorted(os.listdir(data_dir)):
+            match = PARTITION_PATTERN.match(entry)
+            if not match:
+                continue
+            files = sorted(glob.glob(os.path.join(data_dir, entry, '*.csv')))
+            if len(files) > 1:
+                logger.warning("Partisi %s berisi lebih dari satu CSV; hanya %s yang dipakai", entry, files[0])
+            if files:
+                partitions[int(match.group(1))] = files[0]
+    if not partitions and os.path.exists(CSV_PATH):
+        partitions[DEFAULT_YEAR] = CSV_PATH
+    return partitions
+
+
+def artifact_partitions(root=ARTIFACT_DIR):
+    """Partisi hasil build offline yang cocok dengan versi skema saat ini: {tahun: entri manifest}."""
+    return {year: entry for year, entry in artifacts.read_manifest(root).items() if entry.get('schema') == SCHEMA_VERSION}
+
+
+def available_years():
+    """Tahun yang tersedia, baik dari CSV mentah maupun dari artefak build."""
+    return sorted(set(list_partitions()) | set(artifact_partitions()))
+
+
+def select_years(years=None):
+    """
+    Pemangkasan partisi: hanya tahun `years` yang tersedia yang dikembalikan
+    (default: tahun terbaru), sehingga partisi lain tidak pernah dibaca.
+    """
+    available = available_years()
+    if years is None:
+        years = available[-1:]
+    return [year for year in sorted(years) if year in available]
+
+
+def _partition_version(year):
+    path = list_partitions().get(year)
+    if path is not None:
+        return dataset_fingerprint(path)
+    return artifact_partitions()[year]['fingerprint']
+
+
+def _pinned_versions():
+    """Versi partisi yang disematkan untuk sesi ini (None di luar sesi, mis. thread pemanasan)."""
+    if get_script_run_ctx() is None:
+        return None
+    return st.session_state.get(VERSION_KEY)
+
+
+def partition_version(year):
+    """
+    Sidik jari partisi: dari CSV jika ada, jika tidak dari manifest artefak.
+    Di dalam sesi, versi yang disematkan pin_dataset_versions dipakai sehingga
+    semua pemuatan dalam satu rerun membaca versi dataset yang sama.
+    """
+    pinned = _pinned_versions()
+    if pinned is not None and year in pinned:
+        return pinned[year]
+    return _partition_version(year)
+
+
+def current_versions(max_age=None):
+    """
+    Sidik jari terbaru setiap partisi yang tersedia, {tahun: sidik jari}.
+
+    Hasil dibagi semua sesi proses ini dan baru diperiksa ulang jika lebih tua
+    dari `max_age` detik (default VERSION_CHECK_S), sehingga banyak sesi yang
+    terbuka tidak masing-masing memeriksa file dataset.
+    """
+    global _checked_versions
+    max_age = VERSION_CHECK_S if max_age is None else max_age
+    with _check_lock:
+        if _checked_versions is None or time.monotonic() - _checked_versions[0] >= max_age:
+            _checked_versions = (time.monotonic(), {year: _partition_version(year) for year in available_years()})
+        return dict(_checked_versions[1])
+
+
+def _check_version(path, version):
+    """Memastikan file `path` masih versi `version` setelah dibaca, agar campuran versi tidak di-cache."""
+    if dataset_fingerprint(path) != version:
+        raise StaleDatasetError(f"{path} berganti saat dibaca untuk versi {version}")
+
+
+def _rerun_on_stale(error):
+    """Membaca ulang versi dataset lalu merender ulang sesi; di luar sesi hanya dicatat."""
+    logger.warning("%s; dimuat ulang dengan versi terbaru", error)
+    current_versions(max_age=0)
+    if get_script_run_ctx() is not None:
+        st.rerun()
+
+
+def on_dataset_change(callback):
+    """Mendaftarkan `callback(stale)` yang dipanggil sekali saat dataset berganti (lihat pin_dataset_versions)."""
+    _CHANGE_CALLBACKS.append(callback)
+    return callback
+
+
+def pin_dataset_versions():
+    """
+    Dipanggil sekali di awal setiap rerun penuh (app_main): membaca sidik jari
+    terbaru dan menyematkannya ke sesi. Jika sebuah file dataset diganti, sesi
+    berpindah ke versi baru sekaligus pada rerun berikutnya (kubus, indeks,
+    tabel halaman, dan grafik semuanya berkunci versi), tanpa restart server
+    dan tanpa campuran versi lama/baru dalam satu rerun. Callback
+    on_dataset_change menerima token "tahun:sidik jari" yang sudah usang agar
+    cache berkunci versi lama dapat dibuang. Ganti file secara atomik (salin
+    ke file sementara di folder yang sama lalu rename) agar file yang belum
+    selesai disalin tidak pernah terbaca sebagai versi tersendiri.
+    """
+    global _latest_versions
+    versions = current_versions()
+    with _versions_lock:
+        previous, _latest_versions = _latest_versions, versions
+    if previous is not None and previous != versions:
+        stale = {f"{year}:{version}" for year, version in previous.items() if versions.get(year) != version}
+        logger.info("Dataset berganti (%s); cache versi lama dibuang", ", ".join(sorted(stale)))
+        for callback in _CHANGE_CALLBACKS:
+            callback(stale)
+    st.session_state[VERSION_KEY] = versions
+    return versions
+
+
+def dataset_changed():
+    """True jika sidik jari dataset berbeda dari versi yang disematkan ke sesi ini."""
+    pinned = _pinned_versions()
+    return pinned is not None and pinned != current_versions()
+
+
+def _artifact_path(year, version):
+    """Folder artefak partisi `year` jika dibangun dari versi dataset yang sama."""
+    entry = artifact_partitions().get(year)
+    if entry and entry.get('fingerprint') == version:
+        return os.path.join(ARTIFACT_DIR, entry['dir'])
+    return None
+
+
+def dataset_version(years=None):
+    """Versi dataset untuk tahun terpilih (sidik jari tiap partisi + versi skema), dipakai sebagai kunci cache hasil."""
+    parts = [f"{year}:{partition_version(year)}" for year in select_years(years)]
+    return f"{'+'.join(parts)}-s{SCHEMA_VERSION}"
+
+
+def _snapshot_path(path, fingerprint):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}-{fingerprint}-s{SCHEMA_VERSION}.parquet")
+
+
+def _column_store_path(path, fingerprint):
+    return os.path.splitext(_snapshot_path(path, fingerprint))[0] + '.columns'
+
+
+def _memory_report_path(path, fingerprint):
+    return os.path.splitext(_snapshot_path(path, fingerprint))[0] + '.memory.json'
+
+
+def _write_memory_report(report, report_path):
+    """Menyimpan laporan memori skema di samping snapshot (snapshot yang dipakai ulang tidak membaca CSV lagi)."""
+    _write_atomic(report_path, lambda tmp_path: report.to_json(tmp_path, orient='records', force_ascii=False))
+
+
+def _write_snapshot(df, snapshot_path):
+    """Menulis snapshot Parquet secara atomik (tulis ke file sementara lalu rename)."""
+    _write_atomic(snapshot_path, lambda tmp_path: df.to_parquet(tmp_path, engine='pyarrow', index=False))
+
+
+def _prepare_frame(df_raw):
+    """Menerapkan skema lalu menambahkan dimensi turunan pada DataFrame mentah (utuh atau satu chunk)."""
+    df = apply_schema(df_raw)
+
+    # Dimensi turunan: pita BMI untuk filter global dan registri schema.DERIVED_DIMENSIONS
+    if 'BMI' in df.columns:
+        df['BMICategory'] = bmi_category(df['BMI'])
+    add_derived_dimensions(df)
+    return df
+
+
+def use_streaming(path=CSV_PATH):
+    """True jika dataset terlalu besar untuk dimuat utuh (lihat STREAMING_THRESHOLD_MB)."""
+    return os.path.getsize(path) > STREAMING_THRESHOLD_MB * 1024 ** 2
+
+
+def iter_dataset_chunks(path=CSV_PATH, columns=None, chunk_rows=CHUNK_ROWS):
+    """
+    Membaca CSV per `chunk_rows` baris dan menghasilkan chunk yang sudah bertipe
+    skema. Jika `columns` diberikan, hanya kolom tersebut yang di-parse.
+    """
+    usecols = None if columns is None else (lambda column: column in columns)
+    for df_raw in pd.read_csv(path, chunksize=chunk_rows, usecols=usecols):
+        yield _prepare_frame(df_raw)
+
+
+def build_count_cube_chunked(path=CSV_PATH, chunk_rows=CHUNK_ROWS):
+    """
+    Membangun kubus hitungan dengan ingest bertahap: setiap chunk diagregasi
+    menjadi kubus kecil lalu digabung ke kubus akumulasi. Memori sebanding
+    dengan jumlah sel kubus, bukan jumlah baris.
+    """
+    columns = source_columns(CUBE_DIMENSIONS) + [OUTCOME]
+    cube = None
+    for chunk in iter_dataset_chunks(path, columns, chunk_rows):
+        part = CountCube.from_frame(chunk)
+        cube = part if cube is None else CountCube.merge([cube, part])
+    if cube is None:
+        raise ValueError(f"Dataset {path} tidak berisi baris data.")
+    return cube
+
+
+def build_bitmap_index_chunked(path=CSV_PATH, chunk_rows=CHUNK_ROWS):
+    """Membangun indeks bitmap atas kolom kategori skema (dan dimensi turunannya) secara bertahap."""
+    columns = [name for name, spec in COLUMN_SCHEMA.items() if spec['kind'] == 'category'] + ['BMI']
+    return BitmapIndex.from_chunks(iter_dataset_chunks(path, columns, chunk_rows))
+
+
+def _read_dataset(path=CSV_PATH):
+    """
+    Membaca dataset bertipe skema. Dengan USE_COLUMN_STORE, hasilnya adalah
+    view ter-memory-map atas column store (dibangun sekali dari snapshot/CSV);
+    selain itu DataFrame biasa dari snapshot Parquet atau CSV.
+    """
+    if not USE_COLUMN_STORE:
+        return _read_snapshot(path)
+
+    store_path = _column_store_path(path, dataset_fingerprint(path))
+    broken = False
+    if is_column_store(store_path):
+        try:
+            return open_column_store(store_path)
+        except Exception:
+            # Column store rusak/format lama: bangun ulang di bawah
+            logger.warning("Column store %s tidak dapat dibuka; dibangun ulang", store_path, exc_info=True)
+            broken = True
+
+    df = _read_snapshot(path)
+    try:
+        # Jika proses lain menerbitkan store lebih dulu, store itu yang dibuka
+        write_column_store(df, store_path, replace=broken)
+        return open_column_store(store_path)
+    except Exception:
+        # Gagal menulis column store (mis. disk read-only): pakai salinan privat
+        logger.warning(
+            "Column store %s tidak dapat ditulis; proses ini memakai salinan dataset privat (tanpa berbagi memori)",
+            store_path, exc_info=True
+        )
+        return df
+
+
+def _read_snapshot(path=CSV_PATH):
+    """
+    Membaca dataset dari snapshot Parquet jika tersedia dan masih sesuai dengan
+    sidik jari CSV; jika tidak, parsing CSV, terapkan skema (schema.py), lalu
+    buat snapshot baru. Snapshot menyimpan tipe hasil skema (kategori, int8,
+    float32) sehingga tidak perlu dikonversi ulang.
+    """
+    snapshot_path = _snapshot_path(path, dataset_fingerprint(path))
+
+    if os.path.exists(snapshot_path):
+        try:
+            return pd.read_parquet(snapshot_path, engine='pyarrow')
+        except Exception:
+            # Snapshot rusak/tidak terbaca: abaikan dan bangun ulang dari CSV
+            pass
+
+    df_raw = pd.read_csv(path)
+    df = _prepare_frame(df_raw)
+    logger.info(
+        "Skema diterapkan pada %s: %.1f MB -> %.1f MB",
+        path, memory_usage_mb(df_raw), memory_usage_mb(df)
+    )
+    try:
+        _write_memory_report(memory_report(df_raw, df), _memory_report_path(path, dataset_fingerprint(path)))
+    except Exception:
+        pass
+    del df_raw
+
+    try:
+        _write_snapshot(df, snapshot_path)
+    except Exception:
+        # Gagal menulis snapshot tidak boleh menggagalkan pemuatan data
+        pass
+    return df
+
+
+def _missing_dataset_error(years=None):
+    wanted = "terbaru" if years is None else ", ".join(str(year) for year in years)
+    st.error(
+        f"Error: File CSV TIDAK DITEMUKAN untuk tahun {wanted} "
+        f"(dicari di {CSV_PATH}, {DATA_DIR}/year=YYYY/ dan artefak di {ARTIFACT_DIR}/). Harap periksa path Anda."
+    )
+
+
 def load_full_dataset():
     """
-    Memuat dataset lengkap hanya sekali dan menyimpannya di cache Streamlit.
+    Memuat dataset lengkap (partisi tahun terbaru) sekali per versi dataset dan menyimpannya di cache Streamlit.
+
+    Dengan column store, DataFrame ter-memory-map disimpan sebagai resource
+    (st.cache_resource) agar tidak di-pickle/unpickle seperti st.cache_data.
     """
-    st.info(f"Memuat dataset besar dari: {CSV_PATH}.")
-    
+    version = dataset_version() if available_years() else None
+    if USE_COLUMN_STORE:
+        return _load_full_dataset_shared(version)
+    return _load_full_dataset_cached(version)
+
+
+# Berkunci versi dataset: file yang diganti otomatis dimuat ulang, dan hanya
+# versi terbaru yang disimpan
+@st.cache_data(max_entries=1)
+def _load_full_dataset_cached(version):
+    return _load_full_dataset()
+
+
+@st.cache_resource(max_entries=1)
+def _load_full_dataset_shared(version):
+    return _load_full_dataset()
+
+
+def _load_full_dataset():
     # Tambahkan pemeriksaan untuk memastikan file ada
-    if not os.path.exists(CSV_PATH):
-        st.error(f"Error: File CSV TIDAK DITEMUKAN di {CSV_PATH}. Harap periksa path Anda.")
+    partitions = list_partitions()
+    if not partitions:
+        if artifact_partitions():
+            st.error("CSV mentah tidak tersedia: aplikasi berjalan dari artefak build (build_artifacts.py).")
+        else:
+            _missing_dataset_error()
         return None
-        
+    path = partitions[max(partitions)]
+    st.info(f"Memuat dataset besar dari: {path}.")
+
+    if use_streaming(path):
+        st.error(
+            f"Dataset di {path} terlalu besar untuk dimuat utuh ke memori. "
+            "Gunakan load_count_cube() atau load_bitmap_index() (ingest bertahap)."
+        )
+        return None
+
     try:
-        df = pd.read_csv(CSV_PATH)
+        df = _read_dataset(path)
     except Exception as e:
         st.error(f"Error saat membaca file CSV: {e}")
         return None
-        
+
     return df
 
-# Panggil fungsi load_full_dataset() untuk mendapatkan DataFrame
-# Semua file study case akan mengimpor variabel ini
-DF_FULL = load_full_dataset()
\ No newline at end of file
+
+@st.cache_resource(max_entries=8)
+def _build_count_cube(year, version):
+    """
+    Membangun kubus hitungan (cube.py) untuk satu partisi tahun pada satu versi dataset,
+    atau memuatnya dari artefak build jika tersedia.
+
+    Disimpan sebagai resource (tanpa pickle per sesi) dan hanya kubusnya yang
+    dipertahankan; DataFrame baris dibuang setelah kubus selesai dibangun.
+    """
+    artifact = _artifact_path(year, version)
+    if artifact is not None:
+        return artifacts.load_cube(artifact).materialize()
+
+    path = list_partitions()[year]
+    if use_streaming(path):
+        cube = build_count_cube_chunked(path).materialize()
+    else:
+        cube = build_count_cube(_read_dataset(path)).materialize()
+    _check_version(path, version)
+    return cube
+
+
+@st.cache_resource(max_entries=4)
+def _merge_count_cubes(version, _cubes):
+    """Kubus gabungan beberapa tahun (di-cache per kombinasi tahun dan versi)."""
+    return CountCube.merge(_cubes).materialize()
+
+
+def load_count_cube(years=None):
+    """
+    Memuat kubus hitungan yang dipakai semua halaman study case untuk
+    merender tabel dan grafik tanpa memindai DF_FULL. Hanya partisi tahun
+    `years` (default: tahun terbaru) yang dibaca; kubus per tahun di-cache
+    terpisah sehingga menambah tahun baru tidak memperlambat tahun lain.
+    """
+    selected = select_years(years)
+    if not selected:
+        _missing_dataset_error(years)
+        return None
+
+    try:
+        cubes = [_build_count_cube(year, partition_version(year)) for year in selected]
+        if len(cubes) == 1:
+            return cubes[0]
+        return _merge_count_cubes(dataset_version(selected), cubes)
+    except StaleDatasetError as e:
+        stale = e
+    except Exception as e:
+        st.error(f"Error saat membaca file CSV: {e}")
+        return None
+    _rerun_on_stale(stale)
+    return None
+
+
+@st.cache_resource(max_entries=4)
+def _build_bitmap_index(year, version):
+    """Membangun indeks bitmap (bitmap_index.py) atas semua kolom kategori untuk satu partisi tahun."""
+    artifact = _artifact_path(year, version)
+    if artifact is not None:
+        return artifacts.load_bitmap_index(artifact)
+
+    path = list_partitions()[year]
+    if use_streaming(path):
+        index = build_bitmap_index_chunked(path)
+    else:
+        index = BitmapIndex.from_frame(_read_dataset(path))
+    _check_version(path, version)
+    return index
+
+
+def load_bitmap_index(year=None):
+    """
+    Memuat indeks bitmap (satu partisi tahun, default tahun terbaru) untuk
+    menghitung segmen ad-hoc (filter konjungtif atas kolom kategori) tanpa
+    memindai DataFrame baris.
+    """
+    selected = select_years(None if year is None else [year])
+    if not selected:
+        _missing_dataset_error(None if year is None else [year])
+        return None
+
+    try:
+        return _build_bitmap_index(selected[0], partition_version(selected[0]))
+    except StaleDatasetError as e:
+        stale = e
+    except Exception as e:
+        st.error(f"Error saat membaca file CSV: {e}")
+        return None
+    _rerun_on_stale(stale)
+    return None
+
+
+_ARTIFACT_LOADERS = {
+    'tables': artifacts.load_tables,
+    'summary': artifacts.load_summary,
+    'model': artifacts.load_model,
+}
+
+
+@st.cache_resource(max_entries=8)
+def _load_artifact(year, version, name):
+    artifact = _artifact_path(year, version)
+    if artifact is None:
+        return None
+    return _ARTIFACT_LOADERS[name](artifact)
+
+
+def load_page_tables(years=None):
+    """
+    Tabel setiap halaman study case (tanpa filter) yang sudah dihitung oleh
+    build_artifacts.py, sebagai dict {nama modul halaman: {'code': versi kode,
+    'table': hasil compute_tables}} (lihat artifacts.code_version).
+    None jika artefak tidak tersedia atau lebih dari satu tahun dipilih.
+    """
+    selected = select_years(years)
+    if len(selected) != 1:
+        return None
+    try:
+        return _load_artifact(selected[0], partition_version(selected[0]), 'tables')
+    except Exception:
+        # Artefak rusak: halaman menghitung ulang dari kubus
+        return None
+
+
+def load_dataset_summary(year=None):
+    """Ringkasan dataset (jumlah baris/kolom, tipe kolom) dari artefak build, atau None."""
+    selected = select_years(None if year is None else [year])
+    if not selected:
+        return None
+    try:
+        return _load_artifact(selected[0], partition_version(selected[0]), 'summary')
+    except Exception:
+        return None
+
+
+@st.cache_data(max_entries=2)
+def _load_memory_report(year, version):
+    path = list_partitions()[year]
+    report_path = _memory_report_path(path, version)
+    if os.path.exists(report_path):
+        try:
+            return pd.read_json(report_path, orient='records')
+        except ValueError:
+            # Laporan rusak: hitung ulang di bawah
+            pass
+    if use_streaming(path):
+        return None
+
+    df_raw = pd.read_csv(path)
+    report = memory_report(df_raw, _prepare_frame(df_raw))
+    try:
+        _write_memory_report(report, report_path)
+    except OSError:
+        pass
+    return report
+
+
+def load_memory_report(year=None):
+    """
+    Perbandingan memori per kolom sebelum dan sesudah skema (schema.memory_report)
+    untuk partisi tahun `year` (default: tahun terbaru). Dibuat saat snapshot
+    Parquet dibangun; jika snapshot sudah ada sebelumnya, dihitung sekali dari CSV.
+    None jika CSV mentah tidak tersedia atau dataset dimuat secara bertahap.
+    """
+    selected = select_years(None if year is None else [year])
+    if not selected or selected[0] not in list_partitions():
+        return None
+    try:
+        return _load_memory_report(selected[0], partition_version(selected[0]))
+    except Exception as e:
+        st.error(f"Error saat menghitung laporan memori: {e}")
+        return None
+
+
+def _model_cache_path(version, code):
+    key = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"risk-model-{key}-{code}.pkl")
+
+
+@st.cache_resource(max_entries=4)
+def _fit_risk_model(version, years):
+    """
+    Model risiko multivariabel (risk_model.py) untuk kombinasi tahun `years`
+    pada satu versi dataset. Urutan sumber: artefak build (satu tahun), file
+    hasil pelatihan sebelumnya di CACHE_DIR, lalu pelatihan atas indeks bitmap.
+    Hasil pelatihan disimpan ke CACHE_DIR sehingga restart server tidak melatih ulang.
+    """
+    code = artifacts.code_version(risk_model.fit_logistic_model)
+    if len(years) == 1:
+        try:
+            entry = _load_artifact(years[0], partition_version(years[0]), 'model')
+        except Exception:
+            entry = None
+        if entry is not None and entry['code'] == code:
+            return entry['model']
+
+    cache_path = _model_cache_path(version, code)
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception:
+            logger.warning("Cache model %s rusak; model dilatih ulang", cache_path)
+
+    indexes = [_build_bitmap_index(year, partition_version(year)) for year in years]
+    model = risk_model.fit_logistic_model(indexes)
+    try:
+        _write_atomic(cache_path, lambda tmp_path: pd.to_pickle(model, tmp_path))
+    except OSError:
+        # Folder cache tidak dapat ditulis: model tetap di-cache per proses
+        pass
+    return model
+
+
+def load_risk_model(years=None):
+    """
+    Model logistik HadHeartAttack atas faktor risiko (rasio odds tersesuaikan)
+    untuk tahun `years` (default: tahun terbaru). Model dilatih paling banyak
+    sekali per versi dataset; pemuatan halaman berikutnya memakai cache.
+    """
+    selected = select_years(years)
+    if not selected:
+        _missing_dataset_error(years)
+        return None
+
+    try:
+        return _fit_risk_model(dataset_version(selected), tuple(selected))
+    except Exception as e:
+        st.error(f"Error saat melatih model risiko: {e}")
+        return None
+
+
+def __getattr__(name):
+    # DF_FULL dimuat secara lazy: halaman study case kini memakai kubus
+    # hitungan, sehingga DataFrame baris hanya dimuat bila benar-benar diakses
+    if name == 'DF_FULL':
+        return load_full_dataset()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,232 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# Instrumentasi hot path: waktu setiap fase satu rerun (pemuatan data, status
+# cache, agregasi, pembuatan spesifikasi grafik, render) beserta ukuran
+# payload yang dikirim ke browser oleh st.altair_chart, st.plotly_chart, dan
+# st.dataframe.
+#
+# Aktif jika environment variable HEART_DIAGNOSTICS=1 (semua sesi, untuk
+# produksi) atau toggle "Diagnostik Performa" di sidebar dinyalakan (sesi itu
+# saja). Saat tidak aktif, phase() dan pembungkus grafik langsung diteruskan
+# tanpa pengukuran. Setiap rerun yang terukur ditulis sebagai satu baris JSON
+# ke logger "diagnostics" (dan ke file HEART_DIAGNOSTICS_LOG bila di-set).
+# Rerun parsial bagian halaman (fragment) dicatat sebagai rerun tersendiri.
+
+ENABLED_BY_ENV = os.environ.get('HEART_DIAGNOSTICS', '0') == '1'
+LOG_PATH = os.environ.get('HEART_DIAGNOSTICS_LOG')
+TOGGLE_KEY = 'diagnostics_enabled'
+
+# Ringkasan rerun terbaru lintas sesi (per proses server) untuk panel sidebar
+RECENT_RUNS = deque(maxlen=500)
+_recent_lock = threading.Lock()
+
+# Jejak rerun yang sedang berjalan (satu thread script per sesi Streamlit)
+_local = threading.local()
+
+logger = logging.getLogger('diagnostics')
+if (ENABLED_BY_ENV or LOG_PATH) and not logger.handlers:
+    # Satu objek JSON per baris (JSON Lines), ke file atau stderr
+    _handler = logging.FileHandler(LOG_PATH, encoding='utf-8') if LOG_PATH else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _active_trace():
+    return getattr(_local, 'trace', None)
+
+
+def start_run(page):
+    """Memulai jejak rerun untuk halaman `page` jika diagnostik aktif."""
+    enabled = ENABLED_BY_ENV or st.session_state.get(TOGGLE_KEY, False)
+    _local.trace = {'page': page, 'started': time.perf_counter(), 'events': []} if enabled else None
+    return _local.trace
+
+
+def record(phase, name, ms, **fields):
+    """Mencatat satu event pada jejak rerun aktif (no-op jika tidak ada jejak)."""
+    trace = _active_trace()
+    if trace is not None:
+        trace['events'].append(dict(phase=phase, name=name, ms=round(ms, 2), **fields))
+
+
+@contextmanager
+def phase(phase_name, name, **fields):
+    """
+    Mengukur waktu blok `with` sebagai satu event. Dict yang di-yield dapat
+    diisi field tambahan di dalam blok (mis. status cache).
+    """
+    if _active_trace() is None:
+        yield {}
+        return
+    extra = dict(fields)
+    started = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        record(phase_name, name, (time.perf_counter() - started) * 1000, **extra)
+
+
+def finish_run():
+    """Menutup jejak rerun: menulis log JSON dan ringkasannya ke RECENT_RUNS."""
+    trace = _active_trace()
+    _local.trace = None
+    if trace is None:
+        return None
+
+    summary = {
+        'ts': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'page': trace['page'],
+        'total_ms': round((time.perf_counter() - trace['started']) * 1000, 2),
+        'payload_bytes': sum(event.get('bytes') or 0 for event in trace['events']),
+        'events': trace['events'],
+    }
+    logger.info(json.dumps(summary, ensure_ascii=False))
+    with _recent_lock:
+        RECENT_RUNS.append({key: summary[key] for key in ('page', 'total_ms', 'payload_bytes')})
+    return summary
+
+
+def fragment(function):
+    """
+    st.fragment yang ikut terukur: widget di dalam `function` hanya menjalankan
+    ulang fungsi itu (bukan app_main.main dan seluruh show_page). Di dalam
+    rerun penuh fragmen dicatat sebagai fase 'fragment'; rerun fragmen saja
+    dicatat sebagai rerun tersendiri bernama '<modul>.<fungsi>'.
+    """
+    name = f"{function.__module__.rsplit('.', 1)[-1]}.{function.__name__}"
+
+    @functools.wraps(function)
+    def run(*args, **kwargs):
+        if _active_trace() is not None:
+            with phase('fragment', name):
+                return function(*args, **kwargs)
+        # Rerun fragmen: tidak ada jejak rerun penuh yang aktif
+        start_run(name)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            finish_run()
+
+    return st.fragment(run)
+
+
+# --- Ukuran payload ---
+def payload_bytes(kind, data):
+    """Perkiraan ukuran payload yang dikirim Streamlit ke browser (None jika tidak dapat diukur)."""
+    try:
+        return _serialized_size(kind, data)
+    except Exception:
+        return None
+
+
+def _serialized_size(kind, data):
+    if kind == 'altair_chart':
+        return len(json.dumps(data.to_dict()).encode('utf-8'))
+    if kind == 'vega_lite_chart':
+        # Spesifikasi dari charts.vega_lite_spec: dataset sudah berupa byte Arrow
+        body = {key: value for key, value in data.items() if key != 'datasets'}
+        return len(json.dumps(body).encode('utf-8')) + sum(len(value) for value in data.get('datasets', {}).values())
+    if kind == 'plotly_chart':
+        return len(data.to_json().encode('utf-8'))
+    if isinstance(data, pd.DataFrame):
+        import pyarrow as pa
+        table = pa.Table.from_pandas(data)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().size
+    return 0
+
+
+def timed_render(kind, render, data, *args, **kwargs):
+    """Memanggil elemen Streamlit `render` dan mencatat waktu render serta ukuran payload-nya."""
+    if _active_trace() is None:
+        return render(data, *args, **kwargs)
+    started = time.perf_counter()
+    result = render(data, *args, **kwargs)
+    # Ukuran payload dihitung di luar waktu render yang dicatat
+    record('render', kind, (time.perf_counter() - started) * 1000, bytes=payload_bytes(kind, data))
+    return result
+
+
+class _InstrumentedStreamlit:
+    """
+    Pengganti modul `st` di halaman: st.altair_chart, st.plotly_chart,
+    st.vega_lite_chart, dan st.dataframe diukur (waktu render + ukuran
+    payload), atribut lain diteruskan apa adanya ke streamlit.
+    """
+
+    def __getattr__(self, name):
+        return getattr(st, name)
+
+    def altair_chart(self, chart, *args, **kwargs):
+        return timed_render('altair_chart', st.altair_chart, chart, *args, **kwargs)
+
+    def plotly_chart(self, figure, *args, **kwargs):
+        return timed_render('plotly_chart', st.plotly_chart, figure, *args, **kwargs)
+
+    def vega_lite_chart(self, data=None, *args, **kwargs):
+        return timed_render('vega_lite_chart', st.vega_lite_chart, data, *args, **kwargs)
+
+    def dataframe(self, data=None, *args, **kwargs):
+        return timed_render('dataframe', st.dataframe, data, *args, **kwargs)
+
+
+INSTRUMENTED_ST = _InstrumentedStreamlit()
+
+
+def instrument_page(module):
+    """
+    Memasang instrumentasi pada modul halaman: `st` di modul diganti
+    INSTRUMENTED_ST. Pembuatan grafik diukur oleh cross_filter.page_chart
+    (fase chart_spec, beserta status cache-nya).
+    """
+    if getattr(module, 'st', None) is st:
+        module.st = INSTRUMENTED_ST
+    return module
+
+
+# --- Panel sidebar ---
+def render_toggle():
+    st.sidebar.markdown("---")
+    st.sidebar.toggle("Diagnostik Performa", key=TOGGLE_KEY, value=ENABLED_BY_ENV)
+
+
+def render_panel(summary):
+    """Panel diagnostik di sidebar: rincian rerun ini dan ringkasan per halaman."""
+    if summary is None or not st.session_state.get(TOGGLE_KEY, False):
+        return
+
+    with st.sidebar.expander("Diagnostik Rerun", expanded=True):
+        st.caption(
+            f"{summary['page']}: {summary['total_ms']:.0f} ms total, "
+            f"payload {summary['payload_bytes'] / 1024:.1f} KB"
+        )
+        if summary['events']:
+            events = pd.DataFrame(summary['events'])
+            if 'bytes' in events:
+                events['KB'] = (events.pop('bytes') / 1024).round(1)
+            st.dataframe(events, hide_index=True)
+
+        with _recent_lock:
+            recent = pd.DataFrame(list(RECENT_RUNS))
+        if not recent.empty:
+            st.caption(f"Ringkasan {len(recent)} rerun terakhir (semua sesi):")
+            by_page = recent.groupby('page')['total_ms'].agg(
+                rerun='count',
+                p50_ms='median',
+                p95_ms=lambda values: values.quantile(0.95),
+            ).round(1).sort_values('p95_ms', ascending=False)
+            st.dataframe(by_page)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# Bagian bersama mesin rasio insiden halaman study case (lihat cube.CountCube
+# dan parallel.py): pengodean kunci kategori, flag kasus, dan format tabel
+# insiden. Populasi dan kasus dihitung sekaligus atas kode kategori yang
+# digabung, tanpa groupby terpisah, penyaringan HadHeartAttack == 'Yes', dan merge.
+
+OUTCOME = 'HadHeartAttack'
+POSITIVE = 'Yes'
+
+
+def encode_key(series):
+    """Mengembalikan (kode, level, dtype kategori) untuk satu kolom pengelompokan."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories, series.dtype
+    codes, levels = pd.factorize(series, sort=True)
+    return codes, levels, None
+
+
+def outcome_flags(df, outcome, positive):
+    """Array boolean: True untuk baris kasus (outcome == positive)."""
+    column = df[outcome]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        if positive not in column.cat.categories:
+            return np.zeros(len(column), dtype=bool)
+        return column.cat.codes.to_numpy() == column.cat.categories.get_loc(positive)
+    return column.to_numpy() == positive
+
+
+def decode_levels(codes, levels, dtype=None):
+    """Mengubah kode integer kembali menjadi nilai level (Categorical jika kolomnya kategori)."""
+    if dtype is not None:
+        return pd.Categorical.from_codes(codes, dtype=dtype)
+    return levels.take(codes)
+
+
+def incidence_frame(columns, population, cases):
+    """
+    Menyusun tabel insiden dari kolom kunci (dict nama -> nilai) dan array
+    hitungan populasi/kasus per kelompok (dipakai cube.CountCube.incidence).
+    """
+    table = pd.DataFrame(columns)
+    table['Total_Population'] = population
+    table['Case_Count'] = cases
+    with np.errstate(invalid='ignore', divide='ignore'):
+        table['Incidence_Ratio (%)'] = table['Case_Count'] / table['Total_Population'] * 100
+    total_cases = table['Case_Count'].sum()
+    table['Case_Share (%)'] = table['Case_Count'] / total_cases * 100 if total_cases else 0.0
+    return table
+
@@ -1,6 +1,33 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
+from data_loader import load_bitmap_index, load_dataset_summary, load_memory_report
+from diagnostics import fragment
+from schema import COLUMN_SCHEMA
+
+# --- PENGHITUNG SEGMEN (FRAGMENT) ---
+# Mengubah pilihan segmen hanya menjalankan ulang penghitung ini, bukan seluruh halaman
+@fragment
+def render_segment_counter(index):
+    filter_columns = [column for column in index.levels if column != 'HadHeartAttack']
+    selected_columns = st.multiselect("Kolom filter:", filter_columns, default=['Sex', 'State'])
+
+    filters = {}
+    col_left, col_right = st.columns(2)
+    for i, column in enumerate(selected_columns):
+        with (col_left if i % 2 == 0 else col_right):
+            chosen = st.multiselect(f"{column}:", index.levels[column], key=f"segment_{column}")
+        if chosen:
+            filters[column] = chosen
+
+    population = index.count(**filters)
+    cases = index.count(HadHeartAttack='Yes', **filters)
+    ratio = cases / population * 100 if population else 0.0
+
+    col_pop, col_cases, col_ratio = st.columns(3)
+    col_pop.metric("Jumlah Responden", f"{population:,}")
+    col_cases.metric("Kasus Serangan Jantung", f"{cases:,}")
+    col_ratio.metric("Rasio Insiden (%)", f"{ratio:.2f}")
+
 
 # --- FUNGSI RENDER HALAMAN DATASET ---
 def show_page():
@@ -11,14 +38,23 @@ def show_page():
     
     st.info("Dataset ini digunakan sebagai sumber data utama untuk analisis 10 Studi Kasus mengenai risiko penyakit kardiovaskular.")
 
+    # Jumlah kolom/baris diambil dari ringkasan artefak build jika tersedia
+    summary = load_dataset_summary()
+    n_columns = '40'
+    n_rows = '246.022'
+    if summary is not None:
+        # Kolom turunan (BMICategory, AgeGroup, dst.) tidak dihitung sebagai kolom dataset
+        n_columns = str(len([c for c in summary['columns'] if c in COLUMN_SCHEMA]))
+        n_rows = f"{summary['n_rows']:,}".replace(',', '.')
+
     # Tampilkan Detail Kunci dalam bentuk tabel
     data_info = {
         'Metrik': ['Nama Dataset', 'Sumber', 'Jumlah Kolom', 'Jumlah Baris (Setelah Pembersihan)', 'Lisensi'],
         'Nilai': [
             'Key Indicators of Heart Disease (2022)',
             'Kaggle / CDC BRFSS 2022',
-            '40',
-            '246.022',
+            n_columns,
+            n_rows,
             'CC0: Public Domain'
         ]
     }
@@ -40,4 +76,28 @@ def show_page():
         * Gaya hidup (obesitas, kurang aktivitas fisik, dan konsumsi alkohol berlebih).
         
         Analisis 10 Studi Kasus di aplikasi ini bertujuan untuk menguji dan memvisualisasikan korelasi antara faktor-faktor gaya hidup dan kesehatan tersebut dengan risiko terjadinya serangan jantung (`HadHeartAttack`).
-    """)
\ No newline at end of file
+    """)
+
+    # --- MEMORI SEBELUM DAN SESUDAH SKEMA ---
+    report = load_memory_report()
+    if report is not None:
+        st.subheader("Memori Dataset: Sebelum vs Sesudah Skema")
+        st.info("Setiap kolom dimuat dengan tipe yang dideklarasikan di skema (kategori, int8, float32) alih-alih teks dan int64/float64 bawaan CSV.")
+        before = report['Memori Awal (MB)'].sum()
+        after = report['Memori Skema (MB)'].sum()
+        col_before, col_after, col_saving = st.columns(3)
+        col_before.metric("Memori Awal (CSV)", f"{before:,.1f} MB")
+        col_after.metric("Memori dengan Skema", f"{after:,.1f} MB")
+        col_saving.metric("Penghematan", f"{(1 - after / before) * 100:.1f}%" if before else "-")
+        with st.expander("Rincian per kolom"):
+            st.dataframe(report, hide_index=True, use_container_width=True)
+
+    # --- PENGHITUNG SEGMEN AD-HOC (INDEKS BITMAP) ---
+    st.subheader("Penghitung Segmen Responden")
+    st.info("Pilih kombinasi kategori untuk menghitung jumlah responden dan kasus serangan jantung pada segmen tersebut secara instan (indeks bitmap, tanpa memindai seluruh baris).")
+
+    index = load_bitmap_index()
+    if index is None:
+        return
+
+    render_segment_counter(index)
@@ -0,0 +1,109 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+from charts import render_chart
+from cross_filter import NO_FILTER, page_chart, render_year_selector, wait_for_warmup
+from data_loader import dataset_version, load_risk_model
+from diagnostics import fragment
+from risk_model import MODEL_FACTORS
+
+
+def warm_up():
+    """Pemanasan latar belakang (warmup.py): melatih atau memuat model tahun terbaru."""
+    load_risk_model()
+
+
+# === VISUALISASI: RASIO ODDS KASAR VS TERSESUAIKAN ===
+def create_adjusted_or_chart(df, factors=()):
+    """
+    Forest plot rasio odds tersesuaikan (titik + interval 95%) dan rasio odds
+    kasar (titik kosong) per level, skala log. `factors` membatasi faktor yang ditampilkan.
+    """
+    df_plot = df.dropna(subset=['Adjusted_OR'])
+    if factors:
+        df_plot = df_plot[df_plot['Faktor'].isin(factors)]
+    df_plot = df_plot.copy()
+    df_plot['Label'] = df_plot['Faktor'] + ' = ' + df_plot['Level'].astype(str)
+    order = list(df_plot['Label'])
+
+    y = alt.Y('Label:N', sort=order, title=None)
+    x_scale = alt.Scale(type='log')
+    tooltip = ['Faktor', 'Level', 'Referensi', 'Total_Population', 'Case_Count',
+               'Crude_OR', 'Adjusted_OR', 'OR_CI_Low', 'OR_CI_High', 'p_value']
+    error_bars = alt.Chart(df_plot).mark_errorbar(ticks=True).encode(
+        x=alt.X('OR_CI_Low:Q', scale=x_scale, title='Rasio Odds (skala log)'), x2='OR_CI_High:Q', y=y
+    )
+    adjusted = alt.Chart(df_plot).mark_point(filled=True, size=80, color='crimson').encode(
+        x=alt.X('Adjusted_OR:Q', scale=x_scale), y=y, tooltip=tooltip
+    )
+    crude = alt.Chart(df_plot).mark_point(filled=False, size=60, color='gray').encode(
+        x=alt.X('Crude_OR:Q', scale=x_scale), y=y, tooltip=tooltip
+    )
+    reference = alt.Chart(pd.DataFrame({'OR': [1.0]})).mark_rule(strokeDash=[4, 4], color='gray').encode(x='OR:Q')
+    return (error_bars + crude + adjusted + reference).properties(
+        title='Rasio Odds Tersesuaikan (merah, CI 95%) vs Rasio Odds Kasar (abu-abu)',
+        height=24 * max(len(df_plot), 1)
+    )
+
+
+@fragment
+def render_forest(df_model):
+    """Forest plot dan pilihan faktornya; mengganti pilihan hanya merender ulang grafik ini."""
+    factors = st.multiselect(
+        "Faktor yang ditampilkan:", MODEL_FACTORS, key='risk_model_factors', placeholder="Semua faktor"
+    )
+    render_chart(page_chart(__name__, create_adjusted_or_chart, df_model, factors=tuple(factors)), use_container_width=True)
+
+
+# === TAMPILAN HALAMAN ===
+def show_page():
+    st.sidebar.markdown("---")
+    years = render_year_selector()
+
+    st.header("Model Risiko Multivariabel: Regresi Logistik Serangan Jantung")
+    st.markdown("---")
+
+    with st.spinner("Melatih model (hanya sekali per versi dataset)..."):
+        selected = list(years) or None
+        # Model tidak memakai filter global: hanya tahun terbaru yang dilatih thread pemanasan
+        wait_for_warmup((__name__, NO_FILTER, dataset_version(selected)))
+        model = load_risk_model(selected)
+    if model is None:
+        return
+    df_model = model['table']
+
+    st.info(
+        "Regresi logistik `HadHeartAttack` terhadap semua faktor di bawah sekaligus. Rasio odds **tersesuaikan** "
+        "membandingkan suatu level dengan level referensinya ketika faktor lain (termasuk usia) dibuat sama, "
+        "sedangkan rasio odds **kasar** adalah perbandingan tanpa penyesuaian seperti pada Study Case 1–11. "
+        "Model dilatih atas seluruh responden tahun terpilih (filter global tidak berlaku) dan di-cache per versi dataset."
+    )
+
+    col_rows, col_cases, col_r2, col_iterations = st.columns(4)
+    col_rows.metric("Responden dalam model", f"{model['n_rows']:,}")
+    col_cases.metric("Kasus serangan jantung", f"{model['n_cases']:,}")
+    col_r2.metric("Pseudo R² (McFadden)", f"{model['pseudo_r2']:.3f}")
+    col_iterations.metric("Iterasi Newton", f"{model['iterations']}" + ("" if model['converged'] else " (belum konvergen)"))
+    if model['n_excluded']:
+        st.caption(f"{model['n_excluded']:,} responden dengan nilai kosong pada salah satu faktor tidak diikutkan.")
+
+    # 1. Forest plot
+    st.subheader("1. Rasio Odds per Faktor")
+    render_forest(df_model)
+
+    # 2. Tabel koefisien
+    st.subheader("2. Tabel Koefisien Model")
+    st.dataframe(df_model, hide_index=True, use_container_width=True)
+    dropped = df_model['Adjusted_OR'].isna().sum()
+    if dropped:
+        st.caption(f"{dropped} level tanpa variasi kasus tidak dimasukkan ke model (rasio odds tersesuaikan kosong).")
+
+    # 3. Interpretasi
+    st.subheader("3. Cara Membaca Hasil")
+    st.markdown("""
+        - **Rasio odds tersesuaikan > 1** (dan CI 95% tidak memuat 1): level tersebut berasosiasi dengan odds serangan jantung
+          yang lebih tinggi dibanding level referensi, **setelah** memperhitungkan semua faktor lain dalam model.
+        - Jika rasio odds kasar jauh berbeda dari yang tersesuaikan, sebagian asosiasi kasarnya dijelaskan oleh faktor lain
+          (perancu), misalnya usia.
+        - Model bersifat asosiatif (data survei potong lintang) dan hanya memuat faktor yang tercantum; interval adalah interval Wald 95%.
+    """)
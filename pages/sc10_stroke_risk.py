@@ -1,42 +1,33 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
+from schema import YES_NO
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, group_relative_risk, show_significance
 
-try:
-    from data_loader import DF_FULL
-except ImportError:
-    st.error("Gagal mengimpor DF_FULL. Pastikan file data_loader.py sudah dibuat.")
-    DF_FULL = None
-
-if DF_FULL is not None:
-    # 1. Hitung Total Populasi (Denominator) untuk setiap kategori HadStroke
-    df_pop = DF_FULL.groupby('HadStroke', as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Total_Population'})
-
-    # 2. Hitung Kasus Serangan Jantung (Numerator)
-    df_cases = DF_FULL[DF_FULL['HadHeartAttack'] == 'Yes'].groupby('HadStroke', as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Count_of_HadHeartAttack'})
-
-    # 3. Gabungkan
-    df_risk = df_pop.merge(df_cases, on='HadStroke', how='left').fillna(0)
+def compute_tables(cube):
+    """Tabel risiko per riwayat stroke dari kubus (sudah difilter oleh filter global)."""
+    # 1. Hitung Total Populasi dan Kasus Serangan Jantung per kategori HadStroke (satu lintasan)
+    df_risk = cube.incidence(['HadStroke'])
     
-    # 4. Hitung Rasio Insiden: (Kasus / Total Populasi) * 100
-    df_risk['Rasio_Insiden (%)'] = (df_risk['Count_of_HadHeartAttack'] / df_risk['Total_Population'] * 100).round(2)
+    # 2. Rasio Insiden: (Kasus / Total Populasi) * 100
+    df_risk['Rasio_Insiden (%)'] = df_risk['Incidence_Ratio (%)'].round(2)
     
-    # 5. Hitung Proporsi Kasus Absolut
-    total_cases = df_risk['Count_of_HadHeartAttack'].sum()
-    df_risk['Proporsi_Kasus (%)'] = (df_risk['Count_of_HadHeartAttack'] / total_cases * 100).round(1)
+    # 3. Proporsi Kasus Absolut
+    df_risk['Proporsi_Kasus (%)'] = df_risk['Case_Share (%)'].round(1)
 
-    df_risk.rename(columns={'HadStroke': 'Riwayat Stroke'}, inplace=True)
-    
-    stroke_order = ['No', 'Yes']
-    df_stroke_risk = df_risk
-else:
-    df_stroke_risk = pd.DataFrame(columns=['Riwayat Stroke', 'Count_of_HadHeartAttack', 'Proporsi_Kasus (%)', 'Total_Population', 'Rasio_Insiden (%)'])
+    # 4. Interval kepercayaan Wilson 95% untuk rasio insiden
+    df_risk = add_intervals(df_risk)
+
+    df_risk = df_risk[['HadStroke', 'Total_Population', 'Case_Count', 'Rasio_Insiden (%)', 'CI_Low (%)', 'CI_High (%)', 'Proporsi_Kasus (%)']]
+    df_risk = df_risk.rename(columns={'HadStroke': 'Riwayat Stroke', 'Case_Count': 'Count_of_HadHeartAttack'})
+
+    return df_risk
 
 # === VISUALISASI BAR CHART UNTUK PROPORSI KASUS ABSOLUT ===
 def create_bar_chart(df):
-    stroke_order = ['No', 'Yes']
     chart = alt.Chart(df).mark_bar().encode(
-        x=alt.X('Riwayat Stroke:N', sort=stroke_order, title='Riwayat Stroke'),
+        x=alt.X('Riwayat Stroke:N', sort=YES_NO, title='Riwayat Stroke'),
         y=alt.Y('Count_of_HadHeartAttack:Q', title='Jumlah Kasus Serangan Jantung Absolut'),
         color=alt.Color('Count_of_HadHeartAttack:Q', 
                         title='Kasus Absolut',
@@ -49,52 +40,68 @@ def create_bar_chart(df):
 
 # === VISUALISASI LINE CHART UNTUK RASIO INSIDEN ===
 def create_lollipop_chart(df):
-    stroke_order = ['No', 'Yes']
     
     # Garis horizontal
     lines = alt.Chart(df).mark_rule(size=4, color='gray').encode(
         x=alt.X('Rasio_Insiden (%):Q', title='Rasio Insiden (%)'),
-        y=alt.Y('Riwayat Stroke:N', sort=stroke_order)
+        y=alt.Y('Riwayat Stroke:N', sort=YES_NO)
     )
     
+    # Interval kepercayaan 95% di ujung garis
+    error_bars = alt.Chart(df).mark_errorbar(color='black', ticks=True).encode(
+        x='CI_Low (%):Q', x2='CI_High (%):Q',
+        y=alt.Y('Riwayat Stroke:N', sort=YES_NO)
+    )
+
     # Titik di ujung garis
     points = alt.Chart(df).mark_circle(size=200, color='crimson').encode(
         x='Rasio_Insiden (%):Q',
-        y=alt.Y('Riwayat Stroke:N', sort=stroke_order),
-        tooltip=['Riwayat Stroke', 'Rasio_Insiden (%)']
+        y=alt.Y('Riwayat Stroke:N', sort=YES_NO),
+        tooltip=['Riwayat Stroke', 'Rasio_Insiden (%)', 'CI_Low (%)', 'CI_High (%)']
     )
     
-    chart = (lines + points).properties(
+    chart = (lines + error_bars + points).properties(
         title='Rasio Insiden (%) Serangan Jantung Berdasarkan Riwayat Stroke',
         height=300
     )
     return chart
 
 def show_page():
-    if DF_FULL is None:
+    df_stroke_risk = page_result(__name__, compute_tables)
+    if df_stroke_risk is None:
         return
 
     st.header("Study Case 10: Riwayat Stroke vs. Risiko Serangan Jantung")
     st.markdown("---")
+
+    if df_stroke_risk['Count_of_HadHeartAttack'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
     
     # Visualisasi Kasus Absolut
     st.subheader("1. Bagan Kolom Kontribusi Kasus Absolut")
-    st.altair_chart(create_bar_chart(df_stroke_risk), use_container_width=True) 
+    render_chart(page_chart(__name__, create_bar_chart, df_stroke_risk), use_container_width=True) 
 
     # Visualisasi Rasio Insiden
     st.subheader("2. Perbandingan Rasio Insiden Serangan Jantung")
-    st.altair_chart(create_lollipop_chart(df_stroke_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_lollipop_chart, df_stroke_risk), use_container_width=True)
 
     # Data Rinci
     st.subheader("3. Data Rinci Kasus Absolut, Populasi, dan Rasio Insiden")
     st.dataframe(df_stroke_risk, hide_index=True)
+    show_significance(df_stroke_risk, __name__, cases='Count_of_HadHeartAttack')
     
     # Interpretasi dan Kesimpulan
     st.subheader("4. Interpretasi dan Kesimpulan")
     
-    ratio_no = df_stroke_risk[df_stroke_risk['Riwayat Stroke'] == 'No']['Rasio_Insiden (%)'].iloc[0]
-    ratio_yes = df_stroke_risk[df_stroke_risk['Riwayat Stroke'] == 'Yes']['Rasio_Insiden (%)'].iloc[0]
-    risk_factor = (ratio_yes / ratio_no).round(1)
+    # Kategori bisa saja tidak muncul di segmen yang difilter: gunakan NaN
+    ratios = df_stroke_risk.set_index('Riwayat Stroke')['Rasio_Insiden (%)']
+    ratio_no = ratios.get('No', float('nan'))
+    ratio_yes = ratios.get('Yes', float('nan'))
+    # Risiko relatif dihitung dari hitungan kasus/populasi, bukan dari persentase yang sudah dibulatkan
+    risk_factor, rr_low, rr_high = (round(value, 2) for value in group_relative_risk(
+        df_stroke_risk, 'Riwayat Stroke', 'Yes', 'No', cases='Count_of_HadHeartAttack'
+    ))
     
     st.markdown(f"""
         ### Rumus Perhitungan
@@ -110,7 +117,7 @@ def show_page():
         2. **Rasio Insiden:**
            * Riwayat stroke `Yes`: sekitar **{ratio_yes}%**
            * Tanpa riwayat stroke `No`: sekitar **{ratio_no}%**
-        3. **Perbandingan Risiko:** Risiko serangan jantung pada individu dengan riwayat stroke adalah **{risk_factor} kali lipat** lebih tinggi.
+        3. **Perbandingan Risiko:** Risiko serangan jantung pada individu dengan riwayat stroke adalah **{risk_factor} kali lipat** lebih tinggi (CI 95%: {rr_low}–{rr_high}).
 
         ---
         ### Kesimpulan
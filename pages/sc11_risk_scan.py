@@ -0,0 +1,155 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_index_result, warm_page_index_result
+from diagnostics import fragment
+from incidence import OUTCOME, POSITIVE
+from uncertainty import add_intervals, odds_ratio, relative_risk
+
+# Level dengan populasi lebih kecil dari ini tidak ikut grafik peringkat
+MIN_POPULATION = 100
+TOP_N = 20
+
+SORT_OPTIONS = {
+    'Risiko Relatif': 'Relative_Risk',
+    'Rasio Odds': 'Odds_Ratio',
+    'Rasio Insiden (%)': 'Incidence_Ratio (%)',
+    'Jumlah Kasus': 'Case_Count',
+}
+
+
+def level_counts(index, filters):
+    """Populasi dan kasus setiap (kolom, level) dari satu indeks bitmap dalam segmen filter."""
+    segment = index.mask(**filters)
+    outcome = index.bitmap(OUTCOME, POSITIVE)
+    if segment is not None:
+        outcome &= segment
+    columns, levels = zip(*index.labels)
+    return pd.DataFrame({
+        'Kolom': columns,
+        'Level': levels,
+        'Total_Population': index.level_counts(segment),
+        'Case_Count': index.level_counts(outcome),
+    })
+
+
+def compute_scan(indexes, filters):
+    """
+    Tabel skor setiap level dari setiap kolom kategori terhadap HadHeartAttack:
+    rasio insiden, risiko relatif, dan rasio odds level tersebut dibanding
+    level lain pada kolom yang sama, beserta interval kepercayaan 95%.
+    """
+    # 1. Hitungan per level untuk semua kolom sekaligus (perkalian matriks
+    #    one-hot terpaket dengan vektor segmen dan vektor kasus), dijumlahkan antar tahun
+    counts = pd.concat([level_counts(index, filters) for index in indexes], ignore_index=True)
+    counts = counts.groupby(['Kolom', 'Level'], sort=False, as_index=False)[['Total_Population', 'Case_Count']].sum()
+    counts = counts[(counts['Kolom'] != OUTCOME) & (counts['Total_Population'] > 0)].reset_index(drop=True)
+
+    # 2. Rasio insiden dan interval Wilson
+    counts['Incidence_Ratio (%)'] = (counts['Case_Count'] / counts['Total_Population'] * 100).round(2)
+    counts = add_intervals(counts)
+
+    # 3. Pembanding: baris lain pada kolom yang sama (responden dengan nilai kosong tidak dihitung)
+    totals = counts.groupby('Kolom')[['Total_Population', 'Case_Count']].transform('sum')
+    cases = counts['Case_Count'].to_numpy()
+    population = counts['Total_Population'].to_numpy()
+    ref_cases = totals['Case_Count'].to_numpy() - cases
+    ref_population = totals['Total_Population'].to_numpy() - population
+
+    rr, rr_low, rr_high = relative_risk(cases, population, ref_cases, ref_population)
+    odds, or_low, or_high = odds_ratio(cases, population - cases, ref_cases, ref_population - ref_cases)
+    counts['Relative_Risk'] = np.round(rr, 3)
+    counts['RR_CI_Low'] = np.round(rr_low, 3)
+    counts['RR_CI_High'] = np.round(rr_high, 3)
+    counts['Odds_Ratio'] = np.round(odds, 3)
+    counts['OR_CI_Low'] = np.round(or_low, 3)
+    counts['OR_CI_High'] = np.round(or_high, 3)
+    # Signifikan jika interval risiko relatif tidak memuat 1
+    counts['Signifikan'] = (counts['RR_CI_Low'] > 1) | (counts['RR_CI_High'] < 1)
+    return counts.sort_values('Relative_Risk', ascending=False, na_position='last', ignore_index=True)
+
+
+def warm_up():
+    """Pemanasan latar belakang (warmup.py): skor tanpa filter untuk tahun terbaru."""
+    warm_page_index_result(__name__, compute_scan)
+
+
+# === VISUALISASI: FOREST PLOT RISIKO RELATIF ===
+def create_forest_chart(df):
+    """Risiko relatif (skala log) dan interval 95% untuk TOP_N level berisiko tertinggi."""
+    df_top = df[df['Total_Population'] >= MIN_POPULATION].dropna(subset=['RR_CI_Low']).head(TOP_N).copy()
+    df_top['Faktor'] = df_top['Kolom'] + ' = ' + df_top['Level'].astype(str)
+    order = list(df_top['Faktor'])
+
+    y = alt.Y('Faktor:N', sort=order, title=None)
+    x_scale = alt.Scale(type='log')
+    error_bars = alt.Chart(df_top).mark_errorbar(ticks=True).encode(
+        x=alt.X('RR_CI_Low:Q', scale=x_scale, title='Risiko Relatif (skala log)'), x2='RR_CI_High:Q', y=y
+    )
+    points = alt.Chart(df_top).mark_point(filled=True, size=80, color='crimson').encode(
+        x=alt.X('Relative_Risk:Q', scale=x_scale),
+        y=y,
+        tooltip=['Kolom', 'Level', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)',
+                 'Relative_Risk', 'RR_CI_Low', 'RR_CI_High', 'Odds_Ratio']
+    )
+    reference = alt.Chart(pd.DataFrame({'RR': [1.0]})).mark_rule(strokeDash=[4, 4], color='gray').encode(x='RR:Q')
+    return (error_bars + points + reference).properties(
+        title=f'{TOP_N} Faktor dengan Risiko Relatif Tertinggi (populasi ≥ {MIN_POPULATION})',
+        height=28 * max(len(df_top), 1)
+    )
+
+
+# === TABEL PERINGKAT ===
+@fragment
+def render_ranking(df_scan):
+    """Tabel peringkat beserta kontrolnya; mengubah kontrol hanya merender ulang tabel ini."""
+    col_sort, col_population, col_significant = st.columns(3)
+    sort_label = col_sort.selectbox("Urutkan berdasarkan:", list(SORT_OPTIONS), key='risk_scan_sort')
+    min_population = col_population.number_input("Populasi minimum:", min_value=0, value=MIN_POPULATION, step=50, key='risk_scan_min_population')
+    only_significant = col_significant.toggle("Hanya yang signifikan (CI RR tidak memuat 1)", key='risk_scan_significant')
+
+    df_ranked = df_scan[df_scan['Total_Population'] >= min_population]
+    if only_significant:
+        df_ranked = df_ranked[df_ranked['Signifikan']]
+    df_ranked = df_ranked.sort_values(SORT_OPTIONS[sort_label], ascending=False, na_position='last')
+    st.caption(f"{len(df_ranked):,} level dari {df_scan['Kolom'].nunique()} kolom kategori. Klik judul kolom untuk mengurutkan ulang.")
+    st.dataframe(df_ranked, hide_index=True, use_container_width=True)
+
+
+# === TAMPILAN HALAMAN ===
+def show_page():
+    df_scan = page_index_result(__name__, compute_scan)
+    if df_scan is None:
+        return
+
+    st.header("Study Case 11: Pemindaian Faktor Risiko Serangan Jantung")
+    st.markdown("---")
+
+    if df_scan['Case_Count'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
+
+    st.info(
+        "Setiap level dari setiap kolom kategori dibandingkan dengan level lain pada kolom yang sama: "
+        "risiko relatif (RR) = rasio insiden level / rasio insiden sisanya, rasio odds (OR) dari tabel 2 x 2 yang sama. "
+        "Semua kolom dihitung sekaligus dari indeks bitmap, mengikuti filter global."
+    )
+
+    # 1. Forest plot
+    st.subheader("1. Faktor dengan Risiko Relatif Tertinggi")
+    render_chart(page_chart(__name__, create_forest_chart, df_scan), use_container_width=True)
+
+    # 2. Tabel peringkat
+    st.subheader("2. Peringkat Seluruh Faktor")
+    render_ranking(df_scan)
+
+    # 3. Interpretasi
+    st.subheader("3. Cara Membaca Hasil")
+    st.markdown("""
+        - **Risiko Relatif (RR) > 1**: rasio insiden serangan jantung pada level tersebut lebih tinggi dibanding responden lain pada kolom yang sama.
+        - **Rasio Odds (OR)** mendekati RR ketika insiden rendah; keduanya disertai interval kepercayaan 95% (RR: metode log Katz, OR: metode log Woolf, insiden: Wilson).
+        - Pemindaian ini bersifat **eksploratif**: banyak perbandingan sekaligus dan tidak ada penyesuaian untuk faktor perancu,
+          sehingga faktor yang menonjol perlu dianalisis lebih lanjut (seperti pada Study Case 1–10).
+    """)
@@ -1,44 +1,25 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
-from data_loader import DF_FULL
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
 
-df_full = DF_FULL
+def compute_tables(cube):
+    """Tabel risiko per kelompok usia dari kubus (sudah difilter oleh filter global)."""
+    # 1. Menghitung Jumlah Kasus Serangan Jantung (HadHeartAttack == 'Yes') per Kelompok Usia.
+    #    observed=False memastikan semua kelompok usia muncul (kosong = 0) dengan urutan
+    #    kategori AgeCategory yang benar (schema.AGE_ORDER)
+    df_counts = cube.incidence(['AgeCategory'], observed=False)
+    df_final = df_counts[['AgeCategory', 'Case_Count']].rename(columns={'Case_Count': 'Count of HadHeartAttack'})
 
-
-if df_full is not None:
-    # 1. Menghitung Jumlah Kasus Serangan Jantung (HadHeartAttack == 'Yes') per Kelompok Usia
-    df_cases = df_full[df_full['HadHeartAttack'] == 'Yes']
-
-    # 2. Mengelompokkan berdasarkan AgeCategory dan menghitung count (Count of HadHeartAttack)
-    df_counts = df_cases.groupby('AgeCategory', as_index=False)['HadHeartAttack'].count()
-    df_counts.rename(columns={'HadHeartAttack': 'Count of HadHeartAttack'}, inplace=True)
-
-    # 3. Urutan Kelompok Usia yang Benar (Untuk visualisasi dan perhitungan selisih)
-    age_order = [
-        'Age 18 to 24', 'Age 25 to 29', 'Age 30 to 34', 'Age 35 to 39',
-        'Age 40 to 44', 'Age 45 to 49', 'Age 50 to 54', 'Age 55 to 59',
-        'Age 60 to 64', 'Age 65 to 69', 'Age 70 to 74', 'Age 75 to 79',
-        'Age 80 or older'
-    ]
+    # 2. Persentase Risiko Global = kasus kelompok / total kasus (Case_Share)
+    df_final['Persentase Risiko (%)'] = df_counts['Case_Share (%)'].round(2)
     
-    # 4. Memastikan urutan dan mengisi usia yang kosong (jika ada)
-    df_final = pd.DataFrame({'AgeCategory': age_order})
-    df_final = df_final.merge(df_counts, left_on='AgeCategory', right_on='AgeCategory', how='left').fillna(0)
-    
-    # 5. Menghitung Persentase Risiko Global
-    total_cases_sc1 = df_final['Count of HadHeartAttack'].sum()
-    df_final['Persentase Risiko (%)'] = (df_final['Count of HadHeartAttack'] / total_cases_sc1 * 100).round(2)
-    
-    # 6. Menghitung Kenaikan Absolut
+    # 3. Menghitung Kenaikan Absolut
     df_final['Kenaikan Absolut (%)'] = df_final['Persentase Risiko (%)'].diff().fillna(0).round(2)
     
     # Ganti nama kolom AgeCategory agar sesuai dengan visualisasi
     df_final.rename(columns={'AgeCategory': 'Kelompok Usia'}, inplace=True)
-    df_raw_usia = df_final # Variabel yang akan digunakan di fungsi render
-else:
-    # Jika data gagal dimuat, buat DataFrame kosong untuk mencegah error
-    df_raw_usia = pd.DataFrame(columns=['Kelompok Usia', 'Count of HadHeartAttack', 'Persentase Risiko (%)', 'Kenaikan Absolut (%)'])
+    return df_final
 
 def create_absolute_increase_chart(df):
     color_condition = alt.condition(
@@ -72,6 +53,14 @@ def create_pie_chart(df):
 def show_page():
     st.header("Study Case 1: Analisis Evolusi Risiko Serangan Jantung Berdasarkan Usia")
     st.markdown("---")
+
+    df_raw_usia = page_result(__name__, compute_tables)
+    if df_raw_usia is None:
+        # Data gagal dimuat (pesan error sudah ditampilkan oleh data_loader)
+        return
+    if df_raw_usia['Count of HadHeartAttack'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
     
     st.subheader("Data Rinci Risiko Serangan Jantung Berdasarkan Usia")
     st.dataframe(df_raw_usia, use_container_width=True, hide_index=True)
@@ -79,10 +68,10 @@ def show_page():
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Persentase Risiko Serangan Jantung Berdasarkan Kelompok Usia")
-        st.altair_chart(create_pie_chart(df_raw_usia), use_container_width=False)
+        render_chart(page_chart(__name__, create_pie_chart, df_raw_usia), use_container_width=False)
     with col2:
         st.subheader("Visualisasi Kenaikan Absolut Risiko")
-        st.altair_chart(create_absolute_increase_chart(df_raw_usia), use_container_width=True)
+        render_chart(page_chart(__name__, create_absolute_increase_chart, df_raw_usia), use_container_width=True)
     
     st.subheader("Interpretasi dan Kesimpulan")
     st.markdown("""
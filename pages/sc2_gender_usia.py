@@ -2,70 +2,50 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import plotly.express as px
-from data_loader import DF_FULL
-
-df_full = DF_FULL
-
-# Fungsi pengelompokan usia yang disederhanakan
-def simplify_age(age_category):
-    if age_category in ['Age 18 to 24', 'Age 25 to 29', 'Age 30 to 34', 'Age 35 to 39', 'Age 40 to 44']:
-        return '<45 Tahun'
-    elif age_category in ['Age 45 to 49', 'Age 50 to 54', 'Age 55 to 59', 'Age 60 to 64']:
-        return '45-64 Tahun'
-    elif age_category in ['Age 65 to 69', 'Age 70 to 74', 'Age 75 to 79']:
-        return '65-79 Tahun'
-    elif age_category == 'Age 80 or older':
-        return '>=80 Tahun'
-    return age_category
-
-if df_full is not None:
-    # 1. Filter kasus serangan jantung & Kelompokkan usia
-    df_cases = df_full[df_full['HadHeartAttack'] == 'Yes'].copy()
-    df_cases['Kelompok Usia'] = df_cases['AgeCategory'].apply(simplify_age)
-
-    # 2. Hitung Jumlah Kasus (Count) per kombinasi Jenis Kelamin dan Usia Baru
-    df_counts = df_cases.groupby(['Kelompok Usia', 'Sex'], as_index=False)['HadHeartAttack'].count()
-    df_counts.rename(columns={'HadHeartAttack': 'Jumlah Kasus'}, inplace=True)
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from schema import AGE_GROUP_ORDER
+
+# Urutan usia yang disederhanakan (dimensi turunan AgeGroup, lihat schema.DERIVED_DIMENSIONS)
+simple_age_order = AGE_GROUP_ORDER
+
+# Fungsi untuk menghitung Kenaikan Absolut dan menyertakan Jumlah Kasus
+def calculate_increase_with_count(df, gender):
+    df_f = df[df['Sex'] == gender].copy()
     
-    # 3. Hitung Persentase Kasus Global (untuk Kenaikan Absolut)
-    total_cases_sc2 = df_counts['Jumlah Kasus'].sum()
-    df_counts['Persentase Kasus Global (%)'] = (df_counts['Jumlah Kasus'] / total_cases_sc2 * 100).round(2)
+    # Urutkan berdasarkan urutan usia yang disederhanakan
+    df_f = df_f.sort_values(by='Kelompok Usia', key=lambda x: x.map({age: i for i, age in enumerate(simple_age_order)}))
     
-    # 4. Definisikan urutan usia yang disederhanakan
-    simple_age_order = ['<45 Tahun', '45-64 Tahun', '65-79 Tahun', '>=80 Tahun']
+    # Hitung Kenaikan Absolut
+    df_f['Kenaikan Absolut (%)'] = df_f['Persentase Kasus Global (%)'].diff().fillna(0).round(2)
     
-    # 5. Fungsi BARU untuk menghitung Kenaikan Absolut dan menyertakan Jumlah Kasus
-    def calculate_increase_with_count(df, gender):
-        df_f = df[df['Sex'] == gender].copy()
-        
-        # Urutkan berdasarkan urutan usia yang disederhanakan
-        df_f = df_f.sort_values(by='Kelompok Usia', key=lambda x: x.map({age: i for i, age in enumerate(simple_age_order)}))
-        
-        # Hitung Kenaikan Absolut
-        df_f['Kenaikan Absolut (%)'] = df_f['Persentase Kasus Global (%)'].diff().fillna(0).round(2)
-        
-        df_f.rename(columns={'Sex': 'Jenis Kelamin'}, inplace=True)
-        
-        # Urutan kolom yang baru (dengan Jumlah Kasus)
-        return df_f[['Kelompok Usia', 'Jumlah Kasus', 'Persentase Kasus Global (%)', 'Kenaikan Absolut (%)']]
+    df_f.rename(columns={'Sex': 'Jenis Kelamin'}, inplace=True)
+    
+    # Urutan kolom yang baru (dengan Jumlah Kasus)
+    return df_f[['Kelompok Usia', 'Jumlah Kasus', 'Persentase Kasus Global (%)', 'Kenaikan Absolut (%)']]
+
+def compute_tables(cube):
+    """Tabel kasus per gender dan kelompok usia dari kubus (sudah difilter oleh filter global)."""
+    # 1-2. Roll-up kubus langsung ke kelompok usia yang disederhanakan (AgeGroup) x Sex
+    #      untuk menghitung Jumlah Kasus per kombinasi Jenis Kelamin dan Usia Baru
+    df_counts = cube.incidence(['AgeGroup', 'Sex'])
+    df_counts = df_counts[df_counts['Case_Count'] > 0].rename(columns={'AgeGroup': 'Kelompok Usia', 'Case_Count': 'Jumlah Kasus'})
+    
+    # 3. Persentase Kasus Global (untuk Kenaikan Absolut) = kasus kelompok / total kasus
+    df_counts['Persentase Kasus Global (%)'] = df_counts['Case_Share (%)'].round(2)
+    df_counts = df_counts[['Kelompok Usia', 'Sex', 'Jumlah Kasus', 'Persentase Kasus Global (%)']]
 
     df_male_increase = calculate_increase_with_count(df_counts, 'Male')
     df_female_increase = calculate_increase_with_count(df_counts, 'Female')
     
     # Menyiapkan data untuk visualisasi Stacked Bar
     df_gender_age_count = df_counts.rename(columns={'Sex': 'Jenis Kelamin'})
-    
-else:
-    # Buat DataFrame kosong jika data gagal dimuat
-    df_gender_age_count = pd.DataFrame(columns=['Kelompok Usia', 'Jenis Kelamin', 'Jumlah Kasus'])
-    df_male_increase = pd.DataFrame(columns=['Kelompok Usia', 'Jumlah Kasus', 'Persentase Kasus Global (%)', 'Kenaikan Absolut (%)'])
-    df_female_increase = pd.DataFrame(columns=['Kelompok Usia', 'Jumlah Kasus', 'Persentase Kasus Global (%)', 'Kenaikan Absolut (%)'])
+    return df_gender_age_count, df_male_increase, df_female_increase
 
 # Visualisasi
 def create_gender_age_stacked_bar_chart(df):
     """Membuat Normalized Stacked Bar Chart (Proporsi 100%)"""
-    
-    simple_age_order = ['<45 Tahun', '45-64 Tahun', '65-79 Tahun', '>=80 Tahun']
+
     color_scale = alt.Scale(domain=['Male', 'Female'], range=['#1f77b4', '#ff7f0e'])
 
     chart_bar = alt.Chart(df).mark_bar().encode(
@@ -86,11 +66,8 @@ def create_gender_age_stacked_bar_chart(df):
 
 # --- 3A. Chart Persentase Kasus Global per Gender ---
 def create_global_percentage_chart(df_male, df_female):
-    df_male['Jenis Kelamin'] = 'Male'
-    df_female['Jenis Kelamin'] = 'Female'
-    df_combined = pd.concat([df_male, df_female])
-    
-    simple_age_order = ['<45 Tahun', '45-64 Tahun', '65-79 Tahun', '>=80 Tahun']
+    df_combined = pd.concat([df_male.assign(**{'Jenis Kelamin': 'Male'}), df_female.assign(**{'Jenis Kelamin': 'Female'})])
+
     color_scale = alt.Scale(domain=['Male', 'Female'], range=['#1f77b4', '#ff7f0e'])
     
     chart = alt.Chart(df_combined).mark_line(point=True).encode(
@@ -110,9 +87,7 @@ def create_absolute_increase_chart(df_male, df_female):
     """Membuat Grouped Bar Chart Interaktif Plotly untuk Kenaikan Absolut Risiko per Gender."""
     
     # 1. Gabungkan data
-    df_combined = pd.concat([df_male, df_female])
-    
-    simple_age_order = ['<45 Tahun', '45-64 Tahun', '65-79 Tahun', '>=80 Tahun']
+    df_combined = pd.concat([df_male.assign(**{'Jenis Kelamin': 'Male'}), df_female.assign(**{'Jenis Kelamin': 'Female'})])
     
     # 2. Buat Plotly Chart
     fig = px.bar(
@@ -150,14 +125,20 @@ def create_absolute_increase_chart(df_male, df_female):
 def show_page():
     """Menampilkan konten lengkap Study Case 2: Gender vs. Usia."""
     
-    if df_full is None:
+    tables = page_result(__name__, compute_tables)
+    if tables is None:
         return
+    df_gender_age_count, df_male_increase, df_female_increase = tables
 
     st.header("Study Case 2: Perbandingan Risiko Serangan Jantung Berdasarkan Jenis Kelamin dan Kelompok Usia")
     st.markdown("---")
+
+    if df_gender_age_count.empty:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
     
     st.subheader("1. Proporsi Kasus Berdasarkan Gender dan Usia (Proporsi 100% per Kelompok Usia)")
-    st.altair_chart(create_gender_age_stacked_bar_chart(df_gender_age_count), use_container_width=True) 
+    render_chart(page_chart(__name__, create_gender_age_stacked_bar_chart, df_gender_age_count), use_container_width=True) 
 
     st.subheader("2. Analisis Kenaikan Absolut Risiko Antar Kelompok Usia")
     st.info("Tabel ini menunjukkan total kasus, persentase global, dan percepatan risiko per gender.")
@@ -174,8 +155,8 @@ def show_page():
 
     st.subheader("3. Tren Global dan Kenaikan Risiko per Gender")
 
-    st.altair_chart(create_global_percentage_chart(df_male_increase, df_female_increase), use_container_width=True)
-    st.plotly_chart(create_absolute_increase_chart(df_male_increase, df_female_increase), use_container_width=True)
+    render_chart(page_chart(__name__, create_global_percentage_chart, df_male_increase, df_female_increase), use_container_width=True)
+    render_chart(page_chart(__name__, create_absolute_increase_chart, df_male_increase, df_female_increase), use_container_width=True)
 
     st.subheader("4. Interpretasi dan Kesimpulan")
     st.markdown("""
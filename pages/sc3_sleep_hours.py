@@ -1,31 +1,19 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
-from data_loader import DF_FULL
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, show_significance
 
-df_full = DF_FULL
 
-if df_full is not None:
-    # --- 1. Hitung Total Populasi (Denominator) ---
-    df_pop = df_full.groupby('SleepHours', as_index=False)['HadHeartAttack'].count().rename(
-        columns={'HadHeartAttack': 'Total_Population'}
-    )
-
-    # --- 2. Hitung Kasus Serangan Jantung (Numerator) ---
-    df_cases = df_full[df_full['HadHeartAttack'] == 'Yes'].groupby('SleepHours', as_index=False)['HadHeartAttack'].count().rename(
-        columns={'HadHeartAttack': 'Case_Count'}
-    )
-
-    # --- 3. Gabungkan dan Hitung Rasio Insiden ---
-    df_risk = df_pop.merge(df_cases, on='SleepHours', how='left').fillna(0)
-    df_risk['Incidence_Ratio (%)'] = (df_risk['Case_Count'] / df_risk['Total_Population'] * 100).round(2)
-
-    # --- 4. Sortir Berdasarkan Durasi Tidur ---
-    df_risk = df_risk.sort_values(by='SleepHours')
-
-    df_sleep_risk = df_risk
-else:
-    df_sleep_risk = pd.DataFrame(columns=['SleepHours', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)'])
+def compute_tables(cube):
+    """Tabel risiko per durasi tidur dari kubus (sudah difilter oleh filter global)."""
+    # --- 1. Populasi, Kasus, dan Rasio Insiden dalam satu lintasan (lihat incidence.py) ---
+    # Hasil sudah terurut berdasarkan SleepHours
+    df_risk = cube.incidence(['SleepHours'])
+    df_risk = df_risk[['SleepHours', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)']]
+    df_risk['Incidence_Ratio (%)'] = df_risk['Incidence_Ratio (%)'].round(2)
+    # Interval kepercayaan Wilson 95% dari hitungan kelompok (lihat uncertainty.py)
+    return add_intervals(df_risk)
 
 
 # --- Fungsi Visualisasi 1: Jumlah Kasus Absolut ---
@@ -46,14 +34,22 @@ def create_case_line_chart(df):
 
 # --- Fungsi Visualisasi 2: Rasio Insiden ---
 def create_ratio_line_chart(df):
-    chart = (
+    x = alt.X('SleepHours:Q', title='Durasi Tidur (Jam)', scale=alt.Scale(domain=[1, 12]))
+    line = (
         alt.Chart(df)
         .mark_line(point=True, color='orange')
         .encode(
-            x=alt.X('SleepHours:Q', title='Durasi Tidur (Jam)', scale=alt.Scale(domain=[1, 12])),
+            x=x,
             y=alt.Y('Incidence_Ratio (%):Q', title='Rasio Insiden Serangan Jantung (%)'),
-            tooltip=['SleepHours', 'Incidence_Ratio (%)']
+            tooltip=['SleepHours', 'Incidence_Ratio (%)', 'CI_Low (%)', 'CI_High (%)']
         )
+    )
+    # Interval kepercayaan 95% per durasi tidur
+    band = alt.Chart(df).mark_errorband(color='orange', opacity=0.25).encode(
+        x=x, y='CI_Low (%):Q', y2='CI_High (%):Q'
+    )
+    chart = (
+        (band + line)
         .properties(title='Rasio Insiden Serangan Jantung Berdasarkan Durasi Tidur (Per 100 Individu)')
         .interactive()
     )
@@ -62,24 +58,30 @@ def create_ratio_line_chart(df):
 
 # --- Fungsi Utama Halaman ---
 def show_page():
-    if df_full is None:
+    df_sleep_risk = page_result(__name__, compute_tables)
+    if df_sleep_risk is None:
         return
 
     st.header("Study Case 3: Durasi Tidur per Malam vs. Risiko Serangan Jantung")
     st.markdown("---")
 
+    if df_sleep_risk['Case_Count'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
+
     # --- Visualisasi 1 ---
     st.subheader("1. Distribusi Kasus Absolut")
-    st.altair_chart(create_case_line_chart(df_sleep_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_case_line_chart, df_sleep_risk), use_container_width=True)
 
     # --- Visualisasi 2 ---
     st.subheader("2. Rasio Insiden (Normalized per Populasi)")
     st.info("Rasio Insiden dihitung sebagai: (Jumlah Kasus / Total Populasi) × 100")
-    st.altair_chart(create_ratio_line_chart(df_sleep_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_ratio_line_chart, df_sleep_risk), use_container_width=True)
 
     # --- Data Tabel ---
     st.subheader("3. Data Rinci Per Durasi Tidur")
     st.dataframe(df_sleep_risk, hide_index=True, use_container_width=True)
+    show_significance(df_sleep_risk, __name__)
 
     # --- Interpretasi & Kesimpulan ---
     st.subheader("4. Interpretasi dan Kesimpulan")
@@ -1,34 +1,24 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
-from data_loader import DF_FULL
-
-df_full = DF_FULL
-
-if df_full is not None:
-    # 1. Filter kasus serangan jantung ('HadHeartAttack' == 'Yes')
-    df_cases = df_full[df_full['HadHeartAttack'] == 'Yes'].copy()
-
-    # 2. Hitung jumlah kasus per kategori CovidPos
-    df_counts = df_cases.groupby('CovidPos', as_index=False)['HadHeartAttack'].count()
-    df_counts.rename(columns={'HadHeartAttack': 'Count of HadHeartAttack', 'CovidPos': 'Riwayat COVID-19'}, inplace=True)
-
-    # 3. Hitung total populasi per kategori CovidPos
-    df_total = df_full.groupby('CovidPos', as_index=False)['HadHeartAttack'].count()
-    df_total.rename(columns={'HadHeartAttack': 'Total Populasi', 'CovidPos': 'Riwayat COVID-19'}, inplace=True)
-
-    # 4. Gabungkan untuk menghitung Rasio Insiden (%)
-    df_merge = pd.merge(df_counts, df_total, on='Riwayat COVID-19', how='inner')
-    df_merge['Rasio Insiden'] = (df_merge['Count of HadHeartAttack'] / df_merge['Total Populasi'] * 100).astype(float)
-
-    # Urutan kategori
-    covid_order = ['No', 'Tested positive using home test without a health professional', 'Yes']
-    df_merge['Riwayat COVID-19'] = pd.Categorical(df_merge['Riwayat COVID-19'], categories=covid_order, ordered=True)
-    df_merge = df_merge.sort_values('Riwayat COVID-19')
-
-    df_covid_risk = df_merge
-else:
-    df_covid_risk = pd.DataFrame(columns=['Riwayat COVID-19', 'Count of HadHeartAttack', 'Total Populasi', 'Rasio Insiden'])
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, show_significance
+
+
+def compute_tables(cube):
+    """Tabel risiko per riwayat COVID-19 dari kubus (sudah difilter oleh filter global)."""
+    # 1. Hitung kasus, total populasi, dan Rasio Insiden (%) per kategori CovidPos
+    #    dalam satu lintasan; hasil terurut sesuai schema.COVID_ORDER
+    df_merge = add_intervals(cube.incidence(['CovidPos']))
+    df_merge = df_merge[df_merge['Case_Count'] > 0].rename(columns={
+        'CovidPos': 'Riwayat COVID-19',
+        'Case_Count': 'Count of HadHeartAttack',
+        'Total_Population': 'Total Populasi',
+        'Incidence_Ratio (%)': 'Rasio Insiden',
+        'CI_Low (%)': 'CI 95% Bawah',
+        'CI_High (%)': 'CI 95% Atas',
+    })
+    return df_merge[['Riwayat COVID-19', 'Count of HadHeartAttack', 'Total Populasi', 'Rasio Insiden', 'CI 95% Bawah', 'CI 95% Atas']]
 
 
 # ==== CHART UTAMA: BAR CHART JUMLAH KASUS ====
@@ -45,11 +35,16 @@ def create_bar_chart(df):
 
 # ==== CHART TAMBAHAN: RASIO INSIDEN (%) ====
 def create_ratio_chart(df):
-    chart = alt.Chart(df).mark_line(point=True, color='orange', strokeWidth=3).encode(
+    line = alt.Chart(df).mark_line(point=True, color='orange', strokeWidth=3).encode(
         x=alt.X('Riwayat COVID-19:N', title='Riwayat COVID-19'),
         y=alt.Y('Rasio Insiden:Q', title='Rasio Insiden Serangan Jantung (%)'),
-        tooltip=['Riwayat COVID-19', alt.Tooltip('Rasio Insiden:Q', format='.2f')]
-    ).properties(
+        tooltip=['Riwayat COVID-19', alt.Tooltip('Rasio Insiden:Q', format='.2f'), 'CI 95% Bawah', 'CI 95% Atas']
+    )
+    # Interval kepercayaan 95% per kategori
+    error_bars = alt.Chart(df).mark_errorbar(color='black', ticks=True).encode(
+        x='Riwayat COVID-19:N', y='CI 95% Bawah:Q', y2='CI 95% Atas:Q'
+    )
+    chart = (line + error_bars).properties(
         title='Rasio Insiden Serangan Jantung Berdasarkan Riwayat COVID-19 (%)'
     ).interactive()
     return chart
@@ -57,23 +52,29 @@ def create_ratio_chart(df):
 
 # ==== TAMPILAN STREAMLIT ====
 def show_page():
-    if df_full is None:
+    df_covid_risk = page_result(__name__, compute_tables)
+    if df_covid_risk is None:
         return
 
     st.header("Study Case 4: Infeksi COVID-19 vs. Risiko Serangan Jantung")
     st.markdown("---")
 
+    if df_covid_risk.empty:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
+
     # === Bar Chart Kasus Absolut ===
     st.subheader("1. Distribusi Kasus Serangan Jantung (Absolut)")
-    st.altair_chart(create_bar_chart(df_covid_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_bar_chart, df_covid_risk), use_container_width=True)
 
     # === Chart Rasio Insiden ===
     st.subheader("2. Rasio Insiden Serangan Jantung (%)")
-    st.altair_chart(create_ratio_chart(df_covid_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_ratio_chart, df_covid_risk), use_container_width=True)
 
     # === Dataframe Detail ===
     st.subheader("3. Data Rinci")
     st.dataframe(df_covid_risk, hide_index=True)
+    show_significance(df_covid_risk, __name__, cases='Count of HadHeartAttack', population='Total Populasi')
 
     # === Interpretasi ===
     st.subheader("4. Interpretasi dan Kesimpulan")
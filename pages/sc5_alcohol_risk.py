@@ -1,36 +1,18 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
-import os
-
-try:
-    from data_loader import DF_FULL
-except ImportError:
-    st.error("Gagal mengimpor DF_FULL. Pastikan file data_loader.py sudah dibuat.")
-    DF_FULL = None
-
-# Fungsi pengelompokan SmokerStatus yang disederhanakan
-def simplify_smoker_status(status):
-    if 'Current' in status:
-        return 'Current Smoker'
-    elif 'Former' in status:
-        return 'Former Smoker'
-    elif 'Never' in status:
-        return 'Never Smoked'
-    return status
-
-if DF_FULL is not None:
-    df_temp = DF_FULL.copy()
-    df_temp['SmokerStatusSimple'] = df_temp['SmokerStatus'].apply(simplify_smoker_status)
-
-    # Hitung total populasi dan kasus serangan jantung
-    df_pop = df_temp.groupby(['AlcoholDrinkers', 'SmokerStatusSimple'], as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Total_Population'})
-    df_cases = df_temp[df_temp['HadHeartAttack'] == 'Yes'].groupby(['AlcoholDrinkers', 'SmokerStatusSimple'], as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Case_Count'})
-    df_risk = df_pop.merge(df_cases, on=['AlcoholDrinkers', 'SmokerStatusSimple'], how='left').fillna(0)
-    df_risk['Incidence_Ratio (%)'] = (df_risk['Case_Count'] / df_risk['Total_Population'] * 100).round(2)
-    df_alcohol_risk = df_risk
-else:
-    df_alcohol_risk = pd.DataFrame(columns=['AlcoholDrinkers', 'SmokerStatusSimple', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)'])
+from schema import SMOKER_SIMPLE_ORDER
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, show_significance
+
+def compute_tables(cube):
+    """Tabel risiko alkohol x status merokok dari kubus (sudah difilter oleh filter global)."""
+    # Hitung total populasi, kasus serangan jantung, dan rasio insiden per AlcoholDrinkers x
+    # status merokok yang disederhanakan (dimensi turunan SmokerStatusSimple, lihat schema.DERIVED_DIMENSIONS)
+    df_risk = cube.incidence(['AlcoholDrinkers', 'SmokerStatusSimple'])
+    df_risk = df_risk[['AlcoholDrinkers', 'SmokerStatusSimple', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)']]
+    df_risk['Incidence_Ratio (%)'] = df_risk['Incidence_Ratio (%)'].round(2)
+    return add_intervals(df_risk)
 
 def create_bubble_chart(df):
     color_scale = alt.Scale(scheme='orangered')
@@ -38,11 +20,11 @@ def create_bubble_chart(df):
         alt.Chart(df)
         .mark_circle(opacity=0.8)
         .encode(
-            x=alt.X('SmokerStatusSimple:N', title='Status Merokok', sort=['Never Smoked', 'Former Smoker', 'Current Smoker']),
+            x=alt.X('SmokerStatusSimple:N', title='Status Merokok', sort=SMOKER_SIMPLE_ORDER),
             y=alt.Y('AlcoholDrinkers:N', title='Konsumsi Alkohol'),
             size=alt.Size('Incidence_Ratio (%):Q', title='Rasio Serangan Jantung (%)', scale=alt.Scale(range=[100, 2000])),
             color=alt.Color('Incidence_Ratio (%):Q', scale=color_scale, legend=alt.Legend(title='Rasio Serangan Jantung (%)')),
-            tooltip=['SmokerStatusSimple', 'AlcoholDrinkers', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)']
+            tooltip=['SmokerStatusSimple', 'AlcoholDrinkers', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)', 'CI_Low (%)', 'CI_High (%)']
         )
         .properties(
             title="Interaksi Merokok dan Konsumsi Alkohol terhadap Risiko Serangan Jantung",
@@ -53,25 +35,52 @@ def create_bubble_chart(df):
     )
     return bubble
 
+def create_interval_chart(df):
+    """Rasio insiden per status merokok dengan interval kepercayaan 95%, satu panel per status konsumsi alkohol."""
+    points = alt.Chart().mark_point(filled=True, size=90).encode(
+        x=alt.X('SmokerStatusSimple:N', title='Status Merokok', sort=SMOKER_SIMPLE_ORDER),
+        y=alt.Y('Incidence_Ratio (%):Q', title='Rasio Serangan Jantung (%)'),
+        color=alt.Color('AlcoholDrinkers:N', title='Konsumsi Alkohol'),
+        tooltip=['SmokerStatusSimple', 'AlcoholDrinkers', 'Incidence_Ratio (%)', 'CI_Low (%)', 'CI_High (%)']
+    )
+    error_bars = alt.Chart().mark_errorbar(color='black', ticks=True).encode(
+        x=alt.X('SmokerStatusSimple:N', sort=SMOKER_SIMPLE_ORDER),
+        y=alt.Y('CI_Low (%):Q', title='Rasio Serangan Jantung (%)'), y2='CI_High (%):Q'
+    )
+    return alt.layer(error_bars, points, data=df).properties(width=300, height=300).facet(
+        column=alt.Column('AlcoholDrinkers:N', title='Konsumsi Alkohol')
+    ).properties(title='Rasio Serangan Jantung dengan Interval Kepercayaan 95%')
+
 def show_page():
-    if DF_FULL is None:
+    df_alcohol_risk = page_result(__name__, compute_tables)
+    if df_alcohol_risk is None:
         return
 
     st.header("Study Case 5: Interaksi Merokok, Alkohol, dan Risiko Serangan Jantung")
     st.markdown("---")
 
+    if df_alcohol_risk['Case_Count'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
+
     # 1️ Visualisasi Bubble Chart
     st.subheader("1. Visualisasi Bubble Chart")
     st.info("Bubble Chart ini menggambarkan hubungan antara status merokok, kebiasaan konsumsi alkohol, dan rasio kejadian serangan jantung. Ukuran dan warna gelembung mewakili tingkat risiko yang lebih tinggi.")
-    st.altair_chart(create_bubble_chart(df_alcohol_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_bubble_chart, df_alcohol_risk), use_container_width=True)
+
+    # 2️ Rasio dengan interval kepercayaan
+    st.subheader("2. Rasio Insiden dengan Interval Kepercayaan 95%")
+    st.info("Titik adalah rasio insiden setiap kelompok dan garis vertikal adalah interval kepercayaan Wilson 95%-nya. Interval yang tidak saling tumpang tindih menunjukkan perbedaan yang kemungkinan bukan kebetulan sampel.")
+    render_chart(page_chart(__name__, create_interval_chart, df_alcohol_risk), use_container_width=True)
 
-    # 2️ Data Ringkasan
-    st.subheader("2. Data Ringkasan Rasio Risiko")
+    # 3️ Data Ringkasan
+    st.subheader("3. Data Ringkasan Rasio Risiko")
     st.info("Rasio Insiden dihitung sebagai: (Kasus Serangan Jantung / Total Populasi) × 100.")
     st.dataframe(df_alcohol_risk, hide_index=True, use_container_width=True)
+    show_significance(df_alcohol_risk, __name__)
 
-    # 3️ Kesimpulan dan Analisis
-    st.subheader("3. Interpretasi dan Kesimpulan")
+    # 4️ Kesimpulan dan Analisis
+    st.subheader("4. Interpretasi dan Kesimpulan")
     st.markdown("""
         ### **Analisis Interaksi Risiko**
         Berdasarkan tabel dan visualisasi di atas, dapat diamati beberapa pola penting mengenai hubungan antara **kebiasaan merokok**, **konsumsi alkohol**, dan **risiko serangan jantung**:
@@ -1,40 +1,39 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px # <<< Import Plotly Express
-import altair as alt # Tetap dipertahankan jika dibutuhkan library lain
+from schema import SMOKER_ORDER
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, show_significance
 
-try:
-    from data_loader import DF_FULL
-except ImportError:
-    st.error("Gagal mengimpor DF_FULL. Pastikan file data_loader.py sudah dibuat.")
-    DF_FULL = None
-
-if DF_FULL is not None:
-    # 1. Hitung Total Populasi (Denominator)
-    df_pop = DF_FULL.groupby(['SmokerStatus', 'ECigaretteUsage'], as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Total_Population'})
-
-    # 2. Hitung Kasus Serangan Jantung (Numerator)
-    df_cases = DF_FULL[DF_FULL['HadHeartAttack'] == 'Yes'].groupby(['SmokerStatus', 'ECigaretteUsage'], as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Case_Count'})
-
-    # 3. Gabungkan dan Hitung Rasio Insiden
-    df_risk = df_pop.merge(df_cases, on=['SmokerStatus', 'ECigaretteUsage'], how='left').fillna(0)
-    df_risk['Incidence_Ratio (%)'] = (df_risk['Case_Count'] / df_risk['Total_Population'] * 100).round(2)
+def compute_tables(cube):
+    """Tabel risiko rokok x vape dari kubus (sudah difilter oleh filter global)."""
+    # 1. Hitung Total Populasi, Kasus, dan Rasio Insiden dalam satu lintasan
+    df_risk = cube.incidence(['SmokerStatus', 'ECigaretteUsage'])
+    df_risk = df_risk[['SmokerStatus', 'ECigaretteUsage', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)']]
+    df_risk['Incidence_Ratio (%)'] = df_risk['Incidence_Ratio (%)'].round(2)
     
-    df_smoking_risk = df_risk
-else:
-    df_smoking_risk = pd.DataFrame(columns=['SmokerStatus', 'ECigaretteUsage', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)'])
+    # 2. Interval kepercayaan Wilson 95% per kombinasi
+    return add_intervals(df_risk)
 
 def create_grouped_bar_chart_plotly(df):
     """Membuat Grouped Bar Chart Interaktif menggunakan Plotly Express."""
     
     # 1. Definisikan Urutan (untuk Sumbu X)
-    smoker_order = ['Never smoked', 'Former smoker', 'Current smoker - now smokes some days', 'Current smoker - now smokes every day']
+    smoker_order = SMOKER_ORDER
 
-    # 2. Buat Plotly Chart
+    # 2. Panjang error bar (interval kepercayaan 95%) relatif terhadap rasio
+    df = df.assign(
+        CI_Plus=df['CI_High (%)'] - df['Incidence_Ratio (%)'],
+        CI_Minus=df['Incidence_Ratio (%)'] - df['CI_Low (%)'],
+    )
+
+    # 3. Buat Plotly Chart
     fig = px.bar(
         df,
         x='SmokerStatus', 
         y='Incidence_Ratio (%)', 
+        error_y='CI_Plus',
+        error_y_minus='CI_Minus',
         color='ECigaretteUsage', # Variabel untuk mengelompokkan
         barmode='group',        # Mode grouping (batang berdampingan)
         text_auto='.2f',        # Menambahkan label teks di atas batang (otomatis Plotly)
@@ -46,7 +45,7 @@ def create_grouped_bar_chart_plotly(df):
         title="Rasio Insiden Serangan Jantung: Merokok Tradisional vs Penggunaan Vape/E-Cig"
     )
 
-    # 3. Perbaiki Layout (Opsional: Membuat visual lebih rapi)
+    # 4. Perbaiki Layout (Opsional: Membuat visual lebih rapi)
     fig.update_traces(textposition='outside')
     fig.update_layout(xaxis_title="Status Merokok Tradisional", 
                       yaxis_title="Rasio Insiden Serangan Jantung (%)",
@@ -59,21 +58,27 @@ def create_grouped_bar_chart_plotly(df):
 def show_page():
     """Menampilkan konten lengkap Study Case 6."""
     
-    if DF_FULL is None:
+    df_smoking_risk = page_result(__name__, compute_tables)
+    if df_smoking_risk is None:
         return
 
     st.header("Study Case 6: Merokok Tradisional vs. Penggunaan Vape/E-Cigarette (Rasio Insiden)")
     st.markdown("---")
+
+    if df_smoking_risk['Case_Count'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
     
     # 1. Visualisasi (Plotly)
     st.subheader("1. Bagan Kolom Berkelompok Interaktif (Plotly Express)")
     st.info("Visualisasi ini membandingkan Rasio Insiden (Risiko Relatif) per kategori kebiasaan merokok dan penggunaan vape.")
-    st.plotly_chart(create_grouped_bar_chart_plotly(df_smoking_risk), use_container_width=True) # <<< Menggunakan st.plotly_chart
+    render_chart(page_chart(__name__, create_grouped_bar_chart_plotly, df_smoking_risk), use_container_width=True)
 
     # 2. Data Rinci
     st.subheader("2. Data Rinci Rasio Insiden")
     st.info("Rasio Insiden dihitung sebagai: (Kasus Serangan Jantung / Total Populasi) * 100")
     st.dataframe(df_smoking_risk, hide_index=True, use_container_width=True)
+    show_significance(df_smoking_risk, __name__)
     
     # 3. Interpretasi dan Penjelasan Detail
     st.subheader("3. Interpretasi dan Kesimpulan")
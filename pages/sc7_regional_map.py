@@ -1,13 +1,19 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import altair as alt
+import plotly.express as px
+from diagnostics import fragment
+from incidence import decode_levels
 
 try:
-    from data_loader import DF_FULL
-except ImportError:
-    st.error("Gagal mengimpor DF_FULL. Pastikan file data_loader.py sudah dibuat.")
-    DF_FULL = None
+    from charts import render_chart
+    from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+    from uncertainty import Z_95, add_intervals
+    from us_states import load_us_states
+except ImportError as e:
+    st.error(f"Gagal mengimpor modul pendukung peta regional: {e}")
+    page_result = None
 
 # Fungsi Mapping Negara Bagian (tetap sama)
 STATE_ABBREV_MAPPING = {
@@ -21,44 +27,106 @@ STATE_ABBREV_MAPPING = {
     'Oklahoma': 'OK', 'Oregon': 'OR', 'Pennsylvania': 'PA', 'Rhode Island': 'RI', 'South Carolina': 'SC',
     'South Dakota': 'SD', 'Tennessee': 'TN', 'Texas': 'TX', 'Utah': 'UT', 'Vermont': 'VT',
     'Virginia': 'VA', 'Washington': 'WA', 'West Virginia': 'WV', 'Wisconsin': 'WI', 'Wyoming': 'WY',
-    # Wilayah yang tidak memiliki singkatan Plotly
+    # Wilayah di luar 50 negara bagian (geometrinya ada di assets/us_states.geojson)
     'District of Columbia': 'DC', 'Puerto Rico': 'PR', 'Guam': 'GU', 'Virgin Islands': 'VI' 
 }
 
 
-if DF_FULL is not None:
-    # 1. Hitung Jumlah Kasus Serangan Jantung per Negara Bagian
-    df_cases = DF_FULL[DF_FULL['HadHeartAttack'] == 'Yes'].copy()
-    df_counts = df_cases.groupby('State', as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Count_of_HadHeartAttack'})
+# Ukuran yang dapat ditampilkan peta: label -> (kolom tabel, judul skala warna, judul peta)
+MAP_METRICS = {
+    'Beban kasus (absolut)': (
+        'Count_of_HadHeartAttack', 'Kasus', 'Peta Beban Kasus Serangan Jantung Absolut per Negara Bagian'),
+    'Rasio insiden kasar (%)': (
+        'Rasio_Kasar (%)', 'Rasio Kasar (%)', 'Peta Rasio Insiden Kasar Serangan Jantung per Negara Bagian'),
+    'Rasio insiden terstandar usia (%)': (
+        'Rasio_Terstandar_Usia (%)', 'Rasio Terstandar (%)', 'Peta Rasio Insiden Serangan Jantung Terstandar Usia per Negara Bagian'),
+}
+
+
+def standardized_rates(population, cases, weights):
+    """
+    Rasio insiden terstandar usia (standardisasi langsung, dalam %) dan galat
+    bakunya untuk setiap baris matriks hitungan negara bagian x kelompok usia.
+    Strata usia tanpa responden di suatu negara bagian dikeluarkan dan bobot
+    sisanya dinormalisasi ulang.
+    """
+    observed = population > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = np.where(observed, cases / np.where(observed, population, 1), 0.0)
+        variances = np.where(observed, rates * (1 - rates) / np.where(observed, population, 1), 0.0)
+        covered = observed @ weights
+        standardized = rates @ weights / covered
+        standard_error = np.sqrt(variances @ weights ** 2) / covered
+    return standardized * 100, standard_error * 100
+
 
-    # 2. Tambahkan kolom singkatan negara bagian
+def compute_tables(cube):
+    """Tabel beban kasus dan rasio insiden per negara bagian dari kubus (sudah difilter oleh filter global)."""
+    # 1. Matriks hitungan Negara Bagian x Kelompok Usia dari satu roll-up kubus
+    states, ages = cube.levels('State'), cube.levels('AgeCategory')
+    _, population, cases = cube.rollup(['State', 'AgeCategory'])
+    population = population.reshape(len(states), len(ages))
+    cases = cases.reshape(len(states), len(ages))
+
+    df_counts = pd.DataFrame({
+        'State': decode_levels(np.arange(len(states)), states, cube.dimensions['State'][1]),
+        'Count_of_HadHeartAttack': cases.sum(axis=1),
+        'Total_Population': population.sum(axis=1),
+    })
+
+    # 2. Standardisasi usia langsung: populasi standar = distribusi AgeCategory
+    #    seluruh segmen, diterapkan ke semua negara bagian dalam satu perkalian matriks-vektor
+    total_population = population.sum()
+    weights = population.sum(axis=0) / total_population if total_population else np.zeros(len(ages))
+    standardized, standard_error = standardized_rates(population, cases, weights)
+    df_counts['Rasio_Terstandar_Usia (%)'] = np.round(standardized, 2)
+    df_counts['Std_CI_Low (%)'] = np.round(np.clip(standardized - Z_95 * standard_error, 0, None), 2)
+    df_counts['Std_CI_High (%)'] = np.round(standardized + Z_95 * standard_error, 2)
+    df_counts = df_counts[df_counts['Count_of_HadHeartAttack'] > 0].copy()
+
+    # 3. Tambahkan kolom singkatan negara bagian
     df_counts['State_Code'] = df_counts['State'].map(STATE_ABBREV_MAPPING)
     
-    # 3. Hitung Persentase Kontribusi Global
-    total_grand = df_counts['Count_of_HadHeartAttack'].sum()
-    df_counts['Kontribusi (%)'] = (df_counts['Count_of_HadHeartAttack'] / total_grand * 100).round(2)
-
-
-    # 4. Urutkan berdasarkan kasus absolut tertinggi
-    df_regional_cases = df_counts.sort_values(by='Count_of_HadHeartAttack', ascending=False)
-else:
-    df_regional_cases = pd.DataFrame(columns=['State', 'Count_of_HadHeartAttack', 'State_Code', 'Kontribusi (%)'])
-
-def create_plotly_map(df):
-    """Membuat Peta Choropleth (Heatmap) Interaktif dengan Plotly."""
-    df_map = df[~df['State_Code'].isin(['DC', 'PR', 'GU', 'VI'])].copy()
-
-    fig = px.choropleth(df_map, 
-                        locations='State_Code',
-                        locationmode='USA-states',
-                        scope='usa',
-                        color='Count_of_HadHeartAttack',
-                        color_continuous_scale=px.colors.sequential.Sunset,
-                        hover_name='State',
-                        hover_data={'State_Code': False, 'Count_of_HadHeartAttack': True}
-    )
-    fig.update_layout(title_text='Peta Beban Kasus Serangan Jantung Absolut per Negara Bagian', geo_scope='usa')
-    return fig
+    # 4. Persentase Kontribusi Global = kasus negara bagian / total kasus
+    df_counts['Kontribusi (%)'] = (df_counts['Count_of_HadHeartAttack'] / df_counts['Count_of_HadHeartAttack'].sum() * 100).round(2)
+
+    # 5. Rasio insiden kasar (kasus / populasi negara bagian) dan interval Wilson
+    df_counts['Rasio_Kasar (%)'] = (df_counts['Count_of_HadHeartAttack'] / df_counts['Total_Population'] * 100).round(2)
+    df_counts = add_intervals(df_counts, cases='Count_of_HadHeartAttack')
+
+    # 6. Urutkan berdasarkan kasus absolut tertinggi
+    columns = [
+        'State', 'Count_of_HadHeartAttack', 'State_Code', 'Kontribusi (%)', 'Total_Population',
+        'Rasio_Kasar (%)', 'CI_Low (%)', 'CI_High (%)',
+        'Rasio_Terstandar_Usia (%)', 'Std_CI_Low (%)', 'Std_CI_High (%)',
+    ]
+    return df_counts[columns].sort_values(by='Count_of_HadHeartAttack', ascending=False)
+
+def create_choropleth_map(df, metric='Beban kasus (absolut)'):
+    """
+    Peta choropleth (Vega-Lite geoshape) dari geometri lokal (us_states): baris
+    tabel mengambil bentuk negara bagiannya lewat lookup ke GeoJSON yang
+    di-inline di spesifikasi, dengan proyeksi albersUsa bawaan Vega. Tidak ada
+    peta dasar maupun topojson yang diambil dari CDN.
+    """
+    geojson, off_map = load_us_states()
+    df_map = df[~df['State_Code'].isin(off_map)]
+    column, color_title, title = MAP_METRICS[metric]
+
+    return alt.Chart(df_map).mark_geoshape(stroke='white', strokeWidth=0.5).transform_lookup(
+        lookup='State_Code',
+        from_=alt.LookupData(data=alt.InlineData(values=geojson['features']), key='id'),
+        as_='geo'
+    ).encode(
+        shape='geo:G',
+        color=alt.Color(f'{column}:Q', title=color_title, scale=alt.Scale(scheme='orangered')),
+        tooltip=[
+            alt.Tooltip('State:N', title='Negara Bagian'),
+            alt.Tooltip('Count_of_HadHeartAttack:Q', title='Kasus', format=','),
+            alt.Tooltip('Rasio_Kasar (%):Q', title='Rasio Kasar (%)'),
+            alt.Tooltip('Rasio_Terstandar_Usia (%):Q', title='Rasio Terstandar (%)'),
+        ]
+    ).project(type='albersUsa').properties(title=title, height=450)
 
 def create_top10_pie_chart(df):
     """Membuat Pie Chart untuk 10 Negara Bagian Penyumbang Kasus Terbesar."""
@@ -86,18 +154,63 @@ def create_top10_pie_chart(df):
     fig.update_traces(textposition='inside', textinfo='percent+label')
     return fig
 
+def create_top10_bar_chart(df):
+    """Membuat Bar Chart horizontal untuk 10 Negara Bagian dengan kasus absolut terbanyak."""
+    df_top_10_bar = df.head(10).sort_values(by='Count_of_HadHeartAttack', ascending=True)
+    
+    fig_bar = px.bar(df_top_10_bar, 
+                     x='Count_of_HadHeartAttack', # X adalah Count
+                     y='State', # Y adalah Negara Bagian
+                     orientation='h', # Bar horizontal
+                     title="Top 10 Beban Kasus Absolut",
+                     text='Count_of_HadHeartAttack',
+                     color_discrete_sequence=px.colors.qualitative.Bold)
+    fig_bar.update_traces(textposition='outside')
+    return fig_bar
+
+# Peta beserta pilihan ukurannya: berganti ukuran hanya merender ulang bagian ini
+@fragment
+def render_map(df_regional_cases):
+    metric = st.radio("Ukuran pada peta:", list(MAP_METRICS), horizontal=True, key='regional_map_metric')
+    us_states = load_us_states()
+    if us_states is None:
+        st.error("File geometri assets/us_states.geojson tidak ditemukan. Jalankan build_geometry.py terlebih dahulu.")
+    else:
+        # Ketiga ukuran sudah ada di tabel halaman; berganti ukuran hanya memilih kolom warna
+        render_chart(page_chart(__name__, create_choropleth_map, df_regional_cases, metric=metric), use_container_width=True)
+        if metric != 'Beban kasus (absolut)':
+            st.caption(
+                "Rasio terstandar usia: rasio insiden per kelompok usia setiap negara bagian dibobot dengan "
+                "distribusi AgeCategory seluruh responden dalam filter (standardisasi langsung), sehingga "
+                "perbedaan komposisi usia antar negara bagian tidak memengaruhi perbandingan."
+            )
+
+        # Wilayah di luar proyeksi peta (mis. Puerto Rico, Guam) ditampilkan terpisah
+        df_off_map = df_regional_cases[df_regional_cases['State_Code'].isin(us_states[1])]
+        if not df_off_map.empty:
+            st.caption("Wilayah di luar peta: " + ", ".join(
+                f"{row.State} ({row.Count_of_HadHeartAttack:,} kasus)" for row in df_off_map.itertuples()
+            ))
+
 def show_page():
     """Menampilkan konten lengkap Study Case 7."""
     
-    if DF_FULL is None:
+    if page_result is None:
+        return
+    df_regional_cases = page_result(__name__, compute_tables)
+    if df_regional_cases is None:
         return
 
     st.header("Study Case 7: Pemetaan Beban Kasus Serangan Jantung Regional")
     st.markdown("---")
+
+    if df_regional_cases.empty:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
     
-    # 1. Visualisasi Peta Choropleth (Plotly)
-    st.subheader("1. Peta Interaktif Beban Kasus Absolut")
-    st.plotly_chart(create_plotly_map(df_regional_cases), use_container_width=True) 
+    # 1. Visualisasi Peta Choropleth
+    st.subheader("1. Peta Interaktif Beban Kasus dan Rasio Insiden")
+    render_map(df_regional_cases)
 
     # 2. Visualisasi Pie Chart & Top 10 Bar
     st.subheader("2. Kontribusi Kasus Terbesar")
@@ -106,26 +219,16 @@ def show_page():
 
     with col_pie:
         st.caption("Diagram Donut: Kontribusi Persentase (Total Kasus)")
-        st.plotly_chart(create_top10_pie_chart(df_regional_cases), use_container_width=True)
+        render_chart(page_chart(__name__, create_top10_pie_chart, df_regional_cases), use_container_width=True)
 
     with col_bar:
         st.caption("Top 10 Beban Kasus Absolut (Angka)")
-        df_top_10_bar = df_regional_cases.head(10).sort_values(by='Count_of_HadHeartAttack', ascending=True)
-        
-        fig_bar = px.bar(df_top_10_bar, 
-                         x='Count_of_HadHeartAttack', # X adalah Count
-                         y='State', # Y adalah Negara Bagian
-                         orientation='h', # Bar horizontal
-                         title="Top 10 Beban Kasus Absolut",
-                         text='Count_of_HadHeartAttack',
-                         color_discrete_sequence=px.colors.qualitative.Bold)
-        fig_bar.update_traces(textposition='outside')
-        st.plotly_chart(fig_bar, use_container_width=True)
+        render_chart(page_chart(__name__, create_top10_bar_chart, df_regional_cases), use_container_width=True)
 
 
     # 3. Data Rinci
     st.subheader("3. Data Rinci Kasus Regional")
-    st.dataframe(df_regional_cases[['State', 'Count_of_HadHeartAttack', 'Kontribusi (%)']], hide_index=True, use_container_width=True)
+    st.dataframe(df_regional_cases.drop(columns=['State_Code']), hide_index=True, use_container_width=True)
     
     # 4. Interpretasi dan Penjelasan Detail
     st.subheader("4. Interpretasi dan Kesimpulan")
@@ -164,5 +267,5 @@ def show_page():
 
         - Peta dan diagram menunjukkan bahwa **beban absolut kasus serangan jantung tidak merata antar wilayah AS**, dengan konsentrasi di beberapa negara bagian besar seperti **Texas, Florida, dan Ohio**.  
         - Visualisasi ini berguna untuk **prioritas sumber daya kesehatan masyarakat** di wilayah dengan beban tinggi.  
-        - Namun, untuk memahami **risiko sebenarnya**, diperlukan analisis tambahan menggunakan **rasio insiden per kapita atau tingkat prevalensi per 100.000 penduduk.**
+        - Namun, untuk memahami **risiko sebenarnya**, gunakan pilihan **rasio insiden kasar** atau **rasio insiden terstandar usia** pada peta: keduanya membagi kasus dengan jumlah responden, dan rasio terstandar juga menyamakan komposisi usia antar negara bagian.
     """)
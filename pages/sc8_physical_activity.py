@@ -1,39 +1,35 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, show_significance
 
-try:
-    from data_loader import DF_FULL
-except ImportError:
-    st.error("Gagal mengimpor DF_FULL. Pastikan file data_loader.py sudah dibuat.")
-    DF_FULL = None
-
-if DF_FULL is not None:
-    # 1. Hitung Total Populasi (Denominator)
-    df_pop = DF_FULL.groupby('PhysicalActivities', as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Total_Population'})
-
-    # 2. Hitung Kasus Serangan Jantung (Numerator)
-    df_cases = DF_FULL[DF_FULL['HadHeartAttack'] == 'Yes'].groupby('PhysicalActivities', as_index=False)['HadHeartAttack'].count().rename(columns={'HadHeartAttack': 'Case_Count'})
-
-    # 3. Gabungkan dan Hitung Rasio Insiden
-    df_risk = df_pop.merge(df_cases, on='PhysicalActivities', how='left').fillna(0)
+def compute_tables(cube):
+    """Tabel risiko per aktivitas fisik dari kubus (sudah difilter oleh filter global)."""
+    # 1. Hitung Total Populasi dan Kasus Serangan Jantung dalam satu lintasan
+    df_risk = cube.incidence(['PhysicalActivities'])
+    df_risk = df_risk[['PhysicalActivities', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)']]
     
     # Rasio Insiden: (Kasus / Total Populasi) * 100
-    df_risk['Incidence_Ratio (%)'] = (df_risk['Case_Count'] / df_risk['Total_Population'] * 100).round(2)
+    df_risk['Incidence_Ratio (%)'] = df_risk['Incidence_Ratio (%)'].round(2)
     
-    df_activity_risk = df_risk
-else:
-    df_activity_risk = pd.DataFrame(columns=['PhysicalActivities', 'Total_Population', 'Case_Count', 'Incidence_Ratio (%)'])
+    # Interval kepercayaan Wilson 95%
+    return add_intervals(df_risk)
 
 def create_ratio_bar_chart(df):
     """Membuat Bar Chart untuk Rasio Insiden."""
     
-    chart = alt.Chart(df).mark_bar().encode(
+    bars = alt.Chart(df).mark_bar().encode(
         x=alt.X('PhysicalActivities:N', sort=['No', 'Yes'], title='Aktif Secara Fisik'),
         y=alt.Y('Incidence_Ratio (%):Q', title='Rasio Insiden Serangan Jantung (%)'),
         color=alt.Color('PhysicalActivities:N'),
-        tooltip=['PhysicalActivities', 'Total_Population', 'Case_Count', alt.Tooltip('Incidence_Ratio (%)', format='.2f')]
-    ).properties(
+        tooltip=['PhysicalActivities', 'Total_Population', 'Case_Count', alt.Tooltip('Incidence_Ratio (%)', format='.2f'), 'CI_Low (%)', 'CI_High (%)']
+    )
+    # Interval kepercayaan 95% di atas setiap batang
+    error_bars = alt.Chart(df).mark_errorbar(color='black', ticks=True).encode(
+        x=alt.X('PhysicalActivities:N', sort=['No', 'Yes']), y='CI_Low (%):Q', y2='CI_High (%):Q'
+    )
+    chart = (bars + error_bars).properties(
         title='Perbandingan Rasio Insiden Serangan Jantung Berdasarkan Aktivitas Fisik'
     ).interactive()
     
@@ -42,19 +38,25 @@ def create_ratio_bar_chart(df):
 def show_page():
     """Menampilkan konten lengkap Study Case 8."""
     
-    if DF_FULL is None:
+    df_activity_risk = page_result(__name__, compute_tables)
+    if df_activity_risk is None:
         return
 
     st.header("Study Case 8: Aktivitas Fisik vs. Risiko Serangan Jantung")
     st.markdown("---")
+
+    if df_activity_risk['Case_Count'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
     
     # 1. Visualisasi Rasio Insiden
     st.subheader("1. Rasio Insiden (Risiko Relatif) per Kelompok Populasi")
-    st.altair_chart(create_ratio_bar_chart(df_activity_risk), use_container_width=True) 
+    render_chart(page_chart(__name__, create_ratio_bar_chart, df_activity_risk), use_container_width=True) 
 
     # 2. Data Rinci
     st.subheader("2. Data Rinci Rasio Insiden")
     st.dataframe(df_activity_risk, hide_index=True)
+    show_significance(df_activity_risk, __name__)
     
     # 3. Interpretasi dan Penjelasan Detail
     st.subheader("3. Interpretasi dan Kesimpulan")
@@ -1,61 +1,30 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
-
-try:
-    from data_loader import DF_FULL
-except ImportError:
-    st.error("Gagal mengimpor DF_FULL. Pastikan file data_loader.py sudah dibuat.")
-    DF_FULL = None
-
-# === Fungsi untuk menyederhanakan kategori usia (jika dibutuhkan nanti) ===
-def simplify_age(age_category):
-    if age_category in ['Age 18 to 24', 'Age 25 to 29', 'Age 30 to 34', 'Age 35 to 39', 'Age 40 to 44']:
-        return '<45 Tahun'
-    elif age_category in ['Age 45 to 49', 'Age 50 to 54', 'Age 55 to 59', 'Age 60 to 64']:
-        return '45-64 Tahun'
-    elif age_category in ['Age 65 to 69', 'Age 70 to 74', 'Age 75 to 79']:
-        return '65-79 Tahun'
-    elif age_category == 'Age 80 or older':
-        return '>=80 Tahun'
-    return age_category
-
+from schema import DIABETES_ORDER
+from charts import render_chart
+from cross_filter import EMPTY_SEGMENT_MESSAGE, page_chart, page_result
+from uncertainty import add_intervals, group_relative_risk, show_significance
 
 # === Proses data ===
-if DF_FULL is not None:
-    # 1. Total populasi per kategori diabetes
-    df_pop = DF_FULL.groupby('HadDiabetes', as_index=False)['HadHeartAttack'].count().rename(
-        columns={'HadHeartAttack': 'Total_Population'}
-    )
-
-    # 2. Kasus serangan jantung
-    df_cases = DF_FULL[DF_FULL['HadHeartAttack'] == 'Yes'].groupby('HadDiabetes', as_index=False)['HadHeartAttack'].count().rename(
-        columns={'HadHeartAttack': 'Case_Count'}
-    )
-
-    # 3. Gabungkan
-    df_risk = df_pop.merge(df_cases, on='HadDiabetes', how='left').fillna(0)
-
-    # 4. Rasio insiden (%)
-    df_risk['Rasio_Insiden (%)'] = (df_risk['Case_Count'] / df_risk['Total_Population'] * 100).round(2)
+def compute_tables(cube):
+    """Tabel risiko per status diabetes dari kubus (sudah difilter oleh filter global)."""
+    # 1. Total populasi dan kasus serangan jantung per kategori diabetes (satu lintasan)
+    df_risk = cube.incidence(['HadDiabetes'])
 
-    # 5. Proporsi kasus absolut (%)
-    total_cases = df_risk['Case_Count'].sum()
-    df_risk['Proporsi_Kasus (%)'] = (df_risk['Case_Count'] / total_cases * 100).round(1)
+    # 2. Rasio insiden (%) dan proporsi kasus absolut (%)
+    df_risk['Rasio_Insiden (%)'] = df_risk['Incidence_Ratio (%)'].round(2)
+    df_risk['Proporsi_Kasus (%)'] = df_risk['Case_Share (%)'].round(1)
 
-    df_risk.rename(columns={'HadDiabetes': 'Status Diabetes', 'Case_Count': 'Count_of_HadHeartAttack'}, inplace=True)
-
-    diabetes_order = ['Yes', 'No, pre-diabetes or borderline diabetes', 'Yes, but only during pregnancy (female)', 'No']
-    df_diabetes_risk = df_risk
-else:
-    df_diabetes_risk = pd.DataFrame(columns=[
-        'Status Diabetes', 'Count_of_HadHeartAttack', 'Proporsi_Kasus (%)', 'Total_Population', 'Rasio_Insiden (%)'
-    ])
+    # 3. Interval kepercayaan Wilson 95% untuk rasio insiden
+    df_risk = add_intervals(df_risk)
 
+    df_risk = df_risk[['HadDiabetes', 'Total_Population', 'Case_Count', 'Rasio_Insiden (%)', 'CI_Low (%)', 'CI_High (%)', 'Proporsi_Kasus (%)']]
+    df_risk = df_risk.rename(columns={'HadDiabetes': 'Status Diabetes', 'Case_Count': 'Count_of_HadHeartAttack'})
+    return df_risk
 
 # === VISUALISASI 1: BAR CHART — Proporsi Kasus Absolut ===
 def create_bar_chart(df):
-    diabetes_order = ['Yes', 'No, pre-diabetes or borderline diabetes', 'Yes, but only during pregnancy (female)', 'No']
+    diabetes_order = DIABETES_ORDER
     chart = alt.Chart(df).mark_bar().encode(
         x=alt.X('Status Diabetes:N', sort=diabetes_order, title='Status Diabetes', axis=alt.Axis(labelAngle=-45)),
         y=alt.Y('Count_of_HadHeartAttack:Q', title='Jumlah Kasus Serangan Jantung Absolut'),
@@ -71,13 +40,18 @@ def create_bar_chart(df):
 
 # === VISUALISASI 2: LINE CHART — Rasio Insiden ===
 def create_ratio_chart(df):
-    diabetes_order = ['Yes', 'No, pre-diabetes or borderline diabetes', 'Yes, but only during pregnancy (female)', 'No']
-    chart = alt.Chart(df).mark_line(point=True, strokeWidth=3).encode(
+    diabetes_order = DIABETES_ORDER
+    line = alt.Chart(df).mark_line(point=True, strokeWidth=3).encode(
         x=alt.X('Status Diabetes:N', sort=diabetes_order, title='Status Diabetes', axis=alt.Axis(labelAngle=-45)),
         y=alt.Y('Rasio_Insiden (%):Q', title='Rasio Insiden (%)'),
         color=alt.value('#1f77b4'),
-        tooltip=['Status Diabetes', 'Rasio_Insiden (%)']
-    ).properties(
+        tooltip=['Status Diabetes', 'Rasio_Insiden (%)', 'CI_Low (%)', 'CI_High (%)']
+    )
+    # Interval kepercayaan 95% per status diabetes
+    error_bars = alt.Chart(df).mark_errorbar(color='#1f77b4', ticks=True).encode(
+        x=alt.X('Status Diabetes:N', sort=diabetes_order), y='CI_Low (%):Q', y2='CI_High (%):Q'
+    )
+    chart = (line + error_bars).properties(
         title='Perbandingan Rasio Insiden Serangan Jantung Berdasarkan Status Diabetes'
     ).interactive()
     return chart
@@ -85,31 +59,42 @@ def create_ratio_chart(df):
 
 # === TAMPILAN HALAMAN ===
 def show_page():
-    if DF_FULL is None:
+    df_diabetes_risk = page_result(__name__, compute_tables)
+    if df_diabetes_risk is None:
         return
 
     st.header("Study Case 9: Diabetes vs. Risiko Serangan Jantung")
     st.markdown("---")
 
+    if df_diabetes_risk['Count_of_HadHeartAttack'].sum() == 0:
+        st.warning(EMPTY_SEGMENT_MESSAGE)
+        return
+
     # Bar Chart — Proporsi Kasus Absolut
     st.subheader("1. Bagan Kolom Proporsi Kasus Absolut")
-    st.altair_chart(create_bar_chart(df_diabetes_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_bar_chart, df_diabetes_risk), use_container_width=True)
 
     # Line Chart — Rasio Insiden
     st.subheader("2. Perbandingan Rasio Insiden Serangan Jantung")
-    st.altair_chart(create_ratio_chart(df_diabetes_risk), use_container_width=True)
+    render_chart(page_chart(__name__, create_ratio_chart, df_diabetes_risk), use_container_width=True)
 
     # Data Rinci
     st.subheader("3. Data Rinci Kasus Absolut, Populasi, dan Rasio Insiden")
     st.dataframe(df_diabetes_risk, hide_index=True)
+    show_significance(df_diabetes_risk, __name__, cases='Count_of_HadHeartAttack')
 
     # Interpretasi dan Kesimpulan
     st.subheader("4. Interpretasi dan Kesimpulan")
 
     # Ambil data untuk interpretasi
-    ratio_yes = df_diabetes_risk[df_diabetes_risk['Status Diabetes'] == 'Yes']['Rasio_Insiden (%)'].iloc[0]
-    ratio_no = df_diabetes_risk[df_diabetes_risk['Status Diabetes'] == 'No']['Rasio_Insiden (%)'].iloc[0]
-    risk_factor = (ratio_yes / ratio_no).round(1)
+    # Kategori bisa saja tidak muncul di segmen yang difilter: gunakan NaN
+    ratios = df_diabetes_risk.set_index('Status Diabetes')['Rasio_Insiden (%)']
+    ratio_yes = ratios.get('Yes', float('nan'))
+    ratio_no = ratios.get('No', float('nan'))
+    # Risiko relatif dihitung dari hitungan kasus/populasi, bukan dari persentase yang sudah dibulatkan
+    risk_factor, rr_low, rr_high = (round(value, 2) for value in group_relative_risk(
+        df_diabetes_risk, 'Status Diabetes', 'Yes', 'No', cases='Count_of_HadHeartAttack'
+    ))
 
     st.markdown("""
         ### Rumus Perhitungan
@@ -139,7 +124,7 @@ def show_page():
         ---
         ### Interpretasi
 
-        1. **Risiko Relatif:** Individu dengan diabetes memiliki risiko serangan jantung sekitar **{risk_factor} kali lipat lebih tinggi** dibandingkan individu non-diabetes.
+        1. **Risiko Relatif:** Individu dengan diabetes memiliki risiko serangan jantung sekitar **{risk_factor} kali lipat lebih tinggi** dibandingkan individu non-diabetes (CI 95%: {rr_low}–{rr_high}).
         2. **Beban Kasus:** Meskipun proporsi populasi penderita diabetes lebih kecil, kontribusi kasus serangan jantung mereka cukup besar.
         3. **Faktor Risiko Terkait:** Kadar gula darah tinggi memengaruhi kerusakan pembuluh darah dan mempercepat komplikasi kardiovaskular.
 
@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cube import CUBE_DIMENSIONS, CountCube
+from incidence import OUTCOME, POSITIVE, encode_key, outcome_flags
+
+# Agregasi paralel atas partisi baris dengan process pool.
+#
+# Kolom pengelompokan dikodekan sekali (kode level int16 + flag kasus) ke
+# satu matriks kolom-mayor di shared memory. Setiap worker hanya menerima nama segmen
+# shared memory dan rentang barisnya, lalu menghitung tabel hitungan parsial
+# (kunci sel unik + jumlah baris); tidak ada baris yang di-pickle. Hitungan
+# parsial digabung secara asosiatif (jumlah per kunci), sehingga hasilnya sama
+# persis dengan CountCube.from_frame untuk jumlah partisi berapa pun.
+#
+# Hanya dipakai untuk membangun kubus hitungan (data_loader, build_artifacts)
+# dataset besar (>= PARALLEL_MIN_ROWS baris); pengelompokan ad-hoc halaman
+# dijawab dari kubus/indeks bitmap tanpa memindai baris. Jumlah worker
+# diatur dengan HEART_WORKERS (default: jumlah CPU); HEART_WORKERS=1 mematikan
+# pool dan menghitung di proses yang sama.
+
+PARALLEL_WORKERS = int(os.environ.get('HEART_WORKERS', os.cpu_count() or 1))
+# Di bawah batas ini biaya kirim/gabung partisi lebih besar dari hasilnya
+PARALLEL_MIN_ROWS = 1_000_000
+# Partisi per worker (> 1 agar worker yang lebih cepat mengambil sisa pekerjaan)
+PARTITIONS_PER_WORKER = 4
+
+
+def _partition_counts(codes, sizes):
+    """Kunci sel unik dan jumlah baris untuk satu partisi matriks kode (kolom terakhir = flag kasus)."""
+    key = np.zeros(len(codes), dtype=np.int64)
+    valid = np.ones(len(codes), dtype=bool)
+    for position, size in enumerate(sizes):
+        column = codes[:, position]
+        key *= size
+        key += column
+        valid &= column >= 0
+    key *= 2
+    key += codes[:, -1]
+    return np.unique(key[valid], return_counts=True)
+
+
+def _shared_partition_counts(name, shape, start, stop, sizes):
+    """Worker: membuka matriks kode di shared memory lalu menghitung partisi baris [start, stop)."""
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        codes = np.ndarray(shape, dtype=np.int16, buffer=segment.buf, order='F')
+        result = _partition_counts(codes[start:stop], sizes)
+        del codes  # view harus dilepas sebelum segmen ditutup
+        return result
+    finally:
+        segment.close()
+
+
+def _merge_counts(partials):
+    """Penggabungan asosiatif hitungan parsial: jumlah baris per kunci sel."""
+    keys = np.concatenate([keys for keys, _ in partials])
+    counts = np.concatenate([counts for _, counts in partials])
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    return unique_keys, np.bincount(inverse, weights=counts, minlength=len(unique_keys))
+
+
+def _row_partitions(n_rows, n_partitions):
+    bounds = np.linspace(0, n_rows, n_partitions + 1).astype(np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def parallel_count_cube(df, dimensions=CUBE_DIMENSIONS, outcome=OUTCOME, positive=POSITIVE, workers=None):
+    """
+    Sama dengan CountCube.from_frame(df, dimensions), dihitung per partisi
+    baris di process pool. Dengan satu worker dihitung langsung di proses ini.
+    """
+    workers = PARALLEL_WORKERS if workers is None else workers
+    encoded = [encode_key(df[name]) for name in dimensions]
+    shape = tuple(max(len(levels), 1) for _, levels, _ in encoded)
+    meta = {name: (levels, dtype) for name, (_, levels, dtype) in zip(dimensions, encoded)}
+    if max(shape) > np.iinfo(np.int16).max:
+        raise ValueError("Dimensi dengan lebih dari 32767 level tidak dapat dikodekan sebagai int16.")
+
+    matrix_shape = (len(df), len(dimensions) + 1)
+    segment = shared_memory.SharedMemory(create=True, size=max(int(np.prod(matrix_shape)) * 2, 1))
+    try:
+        codes = np.ndarray(matrix_shape, dtype=np.int16, buffer=segment.buf, order='F')
+        for position, (column_codes, _, _) in enumerate(encoded):
+            codes[:, position] = column_codes
+        codes[:, -1] = outcome_flags(df, outcome, positive)
+        del encoded
+
+        partitions = _row_partitions(len(df), max(workers, 1) * PARTITIONS_PER_WORKER)
+        if workers <= 1:
+            partials = [_partition_counts(codes[start:stop], shape) for start, stop in partitions]
+        else:
+            # Pool hanya hidup selama satu build (build jarang: sekali per versi
+            # dataset), sehingga server yang menganggur tidak menahan proses worker
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [
+                    pool.submit(_shared_partition_counts, segment.name, matrix_shape, start, stop, shape)
+                    for start, stop in partitions
+                ]
+                partials = [future.result() for future in futures]
+        del codes
+    finally:
+        segment.close()
+        segment.unlink()
+
+    if not partials:
+        return CountCube.from_frame(df, dimensions, outcome, positive)
+    keys, counts = _merge_counts(partials)
+    return CountCube.from_key_counts(meta, shape, keys, counts)
+
+
+def build_count_cube(df, dimensions=CUBE_DIMENSIONS):
+    """Kubus hitungan `df`: paralel untuk dataset besar, selain itu CountCube.from_frame."""
+    if PARALLEL_WORKERS > 1 and len(df) >= PARALLEL_MIN_ROWS:
+        return parallel_count_cube(df, dimensions)
+    return CountCube.from_frame(df, dimensions)
+
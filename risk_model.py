@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+from incidence import OUTCOME, POSITIVE
+from uncertainty import Z_95, chi2_sf, odds_ratio
+
+# Model risiko multivariabel: regresi logistik HadHeartAttack terhadap
+# beberapa faktor risiko sekaligus, sehingga rasio odds setiap faktor sudah
+# disesuaikan terhadap faktor lain (usia, jenis kelamin, dst.).
+#
+# Matriks desain tidak pernah dibentuk utuh. Indeks bitmap (bitmap_index.py)
+# sudah merupakan matriks one-hot terpaket seluruh kolom kategori (1 bit per
+# baris per level) yang di-cache per versi dataset; setiap iterasi Newton
+# (IRLS) membaca indeks per blok BLOCK_ROWS baris, membuka bit level yang
+# dipakai model menjadi blok desain padat, lalu menjumlahkan gradien dan
+# Hessian blok tersebut. Memori kerja sebanding dengan BLOCK_ROWS x jumlah
+# parameter, bukan jumlah baris. Responden dengan nilai kosong pada salah satu
+# faktor tidak diikutkan (complete case).
+
+MODEL_FACTORS = [
+    'AgeCategory', 'Sex', 'RaceEthnicityCategory', 'SmokerStatus', 'ECigaretteUsage',
+    'AlcoholDrinkers', 'PhysicalActivities', 'BMICategory', 'HadDiabetes', 'HadStroke',
+    'HadKidneyDisease', 'HadCOPD', 'HadDepressiveDisorder', 'GeneralHealth', 'CovidPos',
+]
+
+# Level referensi (rasio odds = 1); faktor lain memakai level pertama skema
+REFERENCE_LEVELS = {
+    'BMICategory': 'Normal (18.5-24.9)',
+    'HadDiabetes': 'No',
+}
+
+BLOCK_ROWS = 1 << 16  # kelipatan 8 agar blok selalu mulai di batas byte bitset
+MAX_ITERATIONS = 25
+TOLERANCE = 1e-6
+
+
+def _model_levels(indexes, factors):
+    """Level setiap faktor (gabungan antar indeks, urutan indeks pertama yang memilikinya)."""
+    levels = {}
+    for factor in factors:
+        levels[factor] = []
+        for index in indexes:
+            for level in index.levels.get(factor, []):
+                if level not in levels[factor]:
+                    levels[factor].append(level)
+        if not levels[factor]:
+            raise ValueError(f"Kolom {factor} tidak ada di indeks bitmap.")
+    return levels
+
+
+def _design_blocks(index, labels, block_rows):
+    """
+    Bit setiap label (faktor, level) di `index` per blok baris, sebagai matriks
+    boolean (label x baris blok). Label yang tidak ada di indeks bernilai 0.
+    """
+    positions = {label: position for position, label in enumerate(index.labels)}
+    rows = [positions.get(label) for label in labels]
+    present = [i for i, row in enumerate(rows) if row is not None]
+    source_rows = [rows[i] for i in present]
+    block_bytes = block_rows // 8
+    for start in range(0, index.n_rows, block_rows):
+        count = min(block_rows, index.n_rows - start)
+        bits = np.zeros((len(labels), count), dtype=bool)
+        packed = index.matrix[source_rows, start // 8:start // 8 + block_bytes]
+        bits[present] = np.unpackbits(packed, axis=1, count=count).astype(bool)
+        yield bits
+
+
+def _iter_blocks(indexes, factors, levels, columns, block_rows):
+    """
+    Blok desain padat (X, y) untuk semua indeks: X berisi intersep dan satu
+    kolom 0/1 per level non-referensi di `columns`, hanya untuk baris lengkap.
+    """
+    labels = [(factor, level) for factor in factors for level in levels[factor]]
+    labels += [(OUTCOME, 'No'), (OUTCOME, POSITIVE)]
+    # Batas kelompok baris label per faktor (untuk cek kelengkapan per faktor)
+    starts = np.cumsum([0] + [len(levels[factor]) for factor in factors])[:-1]
+    positions = {label: position for position, label in enumerate(labels)}
+    design_rows = [positions[label] for label in columns]
+
+    for index in indexes:
+        for bits in _design_blocks(index, labels, block_rows):
+            group_sums = np.add.reduceat(bits[:-2].astype(np.int8), starts, axis=0)
+            complete = (group_sums == 1).all(axis=0) & (bits[-2] | bits[-1])
+            X = np.empty((int(complete.sum()), len(columns) + 1))
+            X[:, 0] = 1.0
+            X[:, 1:] = bits[design_rows][:, complete].T
+            yield X, bits[-1][complete].astype(float)
+
+
+def _reference_level(factor, levels):
+    reference = REFERENCE_LEVELS.get(factor, levels[0])
+    return reference if reference in levels else levels[0]
+
+
+def fit_logistic_model(indexes, factors=MODEL_FACTORS, block_rows=BLOCK_ROWS,
+                       max_iterations=MAX_ITERATIONS, tolerance=TOLERANCE):
+    """
+    Regresi logistik HadHeartAttack ~ `factors` atas daftar BitmapIndex
+    (tahun terpilih) dengan Newton-Raphson (IRLS) yang membaca data per blok.
+
+    Mengembalikan dict: 'table' (rasio odds kasar dan tersesuaikan per level
+    non-referensi, dengan interval 95% Wald dan p-value), 'intercept',
+    jumlah responden/kasus yang dipakai, jumlah iterasi, status konvergensi,
+    log-likelihood model dan model nol, serta pseudo R² McFadden.
+    """
+    levels = _model_levels(indexes, factors)
+    references = {factor: _reference_level(factor, levels[factor]) for factor in factors}
+    candidates = [(factor, level) for factor in factors for level in levels[factor] if level != references[factor]]
+    reference_labels = [(factor, references[factor]) for factor in factors]
+
+    # 1. Satu lintasan hitung: populasi dan kasus per level (baris lengkap saja),
+    #    untuk rasio odds kasar dan untuk membuang level tanpa variasi kasus
+    counted = candidates + reference_labels
+    population = np.zeros(len(counted))
+    cases = np.zeros(len(counted))
+    n_rows = n_cases = 0
+    for X, y in _iter_blocks(indexes, factors, levels, counted, block_rows):
+        population += X[:, 1:].sum(axis=0)
+        cases += y @ X[:, 1:]
+        n_rows += len(y)
+        n_cases += int(y.sum())
+    if n_cases == 0 or n_cases == n_rows:
+        raise ValueError("Model tidak dapat dilatih: tidak ada variasi kasus pada responden lengkap.")
+
+    level_population = dict(zip(counted, population))
+    level_cases = dict(zip(counted, cases))
+    # Level tanpa kasus (atau tanpa bukan-kasus) membuat koefisiennya tak hingga
+    columns = [
+        label for label in candidates
+        if 0 < level_cases[label] < level_population[label]
+    ]
+
+    # 2. Newton-Raphson: setiap iterasi satu lintasan atas semua blok
+    p = len(columns) + 1
+    beta = np.zeros(p)
+    beta[0] = np.log(n_cases / (n_rows - n_cases))
+    converged = False
+    iterations = 0
+    log_likelihood = np.nan
+    hessian = np.eye(p)
+    while iterations < max_iterations and not converged:
+        gradient = np.zeros(p)
+        hessian = np.zeros((p, p))
+        log_likelihood = 0.0
+        for X, y in _iter_blocks(indexes, factors, levels, columns, block_rows):
+            eta = X @ beta
+            prob = 1 / (1 + np.exp(-eta))
+            gradient += X.T @ (y - prob)
+            hessian += X.T @ (X * (prob * (1 - prob))[:, None])
+            log_likelihood += float(y @ eta - np.logaddexp(0, eta).sum())
+        try:
+            step = np.linalg.solve(hessian, gradient)
+        except np.linalg.LinAlgError:
+            step = np.linalg.pinv(hessian) @ gradient
+        beta += step
+        iterations += 1
+        converged = bool(np.abs(step).max() < tolerance)
+
+    # 3. Galat baku dari invers Hessian (informasi Fisher) pada estimasi akhir
+    covariance = np.linalg.pinv(hessian)
+    se = np.sqrt(np.diag(covariance))
+    fitted = pd.DataFrame({'label': columns, 'Koefisien': beta[1:], 'SE': se[1:]})
+
+    rows = []
+    for factor, level in candidates:
+        reference = (factor, references[factor])
+        crude, crude_low, crude_high = odds_ratio(
+            level_cases[(factor, level)], level_population[(factor, level)] - level_cases[(factor, level)],
+            level_cases[reference], level_population[reference] - level_cases[reference],
+        )
+        rows.append({
+            'Faktor': factor,
+            'Level': level,
+            'Referensi': references[factor],
+            'Total_Population': int(level_population[(factor, level)]),
+            'Case_Count': int(level_cases[(factor, level)]),
+            'Crude_OR': float(crude),
+            'Crude_OR_CI_Low': float(crude_low),
+            'Crude_OR_CI_High': float(crude_high),
+        })
+    table = pd.DataFrame(rows)
+    table['label'] = candidates
+    table = table.merge(fitted, on='label', how='left').drop(columns='label')
+
+    z = table['Koefisien'] / table['SE']
+    table['Adjusted_OR'] = np.exp(table['Koefisien'])
+    table['OR_CI_Low'] = np.exp(table['Koefisien'] - Z_95 * table['SE'])
+    table['OR_CI_High'] = np.exp(table['Koefisien'] + Z_95 * table['SE'])
+    table['p_value'] = [np.nan if np.isnan(value) else chi2_sf(value * value, 1) for value in z]
+    table['Signifikan'] = (table['OR_CI_Low'] > 1) | (table['OR_CI_High'] < 1)
+    for column in ['Crude_OR', 'Crude_OR_CI_Low', 'Crude_OR_CI_High', 'Adjusted_OR', 'OR_CI_Low', 'OR_CI_High']:
+        table[column] = table[column].round(3)
+    table['Koefisien'] = table['Koefisien'].round(4)
+    table['SE'] = table['SE'].round(4)
+
+    null_log_likelihood = n_cases * np.log(n_cases / n_rows) + (n_rows - n_cases) * np.log(1 - n_cases / n_rows)
+    return {
+        'table': table,
+        'intercept': float(beta[0]),
+        'factors': list(factors),
+        'n_rows': n_rows,
+        'n_cases': n_cases,
+        'n_excluded': int(sum(index.n_rows for index in indexes) - n_rows),
+        'iterations': iterations,
+        'converged': converged,
+        'log_likelihood': float(log_likelihood),
+        'null_log_likelihood': float(null_log_likelihood),
+        'pseudo_r2': float(1 - log_likelihood / null_log_likelihood),
+    }
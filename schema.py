@@ -0,0 +1,283 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+# Registri skema dataset "Key Indicators of Heart Disease (2022)".
+# Setiap kolom dideklarasikan tipenya di sini sehingga data_loader tidak lagi
+# menyimpan kolom kategori sebagai string `object` dan kolom numerik sebagai
+# int64/float64. Urutan kategori yang sebelumnya ditulis ulang di setiap
+# halaman (age_order, covid_order, diabetes_order, smoker_order) juga
+# dipusatkan di modul ini.
+
+logger = logging.getLogger(__name__)
+
+# Naikkan nilai ini setiap kali deklarasi skema berubah agar snapshot
+# Parquet lama di cache tidak dipakai lagi.
+SCHEMA_VERSION = 3
+
+# --- Urutan kategori ---
+YES_NO = ['No', 'Yes']
+
+SEX_ORDER = ['Female', 'Male']
+
+AGE_ORDER = [
+    'Age 18 to 24', 'Age 25 to 29', 'Age 30 to 34', 'Age 35 to 39',
+    'Age 40 to 44', 'Age 45 to 49', 'Age 50 to 54', 'Age 55 to 59',
+    'Age 60 to 64', 'Age 65 to 69', 'Age 70 to 74', 'Age 75 to 79',
+    'Age 80 or older'
+]
+
+COVID_ORDER = ['No', 'Tested positive using home test without a health professional', 'Yes']
+
+DIABETES_ORDER = ['Yes', 'No, pre-diabetes or borderline diabetes', 'Yes, but only during pregnancy (female)', 'No']
+
+SMOKER_ORDER = ['Never smoked', 'Former smoker', 'Current smoker - now smokes some days', 'Current smoker - now smokes every day']
+
+ECIGARETTE_ORDER = [
+    'Never used e-cigarettes in my entire life', 'Not at all (right now)',
+    'Use them some days', 'Use them every day'
+]
+
+GENERAL_HEALTH_ORDER = ['Excellent', 'Very good', 'Good', 'Fair', 'Poor']
+
+LAST_CHECKUP_ORDER = [
+    'Within past year (anytime less than 12 months ago)',
+    'Within past 2 years (1 year but less than 2 years ago)',
+    'Within past 5 years (2 years but less than 5 years ago)',
+    '5 or more years ago'
+]
+
+REMOVED_TEETH_ORDER = ['None of them', '1 to 5', '6 or more, but not all', 'All']
+
+RACE_ETHNICITY_LEVELS = [
+    'White only, Non-Hispanic', 'Black only, Non-Hispanic', 'Other race only, Non-Hispanic',
+    'Multiracial, Non-Hispanic', 'Hispanic'
+]
+
+TETANUS_LEVELS = [
+    'Yes, received Tdap', 'Yes, received tetanus shot, but not Tdap',
+    'Yes, received tetanus shot but not sure what type',
+    'No, did not receive any tetanus shot in the past 10 years'
+]
+
+STATE_LEVELS = [
+    'Alabama', 'Alaska', 'Arizona', 'Arkansas', 'California', 'Colorado', 'Connecticut',
+    'Delaware', 'District of Columbia', 'Florida', 'Georgia', 'Guam', 'Hawaii', 'Idaho',
+    'Illinois', 'Indiana', 'Iowa', 'Kansas', 'Kentucky', 'Louisiana', 'Maine', 'Maryland',
+    'Massachusetts', 'Michigan', 'Minnesota', 'Mississippi', 'Missouri', 'Montana',
+    'Nebraska', 'Nevada', 'New Hampshire', 'New Jersey', 'New Mexico', 'New York',
+    'North Carolina', 'North Dakota', 'Ohio', 'Oklahoma', 'Oregon', 'Pennsylvania',
+    'Puerto Rico', 'Rhode Island', 'South Carolina', 'South Dakota', 'Tennessee', 'Texas',
+    'Utah', 'Vermont', 'Virgin Islands', 'Virginia', 'Washington', 'West Virginia',
+    'Wisconsin', 'Wyoming'
+]
+
+# Pita BMI (klasifikasi WHO) untuk filter rentang BMI; batas bawah inklusif
+BMI_BINS = [0, 18.5, 25, 30, 35, 40, np.inf]
+BMI_CATEGORY_ORDER = [
+    'Kurus (<18.5)', 'Normal (18.5-24.9)', 'Berlebih (25-29.9)',
+    'Obesitas I (30-34.9)', 'Obesitas II (35-39.9)', 'Obesitas III (>=40)'
+]
+
+# Level dimensi turunan (lihat DERIVED_DIMENSIONS)
+AGE_GROUP_ORDER = ['<45 Tahun', '45-64 Tahun', '65-79 Tahun', '>=80 Tahun']
+
+SMOKER_SIMPLE_ORDER = ['Never Smoked', 'Former Smoker', 'Current Smoker']
+
+
+def categorical(levels, ordered=False):
+    """Deklarasi kolom kategori dengan daftar level (dan urutannya) yang tetap."""
+    return {'kind': 'category', 'levels': list(levels), 'ordered': ordered}
+
+
+def numeric(dtype):
+    """Deklarasi kolom numerik dengan tipe sempit (int8/float32, dst.)."""
+    return {'kind': 'numeric', 'dtype': dtype}
+
+
+# --- Deklarasi tipe untuk seluruh 40 kolom (urutan sesuai CSV) ---
+COLUMN_SCHEMA = {
+    'State': categorical(STATE_LEVELS),
+    'Sex': categorical(SEX_ORDER),
+    'GeneralHealth': categorical(GENERAL_HEALTH_ORDER, ordered=True),
+    'PhysicalHealthDays': numeric('int8'),
+    'MentalHealthDays': numeric('int8'),
+    'LastCheckupTime': categorical(LAST_CHECKUP_ORDER, ordered=True),
+    'PhysicalActivities': categorical(YES_NO),
+    'SleepHours': numeric('int8'),
+    'RemovedTeeth': categorical(REMOVED_TEETH_ORDER, ordered=True),
+    'HadHeartAttack': categorical(YES_NO),
+    'HadAngina': categorical(YES_NO),
+    'HadStroke': categorical(YES_NO),
+    'HadAsthma': categorical(YES_NO),
+    'HadSkinCancer': categorical(YES_NO),
+    'HadCOPD': categorical(YES_NO),
+    'HadDepressiveDisorder': categorical(YES_NO),
+    'HadKidneyDisease': categorical(YES_NO),
+    'HadArthritis': categorical(YES_NO),
+    'HadDiabetes': categorical(DIABETES_ORDER, ordered=True),
+    'DeafOrHardOfHearing': categorical(YES_NO),
+    'BlindOrVisionDifficulty': categorical(YES_NO),
+    'DifficultyConcentrating': categorical(YES_NO),
+    'DifficultyWalking': categorical(YES_NO),
+    'DifficultyDressingBathing': categorical(YES_NO),
+    'DifficultyErrands': categorical(YES_NO),
+    'SmokerStatus': categorical(SMOKER_ORDER, ordered=True),
+    'ECigaretteUsage': categorical(ECIGARETTE_ORDER, ordered=True),
+    'ChestScan': categorical(YES_NO),
+    'RaceEthnicityCategory': categorical(RACE_ETHNICITY_LEVELS),
+    'AgeCategory': categorical(AGE_ORDER, ordered=True),
+    'HeightInMeters': numeric('float32'),
+    'WeightInKilograms': numeric('float32'),
+    'BMI': numeric('float32'),
+    'AlcoholDrinkers': categorical(YES_NO),
+    'HIVTesting': categorical(YES_NO),
+    'FluVaxLast12': categorical(YES_NO),
+    'PneumoVaxEver': categorical(YES_NO),
+    'TetanusLast10Tdap': categorical(TETANUS_LEVELS),
+    'HighRiskLastYear': categorical(YES_NO),
+    'CovidPos': categorical(COVID_ORDER, ordered=True),
+}
+
+
+def remap(source, mapping, levels):
+    """Deklarasi dimensi turunan: level kolom `source` dipetakan ke `levels` lewat `mapping`."""
+    return {'source': source, 'mapping': dict(mapping), 'levels': list(levels)}
+
+
+# --- Registri dimensi turunan ---
+# Pengelompokan yang sebelumnya dihitung per baris di halaman (simplify_age di
+# sc2/sc9, simplify_smoker_status di sc5) dihitung sekali saat dataset dimuat
+# dan dipakai bersama oleh semua halaman (serta ikut menjadi dimensi kubus).
+DERIVED_DIMENSIONS = {
+    'AgeGroup': remap('AgeCategory', {
+        'Age 18 to 24': '<45 Tahun', 'Age 25 to 29': '<45 Tahun', 'Age 30 to 34': '<45 Tahun',
+        'Age 35 to 39': '<45 Tahun', 'Age 40 to 44': '<45 Tahun',
+        'Age 45 to 49': '45-64 Tahun', 'Age 50 to 54': '45-64 Tahun',
+        'Age 55 to 59': '45-64 Tahun', 'Age 60 to 64': '45-64 Tahun',
+        'Age 65 to 69': '65-79 Tahun', 'Age 70 to 74': '65-79 Tahun', 'Age 75 to 79': '65-79 Tahun',
+        'Age 80 or older': '>=80 Tahun',
+    }, AGE_GROUP_ORDER),
+    'SmokerStatusSimple': remap('SmokerStatus', {
+        'Never smoked': 'Never Smoked',
+        'Former smoker': 'Former Smoker',
+        'Current smoker - now smokes some days': 'Current Smoker',
+        'Current smoker - now smokes every day': 'Current Smoker',
+    }, SMOKER_SIMPLE_ORDER),
+}
+
+
+def _to_categorical(series, spec):
+    levels = spec['levels']
+    observed = pd.unique(series.dropna())
+    extra = sorted(set(observed) - set(levels))
+    if extra:
+        # Level yang tidak dideklarasikan tetap dipertahankan (ditambahkan di akhir)
+        # agar tidak ada baris yang berubah menjadi NaN secara diam-diam.
+        logger.warning("Kolom %s memiliki level di luar skema: %s", series.name, extra)
+        levels = levels + extra
+    return pd.Series(
+        pd.Categorical(series, categories=levels, ordered=spec['ordered']),
+        index=series.index, name=series.name
+    )
+
+
+def _to_numeric(series, spec):
+    dtype = np.dtype(spec['dtype'])
+    values = pd.to_numeric(series, errors='coerce')
+    if dtype.kind in 'iu':
+        info = np.iinfo(dtype)
+        in_range = values.dropna().between(info.min, info.max).all()
+        integral = (values.dropna() % 1 == 0).all()
+        if values.isna().any() or not in_range or not integral:
+            # Nilai pecahan/kosong/di luar jangkauan: turunkan ke float32 saja
+            return values.astype('float32')
+    return values.astype(dtype)
+
+
+def apply_schema(df):
+    """
+    Mengonversi DataFrame mentah (hasil read_csv) ke tipe yang dideklarasikan
+    di COLUMN_SCHEMA. Kolom yang tidak terdaftar dibiarkan apa adanya.
+    """
+    converted = {}
+    for column in df.columns:
+        spec = COLUMN_SCHEMA.get(column)
+        if spec is None:
+            converted[column] = df[column]
+        elif spec['kind'] == 'category':
+            converted[column] = _to_categorical(df[column], spec)
+        else:
+            converted[column] = _to_numeric(df[column], spec)
+    return pd.DataFrame(converted, index=df.index)
+
+
+def bmi_category(bmi):
+    """Mengelompokkan nilai BMI ke pita BMI_CATEGORY_ORDER (kategori berurutan)."""
+    return pd.cut(bmi, bins=BMI_BINS, labels=BMI_CATEGORY_ORDER, right=False, ordered=True)
+
+
+def derive_dimension(series, spec):
+    """
+    Menghitung satu dimensi turunan dari kolom kategori sumber. Pemetaan
+    dilakukan pada tingkat level: array lookup (kode sumber -> kode turunan)
+    dibangun sekali, lalu diindeks dengan kode per baris, tanpa apply/map per baris.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    categories = list(series.cat.categories)
+    unmapped = [level for level in categories if level not in spec['mapping']]
+    if unmapped:
+        logger.warning("Level %s tidak dipetakan ke dimensi turunan: %s", series.name, unmapped)
+
+    # Elemen terakhir (-1) menampung kode -1 (nilai kosong) dari kolom sumber
+    lookup = np.array(
+        [spec['levels'].index(spec['mapping'][level]) if level in spec['mapping'] else -1 for level in categories] + [-1],
+        dtype=np.int8
+    )
+    codes = lookup[series.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=spec['levels'], ordered=True),
+        index=series.index
+    )
+
+
+def add_derived_dimensions(df):
+    """Menambahkan semua kolom DERIVED_DIMENSIONS yang kolom sumbernya tersedia."""
+    for name, spec in DERIVED_DIMENSIONS.items():
+        if spec['source'] in df.columns:
+            df[name] = derive_dimension(df[spec['source']], spec)
+    return df
+
+
+def source_columns(columns):
+    """Kolom CSV yang dibutuhkan untuk menghasilkan `columns` (termasuk dimensi turunan)."""
+    sources = []
+    for column in columns:
+        if column == 'BMICategory':
+            column = 'BMI'
+        elif column in DERIVED_DIMENSIONS:
+            column = DERIVED_DIMENSIONS[column]['source']
+        if column not in sources:
+            sources.append(column)
+    return sources
+
+
+def memory_usage_mb(df):
+    """Total memori DataFrame (deep, termasuk isi string) dalam MB."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def memory_report(df_before, df_after):
+    """Tabel perbandingan memori per kolom sebelum dan sesudah penerapan skema."""
+    before = df_before.memory_usage(deep=True, index=False) / 1024 ** 2
+    after = df_after.memory_usage(deep=True, index=False) / 1024 ** 2
+    report = pd.DataFrame({
+        'Kolom': before.index,
+        'Tipe Awal': [str(df_before[c].dtype) for c in before.index],
+        'Tipe Skema': [str(df_after[c].dtype) for c in before.index],
+        'Memori Awal (MB)': before.values.round(3),
+        'Memori Skema (MB)': after.reindex(before.index).values.round(3),
+    })
+    return report
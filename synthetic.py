@@ -0,0 +1,317 @@
+import argparse
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from schema import COLUMN_SCHEMA, apply_schema
+
+# Generator dataset sintetis yang setia pada skema "Key Indicators of Heart
+# Disease (2022)": 40 kolom dengan urutan, nama, dan level kategori yang sama
+# persis dengan CSV asli (COLUMN_SCHEMA), sehingga semua halaman dapat diuji
+# dan di-benchmark tanpa data asli.
+#
+#   python synthetic.py generate --rows 1000000 --output Data/heart_2022_no_nans.csv
+#   python synthetic.py generate --rows 20000000 --output /tmp/heart.parquet --seed 7
+#   python synthetic.py fit Data/heart_2022_no_nans.csv     # perbarui profil dari data asli
+#
+# Distribusi diambil dari PROFILE_PATH: tabel hitungan agregat (tanpa baris
+# individu) per kolom. Profil bawaan dibangun oleh build_synthetic_profile.py
+# dari target ringkas yang dikalibrasi (proporsi dan rasio insiden per level,
+# dibulatkan dari ringkasan publik dataset 2022), BUKAN di-fit dari baris asli;
+# `fit` atas CSV asli menggantinya dengan distribusi yang sebenarnya. Setiap
+# kolom diambil sampelnya secara bersyarat pada kolom induknya
+# (COLUMN_PARENTS), dalam urutan SAMPLING_ORDER:
+#   AgeCategory -> Sex | usia -> HadHeartAttack | usia, jenis kelamin -> ...
+# Karena hampir semua kolom bergantung pada (usia, jenis kelamin, serangan
+# jantung), distribusi marginal dan rasio insiden yang ditampilkan halaman
+# (mis. insiden per status diabetes, per negara bagian) mengikuti profil.
+# Pasangan yang dianalisis bersama di halaman (rokok x vape, alkohol x rokok)
+# diberi induk tambahan agar distribusi gabungannya juga terjaga.
+
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'synthetic_profile.json')
+PROFILE_FORMAT = 1
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+DEFAULT_PARENTS = ['AgeCategory', 'Sex', 'HadHeartAttack']
+COLUMN_PARENTS = {
+    'AgeCategory': [],
+    'Sex': ['AgeCategory'],
+    'HadHeartAttack': ['AgeCategory', 'Sex'],
+    'State': ['AgeCategory', 'HadHeartAttack'],
+    'SmokerStatus': ['AgeCategory', 'Sex', 'HadHeartAttack'],
+    'ECigaretteUsage': ['AgeCategory', 'SmokerStatus', 'HadHeartAttack'],
+    'AlcoholDrinkers': ['AgeCategory', 'SmokerStatus', 'HadHeartAttack'],
+    'HeightInMeters': ['Sex'],
+}
+
+# Kolom numerik diambil dari grid nilai diskret. BMI diambil per pita selebar
+# 0.5 lalu diberi jitter di dalam pita; berat badan dihitung dari BMI dan tinggi.
+NUMERIC_GRIDS = {
+    'PhysicalHealthDays': np.arange(0, 31, dtype=np.float64),
+    'MentalHealthDays': np.arange(0, 31, dtype=np.float64),
+    'SleepHours': np.arange(1, 25, dtype=np.float64),
+    'HeightInMeters': np.round(np.arange(0.90, 2.46, 0.01), 2),
+    'BMI': np.arange(3.0, 75.0, 0.5),
+}
+BMI_BIN_WIDTH = 0.5
+DERIVED_COLUMNS = ['WeightInKilograms']
+
+# Pseudocount (dikalikan distribusi marginal kolom) untuk strata induk yang
+# jarang/kosong di data asli, agar setiap strata tetap punya distribusi.
+SMOOTHING = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def parents_of(column):
+    return COLUMN_PARENTS.get(column, DEFAULT_PARENTS)
+
+
+def sampling_order():
+    """Kolom yang diambil sampelnya, diurutkan agar induk selalu lebih dulu."""
+    ordered = []
+
+    def visit(column):
+        if column in ordered:
+            return
+        for parent in parents_of(column):
+            visit(parent)
+        ordered.append(column)
+
+    for column in COLUMN_SCHEMA:
+        if column not in DERIVED_COLUMNS:
+            visit(column)
+    return ordered
+
+
+SAMPLING_ORDER = sampling_order()
+
+
+def _levels(column):
+    spec = COLUMN_SCHEMA[column]
+    if spec['kind'] == 'category':
+        return spec['levels']
+    return NUMERIC_GRIDS[column].tolist()
+
+
+def _value_codes(column, series):
+    """Kode level (kategori) atau indeks grid (numerik) per baris; -1 untuk nilai di luar skema."""
+    spec = COLUMN_SCHEMA[column]
+    if spec['kind'] == 'category':
+        return series.cat.codes.to_numpy().astype(np.int64)
+    grid = NUMERIC_GRIDS[column]
+    values = series.to_numpy(dtype=np.float64)
+    if column == 'BMI':
+        codes = np.floor((values - grid[0]) / BMI_BIN_WIDTH).astype(np.int64)
+    else:
+        codes = np.searchsorted(grid, np.round(values, 2) - 1e-9)
+    codes = np.clip(codes, 0, len(grid) - 1)
+    return np.where(np.isnan(values), -1, codes)
+
+
+def _stratum_codes(codes, parents, n_rows):
+    """Kode strata (mixed radix atas kode induk) per baris; 0 untuk kolom tanpa induk."""
+    stratum = np.zeros(n_rows, dtype=np.int64)
+    for parent in parents:
+        stratum = stratum * len(_levels(parent)) + codes[parent]
+    return stratum
+
+
+def _n_strata(parents):
+    return int(np.prod([len(_levels(parent)) for parent in parents], dtype=np.int64))
+
+
+# --- Fit: profil hitungan dari data asli ---
+def fit_profile(chunks):
+    """
+    Menghitung tabel hitungan setiap kolom per strata induknya dari
+    `chunks` (DataFrame bertipe skema, utuh atau per chunk).
+    """
+    counts = {column: np.zeros((_n_strata(parents_of(column)), len(_levels(column))), dtype=np.int64)
+              for column in SAMPLING_ORDER}
+    n_rows = 0
+    for chunk in chunks:
+        codes = {column: _value_codes(column, chunk[column]) for column in SAMPLING_ORDER}
+        n_rows += len(chunk)
+        for column, table in counts.items():
+            parents = parents_of(column)
+            stratum = _stratum_codes(codes, parents, len(chunk))
+            valid = codes[column] >= 0
+            for parent in parents:
+                valid &= codes[parent] >= 0
+            flat = stratum[valid] * table.shape[1] + codes[column][valid]
+            table += np.bincount(flat, minlength=table.size).reshape(table.shape)
+
+    return {
+        'format': PROFILE_FORMAT,
+        'n_rows': n_rows,
+        'columns': {
+            column: {'parents': parents_of(column), 'levels': _levels(column), 'counts': table.tolist()}
+            for column, table in counts.items()
+        },
+    }
+
+
+def write_profile(profile, path=PROFILE_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_profile(path=PROFILE_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    if profile.get('format') != PROFILE_FORMAT:
+        raise ValueError(f"Format profil sintetis tidak dikenal di {path}: {profile.get('format')}")
+    for column in SAMPLING_ORDER:
+        spec = profile['columns'].get(column)
+        if spec is None or spec['parents'] != parents_of(column) or spec['levels'] != _levels(column):
+            raise ValueError(f"Profil {path} tidak sesuai dengan skema untuk kolom {column}; jalankan ulang `fit`.")
+    return profile
+
+
+# --- Generate ---
+class Sampler:
+    """Sampler bersyarat per kolom dari tabel hitungan profil."""
+
+    def __init__(self, profile):
+        self.tables = {}
+        for column in SAMPLING_ORDER:
+            counts = np.asarray(profile['columns'][column]['counts'], dtype=np.float64)
+            marginal = counts.sum(axis=0)
+            marginal = marginal / marginal.sum() if marginal.sum() else np.full(counts.shape[1], 1 / counts.shape[1])
+            probabilities = counts + SMOOTHING * marginal
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            cdf = np.cumsum(probabilities, axis=1)
+            cdf[:, -1] = 1.0
+            # CDF semua strata disambung: strata s menempati rentang [s, s + 1],
+            # sehingga satu searchsorted melayani semua baris sekaligus
+            offsets = np.arange(cdf.shape[0], dtype=np.float64)[:, None]
+            self.tables[column] = ((offsets + cdf).ravel(), cdf.shape[1])
+
+    def sample(self, n_rows, rng):
+        codes = {}
+        for column in SAMPLING_ORDER:
+            flat_cdf, n_levels = self.tables[column]
+            parents = parents_of(column)
+            stratum = _stratum_codes(codes, parents, n_rows)
+            position = np.searchsorted(flat_cdf, stratum + rng.random(n_rows), side='right')
+            codes[column] = np.minimum(position - stratum * n_levels, n_levels - 1)
+        return codes
+
+
+def _to_frame(codes, rng):
+    """DataFrame 40 kolom (urutan COLUMN_SCHEMA) dari kode hasil sampling."""
+    n_rows = len(codes['AgeCategory'])
+    height = NUMERIC_GRIDS['HeightInMeters'][codes['HeightInMeters']]
+    bmi_low = NUMERIC_GRIDS['BMI'][codes['BMI']]
+    bmi = bmi_low + rng.random(n_rows) * BMI_BIN_WIDTH
+    weight = np.round(bmi * height ** 2, 2)
+
+    columns = {}
+    for column, spec in COLUMN_SCHEMA.items():
+        if column == 'WeightInKilograms':
+            columns[column] = weight
+        elif column == 'BMI':
+            # Seperti data asli, BMI = berat / tinggi^2 (dibulatkan 2 desimal)
+            columns[column] = np.round(weight / height ** 2, 2)
+        elif spec['kind'] == 'category':
+            columns[column] = pd.Categorical.from_codes(
+                codes[column].astype(np.int16), categories=spec['levels'], ordered=spec['ordered']
+            )
+        else:
+            columns[column] = NUMERIC_GRIDS[column][codes[column]]
+    return pd.DataFrame(columns)
+
+
+def iter_synthetic_chunks(n_rows, seed=0, profile=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Menghasilkan `n_rows` baris sintetis per `chunk_rows` baris (DataFrame
+    dengan kolom dan nilai berformat seperti CSV asli). Hasil deterministik
+    untuk `seed` dan `chunk_rows` yang sama.
+    """
+    sampler = Sampler(profile if profile is not None else read_profile())
+    rng = np.random.default_rng(seed)
+    remaining = n_rows
+    while remaining > 0:
+        size = min(chunk_rows, remaining)
+        yield _to_frame(sampler.sample(size, rng), rng)
+        remaining -= size
+
+
+def generate_frame(n_rows, seed=0, profile=None):
+    """Dataset sintetis bertipe skema (sama dengan hasil data_loader) dalam memori."""
+    chunks = [apply_schema(chunk) for chunk in iter_synthetic_chunks(n_rows, seed, profile)]
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def write_dataset(path, n_rows, seed=0, profile=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Menulis dataset sintetis ke `path` (.csv atau .parquet) per chunk, sehingga
+    memori tetap konstan untuk puluhan juta baris. Parquet ditulis dengan
+    tipe skema (kategori, int8, float32).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    parquet = path.endswith('.parquet')
+    if parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for position, chunk in enumerate(iter_synthetic_chunks(n_rows, seed, profile, chunk_rows)):
+            if parquet:
+                table = pa.Table.from_pandas(apply_schema(chunk), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(tmp_path, mode='w' if position == 0 else 'a', header=position == 0, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator dataset sintetis sesuai skema heart_2022_no_nans.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="Menulis dataset sintetis ke CSV/Parquet.")
+    generate.add_argument('--rows', type=int, required=True, help="Jumlah baris.")
+    generate.add_argument('--output', required=True, help="File keluaran (.csv atau .parquet).")
+    generate.add_argument('--seed', type=int, default=0, help="Seed generator acak (default: 0).")
+    generate.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="Baris per chunk.")
+    generate.add_argument('--profile', default=PROFILE_PATH, help="File profil distribusi.")
+
+    fit = commands.add_parser('fit', help="Menghitung ulang profil distribusi dari CSV asli.")
+    fit.add_argument('csv', help="CSV asli (mis. Data/heart_2022_no_nans.csv).")
+    fit.add_argument('--profile', default=PROFILE_PATH, help="File profil keluaran.")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(name)s: %(message)s')
+
+    started = time.perf_counter()
+    if args.command == 'fit':
+        chunks = (apply_schema(chunk) for chunk in pd.read_csv(args.csv, chunksize=DEFAULT_CHUNK_ROWS))
+        profile = fit_profile(chunks)
+        profile['source'] = os.path.basename(args.csv)
+        write_profile(profile, args.profile)
+        logger.info("Profil dari %d baris ditulis ke %s", profile['n_rows'], args.profile)
+    else:
+        write_dataset(args.output, args.rows, args.seed, read_profile(args.profile), args.chunk_rows)
+        logger.info("%d baris sintetis ditulis ke %s", args.rows, args.output)
+    logger.info("Selesai dalam %.1f s", time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Uji unit modul agregasi dan statistik atas dataset sintetis kecil
+# (synthetic.py), tanpa CSV asli. Jalankan dari root repo: python -m pytest tests
+#
+# Modul aplikasi berada di root repo (tanpa paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema import add_derived_dimensions, bmi_category  # noqa: E402
+from synthetic import generate_frame  # noqa: E402
+
+N_ROWS = 20_000
+
+
+@pytest.fixture(scope='session')
+def frame():
+    """Dataset sintetis bertipe skema beserta dimensi turunan, seperti hasil data_loader."""
+    df = generate_frame(N_ROWS, seed=7)
+    df['BMICategory'] = bmi_category(df['BMI'])
+    return add_derived_dimensions(df)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from bitmap_index import BitmapIndex
+from incidence import OUTCOME
+
+
+@pytest.fixture(scope='module')
+def index(frame):
+    return BitmapIndex.from_frame(frame)
+
+
+def test_count_without_filter(index, frame):
+    assert index.count() == len(frame)
+
+
+@pytest.mark.parametrize('filters', [
+    {'Sex': 'Female'},
+    {'Sex': 'Male', OUTCOME: 'Yes'},
+    {'AgeCategory': ['Age 65 to 69', 'Age 70 to 74'], 'HadStroke': 'Yes'},
+    {'GeneralHealth': ['Fair', 'Poor'], 'SmokerStatusSimple': 'Current Smoker', OUTCOME: 'Yes'},
+])
+def test_count_matches_boolean_mask(index, frame, filters):
+    mask = np.ones(len(frame), dtype=bool)
+    for column, values in filters.items():
+        mask &= frame[column].isin([values] if isinstance(values, str) else values).to_numpy()
+    assert index.count(**filters) == int(mask.sum())
+
+
+def test_unknown_level_counts_nothing(index):
+    assert index.count(Sex='Unknown') == 0
+
+
+def test_level_counts_match_value_counts(index, frame):
+    counts = dict(zip(index.labels, index.level_counts()))
+    for column in ('AgeCategory', 'State', OUTCOME):
+        for level, expected in frame[column].value_counts().items():
+            assert counts[(column, level)] == expected
+
+
+def test_level_counts_within_segment(index, frame):
+    bits = index.mask(Sex='Female')
+    counts = dict(zip(index.labels, index.level_counts(bits)))
+    female = frame[frame['Sex'] == 'Female']
+    for level, expected in female['HadDiabetes'].value_counts().items():
+        assert counts[('HadDiabetes', level)] == expected
+
+
+def test_from_chunks_matches_from_frame(index, frame):
+    chunks = (frame.iloc[start:start + 4096] for start in range(0, len(frame), 4096))
+    chunked = BitmapIndex.from_chunks(chunks)
+    assert chunked.n_rows == index.n_rows
+    for column in ('Sex', 'State', OUTCOME):
+        for level in index.levels[column]:
+            assert chunked.count(**{column: level}) == index.count(**{column: level})
+
+
+def test_from_chunks_rejects_unaligned_chunks(frame):
+    chunks = [frame.iloc[:100], frame.iloc[100:200]]
+    with pytest.raises(ValueError):
+        BitmapIndex.from_chunks(chunks)
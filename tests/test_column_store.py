@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from column_store import is_column_store, open_column_store, write_column_store
+
+
+def test_round_trip(frame, tmp_path):
+    directory = str(tmp_path / 'store.columns')
+    df = frame.head(1000).reset_index(drop=True)
+    write_column_store(df, directory)
+
+    opened = open_column_store(directory)
+    assert list(opened.columns) == list(df.columns)
+    for column in df.columns:
+        # Kolom numerik berupa view np.memmap: dibandingkan nilainya saja
+        assert opened[column].dtype == df[column].dtype
+        np.testing.assert_array_equal(np.asarray(opened[column]), np.asarray(df[column]))
+    assert os.listdir(tmp_path) == ['store.columns']
+
+
+def test_object_columns_are_stored_as_category(tmp_path):
+    directory = str(tmp_path / 'store.columns')
+    write_column_store(pd.DataFrame({'State': ['Ohio', 'Texas', 'Ohio'], 'BMI': [21.5, 30.1, 25.0]}), directory)
+    opened = open_column_store(directory)
+    assert isinstance(opened['State'].dtype, pd.CategoricalDtype)
+    assert list(opened['State']) == ['Ohio', 'Texas', 'Ohio']
+    np.testing.assert_array_equal(opened['BMI'], [21.5, 30.1, 25.0])
+
+
+def test_existing_store_is_kept_unless_replaced(tmp_path):
+    directory = str(tmp_path / 'store.columns')
+    write_column_store(pd.DataFrame({'x': [1, 2, 3]}), directory)
+    write_column_store(pd.DataFrame({'x': [9]}), directory)
+    assert list(open_column_store(directory)['x']) == [1, 2, 3]
+
+    write_column_store(pd.DataFrame({'x': [9]}), directory, replace=True)
+    assert list(open_column_store(directory)['x']) == [9]
+    assert is_column_store(directory)
+    assert os.listdir(tmp_path) == ['store.columns']
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import CountCube
+from incidence import OUTCOME, POSITIVE
+
+
+def groupby_counts(df, by):
+    """Populasi dan kasus per kelompok dengan groupby pandas biasa (pembanding)."""
+    grouped = df.groupby(by, observed=True)[OUTCOME]
+    expected = pd.DataFrame({
+        'Total_Population': grouped.size(),
+        'Case_Count': grouped.apply(lambda values: int((values == POSITIVE).sum())),
+    })
+    return expected[expected['Total_Population'] > 0]
+
+
+def cube_counts(cube, by):
+    table = cube.incidence(by).set_index(by)
+    return table[['Total_Population', 'Case_Count']].astype(np.int64)
+
+
+def assert_same_counts(cube, df, by):
+    actual = cube_counts(cube, by)
+    expected = groupby_counts(df, by).astype(np.int64)
+    pd.testing.assert_frame_equal(actual.sort_index(), expected.sort_index(), check_names=False, check_index_type=False)
+
+
+@pytest.fixture(scope='module')
+def cube(frame):
+    return CountCube.from_frame(frame)
+
+
+@pytest.mark.parametrize('by', [
+    ['AgeCategory'], ['HadStroke'], ['AgeGroup', 'Sex'], ['State', 'AgeCategory'],
+    ['AlcoholDrinkers', 'SmokerStatusSimple'], ['BMICategory'],
+])
+def test_rollup_matches_groupby(cube, frame, by):
+    assert_same_counts(cube, frame, by)
+
+
+def test_incidence_ratio_and_share(cube):
+    table = cube.incidence('Sex')
+    np.testing.assert_allclose(table['Incidence_Ratio (%)'], table['Case_Count'] / table['Total_Population'] * 100)
+    assert table['Case_Share (%)'].sum() == pytest.approx(100.0)
+
+
+def test_totals(cube, frame):
+    assert cube.total_population == len(frame)
+    assert cube.total_cases == int((frame[OUTCOME] == POSITIVE).sum())
+
+
+def test_slice_matches_filtered_groupby(cube, frame):
+    states = list(frame['State'].cat.categories[:3])
+    segment = cube.slice(Sex='Female', State=states)
+    subset = frame[(frame['Sex'] == 'Female') & frame['State'].isin(states)]
+    assert segment.total_population == len(subset)
+    assert_same_counts(segment, subset, ['AgeCategory'])
+
+
+def test_merge_of_partitions_matches_full_cube(cube, frame):
+    half = len(frame) // 2
+    merged = CountCube.merge([CountCube.from_frame(frame.iloc[:half]), CountCube.from_frame(frame.iloc[half:])])
+    for by in (['AgeCategory'], ['State', 'Sex'], ['SleepHours']):
+        pd.testing.assert_frame_equal(cube_counts(merged, by), cube_counts(cube, by))
+
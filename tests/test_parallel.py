@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import CountCube
+from parallel import build_count_cube, parallel_count_cube
+
+
+def cube_counts(cube, by):
+    table = cube.incidence(by).set_index(by)
+    return table[['Total_Population', 'Case_Count']].astype(np.int64)
+
+
+@pytest.fixture(scope='module')
+def cube(frame):
+    return CountCube.from_frame(frame)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_count_cube_matches_from_frame(cube, frame, workers):
+    parallel = parallel_count_cube(frame, workers=workers)
+    for by in (['AgeCategory'], ['AgeGroup', 'Sex'], ['State']):
+        pd.testing.assert_frame_equal(cube_counts(parallel, by), cube_counts(cube, by))
+
+
+def test_parallel_count_cube_with_more_workers_than_rows(frame):
+    small = frame.head(5)
+    pd.testing.assert_frame_equal(
+        cube_counts(parallel_count_cube(small, workers=2), ['Sex']),
+        cube_counts(CountCube.from_frame(small), ['Sex']),
+    )
+
+
+def test_build_count_cube_below_threshold_is_serial(cube, frame):
+    pd.testing.assert_frame_equal(cube_counts(build_count_cube(frame), ['State']), cube_counts(cube, ['State']))
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from bitmap_index import BitmapIndex
+from risk_model import fit_logistic_model
+
+FACTORS = ['Sex', 'AgeGroup', 'HadStroke']
+
+
+@pytest.fixture(scope='module')
+def index(frame):
+    return BitmapIndex.from_frame(frame)
+
+
+def test_single_factor_model_reproduces_crude_odds_ratio(index):
+    # Model jenuh satu faktor biner: OR tersesuaikan = OR kasar, interval Wald = interval Woolf
+    model = fit_logistic_model([index], factors=['Sex'])
+    row = model['table'].iloc[0]
+    assert model['converged']
+    assert row['Adjusted_OR'] == pytest.approx(row['Crude_OR'], abs=1e-3)
+    assert row['OR_CI_Low'] == pytest.approx(row['Crude_OR_CI_Low'], abs=1e-3)
+    assert row['OR_CI_High'] == pytest.approx(row['Crude_OR_CI_High'], abs=1e-3)
+
+
+def test_fit_does_not_depend_on_block_size(index):
+    default = fit_logistic_model([index], factors=FACTORS)
+    small_blocks = fit_logistic_model([index], factors=FACTORS, block_rows=1024)
+    pd.testing.assert_frame_equal(default['table'], small_blocks['table'])
+    assert default['converged'] and default['n_rows'] == small_blocks['n_rows']
+
+
+def test_fit_over_several_indexes_matches_one_index(index, frame):
+    half = (len(frame) // 2) // 8 * 8
+    parts = [BitmapIndex.from_frame(frame.iloc[:half]), BitmapIndex.from_frame(frame.iloc[half:])]
+    combined = fit_logistic_model(parts, factors=FACTORS)
+    single = fit_logistic_model([index], factors=FACTORS)
+    pd.testing.assert_frame_equal(combined['table'], single['table'])
+    assert combined['pseudo_r2'] == pytest.approx(single['pseudo_r2'])
+
+
+def test_fit_requires_case_variation(frame):
+    no_cases = BitmapIndex.from_frame(frame[frame['HadHeartAttack'] == 'No'], columns=['Sex', 'HadHeartAttack'])
+    with pytest.raises(ValueError):
+        fit_logistic_model([no_cases], factors=['Sex'])
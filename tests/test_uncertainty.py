@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from uncertainty import (
+    Z_95, bootstrap_interval, chi2_sf, chi_square_test, odds_ratio, relative_risk, wilson_interval,
+)
+
+
+def test_wilson_interval_matches_reference_example():
+    # Newcombe (1998), contoh 81/263: 0.2553 - 0.3662
+    low, high = wilson_interval(81, 263)
+    assert low == pytest.approx(25.53, abs=0.01)
+    assert high == pytest.approx(36.62, abs=0.01)
+
+
+def test_wilson_interval_edge_cases():
+    low, high = wilson_interval([0, 5, 0], [10, 5, 0])
+    assert low[0] == pytest.approx(0.0, abs=1e-9) and 0 < high[0] < 100
+    assert 0 < low[1] and high[1] == pytest.approx(100.0)
+    assert np.isnan(low[2]) and np.isnan(high[2])
+
+
+def test_relative_risk_katz_interval():
+    rr, low, high = relative_risk(30, 100, 10, 100)
+    se = np.sqrt(1 / 30 - 1 / 100 + 1 / 10 - 1 / 100)
+    assert rr == pytest.approx(3.0)
+    assert low == pytest.approx(3.0 * np.exp(-Z_95 * se))
+    assert high == pytest.approx(3.0 * np.exp(Z_95 * se))
+
+
+def test_relative_risk_without_cases_has_no_interval():
+    rr, low, high = relative_risk([0, 5], [100, 100], [10, 0], [100, 100])
+    assert rr[0] == 0
+    assert np.isnan(low).all() and np.isnan(high).all()
+
+
+def test_odds_ratio_woolf_interval():
+    ratio, low, high = odds_ratio(30, 70, 10, 90)
+    se = np.sqrt(1 / 30 + 1 / 70 + 1 / 10 + 1 / 90)
+    assert ratio == pytest.approx(30 * 90 / (70 * 10))
+    assert low == pytest.approx(ratio * np.exp(-Z_95 * se))
+    assert high == pytest.approx(ratio * np.exp(Z_95 * se))
+    assert np.isnan(odds_ratio(0, 70, 10, 90)).all()
+
+
+@pytest.mark.parametrize('statistic, dof', [
+    (3.841458820694124, 1),
+    (5.991464547107979, 2),
+    (7.814727903251178, 3),
+    (9.487729036781154, 4),
+    (11.070497693516351, 5),
+])
+def test_chi2_sf_critical_values(statistic, dof):
+    assert chi2_sf(statistic, dof) == pytest.approx(0.05, abs=1e-9)
+
+
+def test_chi2_sf_at_zero():
+    assert chi2_sf(0.0, 1) == pytest.approx(1.0)
+    assert chi2_sf(0.0, 4) == pytest.approx(1.0)
+
+
+def test_chi_square_test_two_by_two():
+    # Ekspektasi kasus 20 per kelompok: (10²/20) * 2 + (10²/80) * 2 = 12.5
+    result = chi_square_test([30, 10], [100, 100])
+    assert result['statistic'] == pytest.approx(12.5)
+    assert result['dof'] == 1
+    assert result['p_value'] == pytest.approx(chi2_sf(12.5, 1))
+    assert result['min_expected'] == pytest.approx(20.0)
+
+
+def test_chi_square_test_needs_variation():
+    assert chi_square_test([5], [100]) is None
+    assert chi_square_test([0, 0], [100, 100]) is None
+    assert chi_square_test([10, 5], [10, 0]) is None
+
+
+def test_bootstrap_interval_is_deterministic_and_close_to_wilson():
+    cases, population = np.array([300, 120]), np.array([5000, 4000])
+    low, high = bootstrap_interval(cases, population, seed=3)
+    again = bootstrap_interval(cases, population, seed=3)
+    np.testing.assert_array_equal(low, again[0])
+    wilson_low, wilson_high = wilson_interval(cases, population)
+    np.testing.assert_allclose(low, wilson_low, atol=0.3)
+    np.testing.assert_allclose(high, wilson_high, atol=0.3)
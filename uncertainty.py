@@ -0,0 +1,191 @@
+import math
+
+import numpy as np
+import streamlit as st
+
+from diagnostics import fragment
+
+# Ketidakpastian rasio insiden, dihitung langsung dari hitungan agregat
+# (populasi dan kasus per kelompok) sehingga biayanya sebanding dengan jumlah
+# kelompok, bukan jumlah baris; cukup murah untuk dihitung ulang setiap kali
+# filter berubah.
+#
+#   wilson_interval      interval kepercayaan Wilson untuk proporsi
+#   relative_risk        risiko relatif dengan interval log (Katz)
+#   odds_ratio           rasio odds dengan interval log (Woolf)
+#   chi_square_test      uji chi-square homogenitas k x 2 (kasus / bukan kasus)
+#   bootstrap_interval   interval persentil dari resampling multinomial tabel
+#                        hitungan (bukan resampling baris)
+
+Z_95 = 1.959963984540054
+BOOTSTRAP_SAMPLES = 2000
+CI_LOW = 'CI_Low (%)'
+CI_HIGH = 'CI_High (%)'
+
+
+def wilson_interval(cases, population, z=Z_95):
+    """Batas bawah dan atas interval Wilson (dalam %) per kelompok; NaN jika populasi 0."""
+    cases = np.asarray(cases, dtype=float)
+    population = np.asarray(population, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = cases / population
+        z2 = z * z
+        center = (p + z2 / (2 * population)) / (1 + z2 / population)
+        half = z * np.sqrt(p * (1 - p) / population + z2 / (4 * population ** 2)) / (1 + z2 / population)
+    return (center - half) * 100, (center + half) * 100
+
+
+def relative_risk(cases, population, ref_cases, ref_population, z=Z_95):
+    """
+    Risiko relatif kelompok terhadap kelompok referensi beserta interval
+    kepercayaannya (metode log Katz). Interval NaN jika salah satu kelompok
+    tidak memiliki kasus.
+    """
+    cases, population = np.asarray(cases, dtype=float), np.asarray(population, dtype=float)
+    ref_cases, ref_population = np.asarray(ref_cases, dtype=float), np.asarray(ref_population, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rr = (cases / population) / (ref_cases / ref_population)
+        se = np.sqrt(1 / cases - 1 / population + 1 / ref_cases - 1 / ref_population)
+        low, high = rr * np.exp(-z * se), rr * np.exp(z * se)
+    invalid = (cases == 0) | (ref_cases == 0)
+    return rr, np.where(invalid, np.nan, low), np.where(invalid, np.nan, high)
+
+
+def odds_ratio(cases, non_cases, ref_cases, ref_non_cases, z=Z_95):
+    """
+    Rasio odds kelompok terhadap kelompok referensi beserta interval
+    kepercayaannya (metode log Woolf). NaN jika salah satu sel tabel 2 x 2 nol.
+    """
+    cells = [np.asarray(value, dtype=float) for value in (cases, non_cases, ref_cases, ref_non_cases)]
+    a, b, c, d = cells
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = (a * d) / (b * c)
+        se = np.sqrt(1 / a + 1 / b + 1 / c + 1 / d)
+        low, high = ratio * np.exp(-z * se), ratio * np.exp(z * se)
+    invalid = (a == 0) | (b == 0) | (c == 0) | (d == 0)
+    return (np.where(invalid, np.nan, ratio), np.where(invalid, np.nan, low), np.where(invalid, np.nan, high))
+
+
+def group_relative_risk(table, group, exposed, reference, cases='Case_Count', population='Total_Population'):
+    """
+    Risiko relatif baris `exposed` terhadap baris `reference` pada kolom `group`
+    tabel insiden, sebagai (rr, batas bawah, batas atas); NaN jika salah satu
+    kelompok tidak ada di segmen yang difilter.
+    """
+    rows = table.set_index(group).reindex([exposed, reference])
+    rr, low, high = relative_risk(
+        rows[cases].iloc[0], rows[population].iloc[0],
+        rows[cases].iloc[1], rows[population].iloc[1],
+    )
+    return float(rr), float(low), float(high)
+
+
+def chi2_sf(statistic, dof):
+    """
+    P(X >= statistic) untuk distribusi chi-square dengan `dof` derajat bebas,
+    memakai bentuk tertutup fungsi gamma tak lengkap untuk derajat bebas bulat.
+    """
+    half = statistic / 2
+    if dof % 2 == 0:
+        term, total = 1.0, 1.0
+        for i in range(1, dof // 2):
+            term *= half / i
+            total += term
+        return min(1.0, math.exp(-half) * total)
+    total = math.erfc(math.sqrt(half))
+    term = math.sqrt(half) * 2 / math.sqrt(math.pi)
+    for i in range(dof // 2):
+        if i:
+            term *= half / (i + 0.5)
+        total += math.exp(-half) * term
+    return min(1.0, total)
+
+
+def chi_square_test(cases, population):
+    """
+    Uji chi-square homogenitas rasio insiden antar kelompok (tabel k x 2).
+    Mengembalikan dict statistic, dof, p_value, dan min_expected, atau None
+    jika kurang dari dua kelompok berpopulasi atau tidak ada variasi kasus.
+    """
+    cases = np.asarray(cases, dtype=float)
+    population = np.asarray(population, dtype=float)
+    present = population > 0
+    cases, population = cases[present], population[present]
+    total, total_cases = population.sum(), cases.sum()
+    if len(population) < 2 or total_cases == 0 or total_cases == total:
+        return None
+
+    observed = np.column_stack([cases, population - cases])
+    expected = np.outer(population, [total_cases, total - total_cases]) / total
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    dof = len(population) - 1
+    return {
+        'statistic': statistic,
+        'dof': dof,
+        'p_value': chi2_sf(statistic, dof),
+        'min_expected': float(expected.min()),
+    }
+
+
+def bootstrap_interval(cases, population, n_samples=BOOTSTRAP_SAMPLES, level=0.95, seed=0):
+    """
+    Interval persentil (dalam %) rasio insiden per kelompok dari resampling
+    multinomial tabel hitungan k x 2 dengan total responden tetap.
+    """
+    cases = np.asarray(cases, dtype=np.int64)
+    population = np.asarray(population, dtype=np.int64)
+    counts = np.column_stack([cases, population - cases]).ravel()
+    total = counts.sum()
+    if total == 0:
+        nan = np.full(len(cases), np.nan)
+        return nan, nan.copy()
+
+    rng = np.random.default_rng(seed)
+    samples = rng.multinomial(total, counts / total, size=n_samples).reshape(n_samples, -1, 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratios = samples[:, :, 0] / samples.sum(axis=2) * 100
+    tail = (1 - level) / 2 * 100
+    low, high = np.nanpercentile(ratios, [tail, 100 - tail], axis=0)
+    return low, high
+
+
+def add_intervals(table, cases='Case_Count', population='Total_Population', digits=2):
+    """Menambahkan kolom CI_Low (%) dan CI_High (%) (interval Wilson 95%) ke tabel insiden."""
+    low, high = wilson_interval(table[cases].to_numpy(), table[population].to_numpy())
+    table[CI_LOW] = np.round(low, digits)
+    table[CI_HIGH] = np.round(high, digits)
+    return table
+
+
+def format_p_value(p_value):
+    return "< 0.001" if p_value < 0.001 else f"{p_value:.3f}"
+
+
+@fragment
+def show_significance(table, key, cases='Case_Count', population='Total_Population'):
+    """
+    Keterangan uji chi-square di bawah tabel rasio insiden, dan (opsional)
+    perbandingan interval Wilson dengan interval bootstrap multinomial.
+    `key` membedakan toggle bootstrap antar halaman; toggle hanya menjalankan
+    ulang bagian ini (fragment), bukan seluruh halaman.
+    """
+    result = chi_square_test(table[cases], table[population])
+    if result is None:
+        st.caption("Uji chi-square tidak dapat dihitung (kurang dari dua kelompok atau tidak ada variasi kasus).")
+        return
+
+    verdict = "berbeda signifikan" if result['p_value'] < 0.05 else "tidak berbeda signifikan"
+    st.caption(
+        f"Interval kepercayaan Wilson 95% pada tabel dan grafik. Uji chi-square homogenitas: "
+        f"χ² = {result['statistic']:,.2f}, df = {result['dof']}, p = {format_p_value(result['p_value'])} "
+        f"— rasio insiden antar kelompok {verdict} (α = 0.05)."
+        + (" Beberapa frekuensi harapan < 5; hasil uji kurang andal." if result['min_expected'] < 5 else "")
+    )
+
+    if st.toggle("Bandingkan dengan interval bootstrap", key=f"bootstrap_{key}"):
+        low, high = bootstrap_interval(table[cases], table[population])
+        comparison = table.drop(columns=[cases, population], errors='ignore').copy()
+        comparison['Bootstrap_Low (%)'] = np.round(low, 2)
+        comparison['Bootstrap_High (%)'] = np.round(high, 2)
+        st.caption(f"Interval persentil 95% dari {BOOTSTRAP_SAMPLES:,} resampling multinomial tabel hitungan.")
+        st.dataframe(comparison, hide_index=True)
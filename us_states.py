@@ -0,0 +1,43 @@
+import json
+import os
+
+import streamlit as st
+
+# Geometri negara bagian AS yang ikut dikirim bersama aplikasi (dibangun oleh
+# build_geometry.py). Peta sc7 menggambar file ini sebagai geoshape Vega-Lite
+# dengan data inline, sehingga peta tetap tampil tanpa akses internet. (Subplot
+# geo Plotly tidak dipakai: plotly.js selalu mengambil topojson peta dasar dari
+# CDN untuk choropleth, termasuk dengan `geojson` dan `visible=False`.)
+#
+# Setiap feature ber-id kode dua huruf (STUSPS) dengan properti `name` dan
+# `on_map`. Wilayah on_map dapat digambar proyeksi "albers usa" (50 negara
+# bagian + DC); wilayah lain (PR, GU, VI) berada di luar proyeksi tersebut
+# dan ditampilkan terpisah oleh halaman.
+
+ASSET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'us_states.geojson')
+
+MAP_TERRITORIES = [
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+    'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
+    'DC',
+]
+OFF_MAP_TERRITORIES = ['PR', 'GU', 'VI']
+
+
+@st.cache_resource
+def load_us_states(path=ASSET_PATH):
+    """
+    FeatureCollection wilayah on_map dan daftar kode wilayah di luar peta.
+    Dimuat sekali per proses server; None jika file aset tidak ada.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+    except (OSError, ValueError):
+        return None
+    on_map = [feature for feature in collection['features'] if feature['properties']['on_map']]
+    off_map = [feature['id'] for feature in collection['features'] if not feature['properties']['on_map']]
+    return {'type': 'FeatureCollection', 'features': on_map}, off_map
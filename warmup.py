@@ -0,0 +1,128 @@
+import importlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from data_loader import load_bitmap_index, load_count_cube
+
+# Pemanasan cache di latar belakang. Saat proses server pertama kali
+# menjalankan app_main (dan setiap kali versi dataset berganti), "Halaman
+# Utama" langsung dirender sementara thread pool memuat kubus hitungan dan
+# indeks bitmap (tahun terbaru), meng-import
+# setiap modul halaman, lalu menghitung hasil tanpa filter setiap study case
+# ke cache cross_filter.PAGE_RESULTS. Halaman yang dibuka sebelum tugasnya
+# selesai hanya menunggu tugas halaman itu (wait_for), bukan seluruh pemanasan.
+#
+# Modul halaman dengan compute_tables dipanaskan lewat
+# cross_filter.warm_page_result; halaman lain boleh mendefinisikan fungsi
+# warm_up() tanpa argumen. Nonaktifkan dengan HEART_WARMUP=0.
+
+WARMUP_ENABLED = os.environ.get('HEART_WARMUP', '1') == '1'
+WARMUP_WORKERS = 4
+PROGRESS_INTERVAL_S = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Tugas pemanasan satu versi dataset: {nama modul halaman: Future}."""
+
+    def __init__(self, modules, version):
+        self.modules = list(modules)
+        self.version = version
+        self.tasks = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix='warmup')
+        self.dataset = self._executor.submit(self._load_dataset)
+
+    def _load_dataset(self):
+        # Kubus dan indeks dimuat lebih dulu agar tugas halaman tidak berebut membangunnya
+        # Di luar sesi st.error tidak tampil ke mana pun: loader yang gagal
+        # hanya mengembalikan None, jadi kegagalannya dicatat di sini
+        try:
+            if load_count_cube() is None:
+                logger.error("Pemanasan dataset gagal: kubus hitungan tidak dapat dimuat")
+            if load_bitmap_index() is None:
+                logger.error("Pemanasan dataset gagal: indeks bitmap tidak dapat dimuat")
+        except Exception:
+            logger.exception("Pemanasan dataset gagal")
+        with self._lock:
+            for name in self.modules:
+                self.tasks[name] = self._executor.submit(_warm_page, name)
+        self._executor.shutdown(wait=False)
+
+    def progress(self):
+        """(tugas selesai, total tugas), termasuk tugas pemuatan dataset."""
+        with self._lock:
+            futures = [self.dataset] + list(self.tasks.values())
+        done = sum(future.done() for future in futures)
+        return done, 1 + len(self.modules)
+
+    def wait(self, name):
+        """Menunggu tugas halaman `name` (dan pemuatan dataset) jika masih berjalan."""
+        self.dataset.result()
+        with self._lock:
+            future = self.tasks.get(name)
+        if future is not None:
+            future.result()
+
+
+def _warm_page(name):
+    try:
+        module = importlib.import_module(name)
+        if hasattr(module, 'compute_tables'):
+            from cross_filter import warm_page_result
+            warm_page_result(name, module.compute_tables)
+        elif hasattr(module, 'warm_up'):
+            module.warm_up()
+    except Exception:
+        # Halaman akan menghitung (dan menampilkan errornya) sendiri saat dibuka
+        logger.exception("Pemanasan %s gagal", name)
+
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def start(modules, version):
+    """
+    Memulai pemanasan modul halaman `modules` sekali per versi dataset: saat
+    file dataset diganti, pemanasan baru dijalankan untuk versi tersebut.
+    """
+    global _active
+    if not WARMUP_ENABLED:
+        return None
+    with _active_lock:
+        if _active is None or _active.version != version:
+            _active = Warmup(modules, version)
+    return _active
+
+
+def wait_for(name):
+    """Dipanggil sebelum halaman `name` menghitung sendiri: tunggu tugas pemanasannya bila masih berjalan."""
+    warmup = _active
+    if warmup is not None:
+        warmup.wait(name)
+
+
+def render_progress(warmup):
+    """Progres pemanasan di sidebar, diperbarui tiap PROGRESS_INTERVAL_S tanpa rerun halaman."""
+    if warmup is None:
+        return
+    done, total = warmup.progress()
+    if done == total:
+        return
+
+    @st.fragment(run_every=PROGRESS_INTERVAL_S)
+    def progress():
+        done, total = warmup.progress()
+        if done < total:
+            st.progress(done / total, text=f"Menyiapkan study case di latar belakang: {done}/{total}")
+        else:
+            st.caption("Semua study case siap.")
+
+    with st.sidebar:
+        progress()